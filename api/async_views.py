@@ -0,0 +1,92 @@
+# api/async_views.py
+"""
+ASGI 환경용 비동기 API.
+
+동기 DRF 뷰와 같은 결과를 돌려주지만, 워크북 파싱은 dataset_cache 의 제한된 스레드 풀에서 실행되고
+같은 파일에 대한 동시 요청은 하나의 파싱을 함께 기다립니다. 이미 캐시된 데이터에 대한 검색은
+파싱 작업 뒤에 줄 서지 않고 바로 처리됩니다.
+"""
+
+import logging
+import os
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from . import profiling, query_cache, dataset_cache, snapshots
+from .views import parse_search_filters, build_search_response, apply_sort_params
+
+logger = logging.getLogger(__name__)
+
+JSON_PARAMS = {'ensure_ascii': False}
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, safe=False, json_dumps_params=JSON_PARAMS)
+
+
+async def _aget_dataset(file_path, region):
+    if profiling.is_profiling():
+        # 프로파일링할 때는 파싱도 기록되도록 파싱 풀 대신 기록되는 스레드에서 적재합니다.
+        return await profiling.to_thread(dataset_cache.get_dataset, file_path, region)
+    return await dataset_cache.aget_dataset(file_path, region)
+
+
+@require_GET
+@profiling.profile_async_view
+async def company_search(request):
+    """CompanySearchView 의 비동기 버전"""
+    file_type = request.GET.get('file_type', 'eung')
+    as_of = request.GET.get('as_of')
+    excel_file_path = dataset_cache.get_excel_path(file_type)
+    if not as_of and not os.path.exists(excel_file_path):
+        return _json([])
+
+    filters = parse_search_filters(request.GET)
+    try:
+        if as_of:
+            # 과거 시점 검색은 보관된 스냅숏에서 합니다. (디스크에서 읽을 수 있으므로 스레드에서)
+            try:
+                dataset = await profiling.to_thread(snapshots.get_dataset, file_type, as_of)
+            except ValueError as e:
+                return _json({"error": str(e)}, status=400)
+            except LookupError as e:
+                return _json({"error": str(e)}, status=404)
+        else:
+            # 지역 검색이면 전체 데이터셋이 없어도 그 지역 시트만 읽어서 답합니다.
+            dataset = await _aget_dataset(excel_file_path, filters.get('region'))
+        # 필터링은 기본 스레드 풀에서 처리해 이벤트 루프를 막지 않습니다. (파싱 풀과는 별개)
+        results = await profiling.to_thread(query_cache.search, query_cache.client_key(request), dataset, filters)
+        try:
+            results = await profiling.to_thread(apply_sort_params, dataset, results, request.GET, file_type)
+        except ValueError as e:
+            return _json({"error": str(e)}, status=400)
+        return _json(build_search_response(results))
+    except Exception as e:
+        logger.exception("필터링 에러 발생: %s", e)
+        return _json({"error": f"검색 중 오류가 발생했습니다: {str(e)}"}, status=500)
+
+
+@require_GET
+@profiling.profile_async_view
+async def sheet_names(request):
+    """GetSheetNamesView 의 비동기 버전"""
+    file_type = request.GET.get('file_type', 'eung')
+    excel_file_path = dataset_cache.get_excel_path(file_type)
+    if not os.path.exists(excel_file_path):
+        return _json([])
+
+    try:
+        return _json(await profiling.to_thread(dataset_cache.get_sheet_names, excel_file_path))
+    except Exception as e:
+        return _json({"error": f"시트 이름을 읽는 중 오류 발생: {str(e)}"}, status=500)
+
+
+@require_GET
+async def check_file_status(request):
+    """CheckFileStatusView 의 비동기 버전"""
+    file_statuses = {
+        file_type: os.path.exists(dataset_cache.get_excel_path(file_type))
+        for file_type in dataset_cache.FILE_TYPES
+    }
+    return _json(file_statuses)
@@ -0,0 +1,285 @@
+# benchmark.py
+"""
+검색/점수 계산 성능을 재현 가능하게 측정하기 위한 벤치마크 도구.
+
+실제 엑셀과 같은 '회사명' + RELATIVE_OFFSETS 배치(색상 포함)의 가상 워크북을 만들고,
+파싱/검색/경영상태 점수/컨소시엄 계산 속도와 최대 메모리를 측정해 dict(JSON)로 돌려줍니다.
+"""
+
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from .config import RELATIVE_OFFSETS, CONSORTIUM_RULES
+
+REGIONS = ['서울', '경기', '인천', '강원', '충남', '충북', '대전', '부산', '경남',
+           '경북', '전남', '전북', '광주', '울산', '대구', '세종', '제주']
+COMPANIES_PER_BLOCK = 13  # 실제 파일처럼 한 '회사명' 행에 13개 업체가 가로로 배치됩니다.
+BLOCK_HEIGHT = max(RELATIVE_OFFSETS.values()) + 1
+
+# (상태, 채우기 색상) - search_logic.get_status_from_color 가 인식하는 색상들
+STATUS_FILLS = [
+    ("최신", {"theme": 6}, 0.55),
+    ("최신", {"rgb": "FFE2EFDA"}, 0.15),
+    ("1년 경과", {"rgb": "FFDDEBF7"}, 0.15),
+    ("1년 이상 경과", {"rgb": "FFFDEDEC"}, 0.10),
+    ("미지정", None, 0.05),
+]
+
+MANAGERS = ['윤명숙', '김장섭', '이영희', '박철수', '최민수', '정수진']
+
+# 측정할 검색 조건 (이름 -> filters)
+SEARCH_SCENARIOS = {
+    "all": {},
+    "name": {"name": "가상12"},
+    "region": {"region": "경기"},
+    "manager": {"manager": "김"},
+    "sipyung_range": {"min_sipyung": 1000000000, "max_sipyung": 20000000000},
+    "region_5y": {"region": "서울", "min_5y": 5000000000},
+    "status": {"status": ["최신"]},
+    "region_status": {"region": "경기", "status": ["1년 경과", "1년 이상 경과"]},
+}
+
+
+def _make_fills():
+    from openpyxl.styles import PatternFill
+    from openpyxl.styles.colors import Color
+
+    fills = []
+    for status, color, weight in STATUS_FILLS:
+        if color is None:
+            fills.append((None, weight))
+        else:
+            fills.append((PatternFill(fill_type='solid', fgColor=Color(**color)), weight))
+    return fills
+
+
+def _random_company_values(rng, serial):
+    """가상의 업체 한 곳의 항목별 값을 만듭니다."""
+    sipyung = rng.randint(100, 300000) * 1000000
+    perf_5y = int(sipyung * rng.uniform(0.5, 4.0))
+    start = date(rng.randint(2023, 2026), rng.randint(1, 12), rng.randint(1, 28))
+    rating = rng.choice(['AA-', 'A+', 'A0', 'BBB+', 'BBB0', 'BB+', 'B0', 'CCC+'])
+    credit = None
+    if rng.random() < 0.7:
+        credit = f"{rating}\n({start:%y.%m.%d}~{start.replace(year=start.year + 1):%y.%m.%d})"
+
+    return {
+        "대표자": f"대표{serial % 997}",
+        "사업자번호": f"{100 + serial % 900:03d}-{81 + serial % 7:02d}-{serial % 100000:05d}",
+        "지역": f"{rng.choice(REGIONS)}시 {rng.choice(['중구', '동구', '서구', '남구', '북구'])}",
+        "시평": sipyung,
+        "3년 실적": int(perf_5y * rng.uniform(0.4, 0.8)),
+        "5년 실적": perf_5y,
+        "부채비율": round(rng.uniform(0.05, 2.5), 4) if rng.random() > 0.03 else "계산불능",
+        "유동비율": round(rng.uniform(0.3, 6.0), 4),
+        "영업기간": f"{rng.randint(1975, 2023)}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+        "신용평가": credit,
+        "여성기업": "여성기업" if rng.random() < 0.1 else None,
+        "고용자수": None,
+        "일자리창출": None,
+        "품질평가": None,
+        "비고": rng.choice(MANAGERS),
+    }
+
+
+def generate_workbook(file_path, company_count, seed=0):
+    """company_count 개 업체가 들어있는 가상 워크북을 file_path 에 저장합니다."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    rng = random.Random(seed)
+    fills = _make_fills()
+    fill_choices = [fill for fill, _ in fills]
+    fill_weights = [weight for _, weight in fills]
+
+    wb = Workbook(write_only=True)
+    per_sheet = [company_count // len(REGIONS)] * len(REGIONS)
+    for i in range(company_count % len(REGIONS)):
+        per_sheet[i] += 1
+
+    serial = 0
+    for region, count in zip(REGIONS, per_sheet):
+        ws = wb.create_sheet(title=region)
+
+        def styled(value):
+            cell = WriteOnlyCell(ws, value=value)
+            fill = rng.choices(fill_choices, fill_weights)[0]
+            if fill is not None:
+                cell.fill = fill
+            return cell
+
+        ws.append([f"전 기 ( {region} )"])
+        for block_start in range(0, count, COMPANIES_PER_BLOCK):
+            block_size = min(COMPANIES_PER_BLOCK, count - block_start)
+            companies = []
+            for _ in range(block_size):
+                serial += 1
+                companies.append((f"㈜가상{serial}전기", _random_company_values(rng, serial)))
+
+            ws.append(["회사명"] + [name for name, _ in companies])
+            for item in RELATIVE_OFFSETS:
+                ws.append([item] + [styled(values[item]) for _, values in companies])
+
+    wb.save(file_path)
+    return file_path
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _peak_memory_mb(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def _throughput(func, items, min_seconds=0.5):
+    """items 를 반복 처리하며 초당 처리 건수를 계산합니다."""
+    if not items:
+        return 0.0
+    done, start = 0, time.perf_counter()
+    while True:
+        for item in items:
+            func(item)
+        done += len(items)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return round(done / elapsed, 1)
+
+
+def benchmark_size(file_path, company_count, repeat=3, measure_memory=True, seed=0):
+    """하나의 워크북에 대해 모든 항목을 측정합니다."""
+    from . import search_logic, calculation_logic, dataset_cache
+
+    result = {"companies": company_count, "file_bytes": os.path.getsize(file_path)}
+
+    (records, _), cold_parse = _timed(search_logic.parse_workbook, file_path, streaming=False)
+    result["parsed_companies"] = len(records)
+    result["cold_parse_s"] = round(cold_parse, 4)
+    _, streaming_parse = _timed(search_logic.parse_workbook, file_path, streaming=True)
+    result["cold_parse_streaming_s"] = round(streaming_parse, 4)
+    if measure_memory:
+        result["cold_parse_peak_mb"] = _peak_memory_mb(search_logic.parse_workbook, file_path, streaming=False)
+        result["cold_parse_streaming_peak_mb"] = _peak_memory_mb(search_logic.parse_workbook, file_path, streaming=True)
+
+    # 검색은 캐시된 데이터셋 기준으로 측정합니다. (첫 적재 시간은 cold_parse 로 따로 측정)
+    dataset_cache.invalidate(file_path)
+    dataset_cache.get_dataset(file_path)
+    search = {}
+    for scenario, filters in SEARCH_SCENARIOS.items():
+        timings = []
+        for _ in range(repeat):
+            rows, elapsed = _timed(
+                lambda: search_logic.search_dataset(dataset_cache.get_dataset(file_path), filters))
+            timings.append(elapsed)
+        search[scenario] = {"best_s": round(min(timings), 6), "rows": len(rows)}
+    result["warm_search"] = search
+
+    industry = "전기"
+    announcement_date = date.today()
+    ruleset = CONSORTIUM_RULES["행안부"]["30억미만"]
+    # 점수 계산 함수는 프론트가 보내는 것과 같은 dict 형태를 받습니다.
+    companies = [record.to_dict() for record in records[:2000]]
+    sample = companies
+    result["business_score_per_s"] = _throughput(
+        lambda comp: calculation_logic.calculate_business_score(comp, industry, announcement_date, ruleset),
+        sample)
+
+    rng = random.Random(seed)
+    teams = []
+    for _ in range(200 if len(companies) >= 3 else 0):
+        members = rng.sample(companies, 3)
+        teams.append([
+            {"role": "대표사" if i == 0 else "구성사", "data": member, "share": share, "source_type": industry}
+            for i, (member, share) in enumerate(zip(members, (50, 30, 20)))
+        ])
+    price_data = {"estimation_price": 2500000000, "notice_base_amount": 2700000000}
+    sipyung_info = {"is_limited": True, "limit_amount": 2000000000, "method": "비율제", "tuchal_amount": 2300000000}
+    result["consortium_per_s"] = _throughput(
+        lambda team: calculation_logic.calculate_consortium(
+            team, price_data, announcement_date, ("행안부", "30억미만"), sipyung_info, "전체"),
+        teams)
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes, work_dir, repeat=3, measure_memory=True, seed=0, keep_files=False):
+    """sizes 에 지정된 업체 수마다 워크북을 만들고 측정 결과를 JSON 형태의 dict 로 반환합니다."""
+    from . import dataset_cache
+
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    for size in sizes:
+        file_path = os.path.join(work_dir, f"bench_{size}_{seed}.xlsx")
+        if not os.path.exists(file_path):
+            _, generate_seconds = _timed(generate_workbook, file_path, size, seed)
+        else:
+            generate_seconds = 0.0
+        try:
+            result = benchmark_size(file_path, size, repeat=repeat, measure_memory=measure_memory, seed=seed)
+            result["generate_s"] = round(generate_seconds, 2)
+            results.append(result)
+        finally:
+            dataset_cache.invalidate(file_path)
+            if not keep_files and os.path.exists(file_path):
+                os.remove(file_path)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _timing_metrics(result):
+    """회귀 비교에 사용할 (이름, 소요시간) 목록. 값이 클수록 느린 지표만 모읍니다."""
+    metrics = {"cold_parse_s": result.get("cold_parse_s"),
+               "cold_parse_streaming_s": result.get("cold_parse_streaming_s")}
+    for scenario, timing in result.get("warm_search", {}).items():
+        metrics[f"warm_search.{scenario}"] = timing.get("best_s")
+    for key in ("business_score_per_s", "consortium_per_s"):
+        if result.get(key):
+            metrics[key] = 1.0 / result[key]
+    return {k: v for k, v in metrics.items() if v}
+
+
+def compare_results(baseline, current, max_regression=0.2):
+    """기준 결과와 비교하여 max_regression 비율 이상 느려진 지표 목록을 반환합니다."""
+    baseline_by_size = {r["companies"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        base = baseline_by_size.get(result["companies"])
+        if not base:
+            continue
+        base_metrics = _timing_metrics(base)
+        for name, value in _timing_metrics(result).items():
+            old = base_metrics.get(name)
+            if old and value > old * (1 + max_regression):
+                regressions.append({"companies": result["companies"], "metric": name,
+                                    "baseline": old, "current": value, "ratio": round(value / old, 2)})
+    return regressions
@@ -1,10 +1,15 @@
 # calculation_logic.py
-import utils
-# calculation_logic.py
 
-from config import INDUSTRY_AVERAGES, CREDIT_RATING_SCORES, CONSORTIUM_RULES, BUSINESS_SCORE_TABLES, PERFORMANCE_SCORE_TABLE, DURATION_SCORE_TABLES
+from . import utils
+from .config import INDUSTRY_AVERAGES, CREDIT_RATING_SCORES, CONSORTIUM_RULES, BUSINESS_SCORE_TABLES, PERFORMANCE_SCORE_TABLE, DURATION_SCORE_TABLES
+import logging
+import math
 import re
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# 예상 점수 계산에 더하는 입찰가격 점수 (고정값)
+BID_SCORE = 65
 
 
 def _is_credit_rating_valid(rating_str, announcement_date):
@@ -14,31 +19,17 @@ def _is_credit_rating_valid(rating_str, announcement_date):
     if not rating_str or not isinstance(rating_str, str) or rating_str.strip() == "":
         return "자료없음"
     
-    match = re.search(r'\((\d{2,4}[./-]\d{1,2}[./-]\d{1,2})~(\d{2,4}[./-]\d{1,2}[./-]\d{1,2})\)', rating_str.replace(" ", ""))
-    if not match:
+    try:
+        start_date, end_date = utils.parse_credit_period(rating_str)
+    except ValueError:
         return "형식오류"
 
     try:
-        start_date_str, end_date_str = match.groups()
-        
-        # 날짜 구분자(., /, -)에 상관없이 파싱
-        def parse_date(date_str):
-            for fmt in ('%Y.%m.%d', '%y.%m.%d', '%Y/%m/%d', '%y/%m/%d', '%Y-%m-%d', '%y-%m-%d'):
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
-            raise ValueError("날짜 형식이 올바르지 않습니다.")
-
-        start_date = parse_date(start_date_str)
-        end_date = parse_date(end_date_str)
-        
         if start_date <= announcement_date <= end_date:
             return "유효"
         else:
             return "기간만료"
-        
-    except (ValueError, TypeError):
+    except TypeError:
         return "형식오류"
 
 
@@ -127,8 +118,7 @@ def calculate_business_score(company_data, industry_type, announcement_date, rul
     debt_score = _calculate_debt_ratio_score(debt_ratio_vs_industry, ruleset)
     current_score = _calculate_current_ratio_score(current_ratio_vs_industry, ruleset)
 
-    # ▼▼▼▼▼ 디버깅용 print문 추가 ▼▼▼▼▼
-    print(f"[디버깅] 경영상태 점수 -> 부채: {debt_score}, 유동: {current_score}")
+    logger.debug("경영상태 점수 -> 부채: %s, 유동: %s", debt_score, current_score)
 
     # --- [핵심 추가] 영업기간 점수 계산 ---
     duration_score = 0.0
@@ -206,7 +196,7 @@ def _calculate_performance_score(ruleset, total_performance, base_amount):
 
         # [수정] 화면 표시를 위한 역산된 비율과 함께 점수 반환
         equivalent_ratio = (final_score / max_score) * 100 if max_score > 0 else 0
-        print(f"[디버깅] 시공경험 점수 -> {final_score}")
+        logger.debug("시공경험 점수 -> %s", final_score)
         return final_score, equivalent_ratio
 
 
@@ -218,7 +208,7 @@ def calculate_consortium(companies_data, price_data, announcement_date, rule_inf
     try:
         ruleset = CONSORTIUM_RULES[rule_info[0]][rule_info[1]]
     except KeyError:
-        print(f"오류: {rule_info}에 해당하는 규칙을 찾을 수 없습니다."); return None
+        logger.warning("%s에 해당하는 규칙을 찾을 수 없습니다.", rule_info); return None
 
     if not companies_data or not price_data: return None
 
@@ -331,7 +321,7 @@ def calculate_consortium(companies_data, price_data, announcement_date, rule_inf
         "ruleset": ruleset, "company_details": detailed_results, "final_business_score": final_business_score,
         "total_weighted_performance": total_weighted_performance, "performance_ratio": performance_ratio,
         "final_performance_score": final_performance_score, "total_score": final_business_score + final_performance_score,
-        "bid_score": 65, "expected_score": (final_business_score + final_performance_score) + 65,
+        "bid_score": BID_SCORE, "expected_score": (final_business_score + final_performance_score) + BID_SCORE,
         "solo_bid_results": solo_bid_results,
         "sipyung_check_result": sipyung_check_result,
         "individual_sipyung_results": individual_sipyung_results,
@@ -366,3 +356,123 @@ def check_share_limit(companies_data, tuchal_amount):
         })
 
     return results
+
+
+def _max_weighted_sum(weights, lowers, uppers, total):
+    """
+    lowers[i] <= x[i] <= uppers[i], sum(x) == total 일 때 sum(weights[i] * x[i]) 의 최댓값.
+    (하한만큼 먼저 배분한 뒤 가중치가 큰 업체부터 채우는 방식이 최적입니다) 불가능하면 None.
+    """
+    remaining = total - sum(lowers)
+    if remaining < -1e-9 or remaining > sum(u - l for l, u in zip(lowers, uppers)) + 1e-9:
+        return None
+    value = sum(w * l for w, l in zip(weights, lowers))
+    for idx in sorted(range(len(weights)), key=lambda i: weights[i], reverse=True):
+        amount = min(max(remaining, 0.0), uppers[idx] - lowers[idx])
+        value += weights[idx] * amount
+        remaining -= amount
+    return value
+
+
+def _share_interval(j, weights, lowers, uppers, required):
+    """
+    j 번째 업체 지분의 가능한 [최소, 최대]. 불가능하면 None.
+    h(t) = weights[j]*t + (나머지 업체로 100-t 를 채울 때의 최대 가중합) 은 t 에 대한 오목한 구간별 일차함수이므로,
+    꺾이는 점들에서만 값을 계산하면 h(t) >= required 인 구간을 정확히 구할 수 있습니다.
+    """
+    others = [i for i in range(len(weights)) if i != j]
+    o_weights = [weights[i] for i in others]
+    o_lowers = [lowers[i] for i in others]
+    o_uppers = [uppers[i] for i in others]
+
+    t_min = max(lowers[j], 100.0 - sum(o_uppers))
+    t_max = min(uppers[j], 100.0 - sum(o_lowers))
+    if t_min > t_max + 1e-9:
+        return None
+    if required is None:
+        return t_min, t_max
+
+    # 나머지 업체를 가중치 순서로 채울 때 한 업체가 가득 차는 지점들이 꺾이는 점입니다.
+    points = {t_min, t_max}
+    filled = sum(o_lowers)
+    for idx in sorted(range(len(others)), key=lambda i: o_weights[i], reverse=True):
+        filled += o_uppers[idx] - o_lowers[idx]
+        t = 100.0 - filled
+        if t_min < t < t_max:
+            points.add(t)
+    points = sorted(points)
+
+    def h(t):
+        rest = _max_weighted_sum(o_weights, o_lowers, o_uppers, 100.0 - t)
+        return None if rest is None else weights[j] * t + rest
+
+    values = [h(t) for t in points]
+    ok = [v is not None and v >= required - 1e-6 for v in values]
+    if not any(ok):
+        return None
+
+    def crossing(a, b):
+        # 두 점 사이 직선에서 h(t) == required 인 t
+        (ta, va), (tb, vb) = a, b
+        return ta if va == vb else ta + (required - va) * (tb - ta) / (vb - va)
+
+    first = ok.index(True)
+    last = len(ok) - 1 - ok[::-1].index(True)
+    low = points[first] if first == 0 else crossing((points[first - 1], values[first - 1]), (points[first], values[first]))
+    high = points[last] if last == len(points) - 1 else crossing((points[last], values[last]), (points[last + 1], values[last + 1]))
+    return low, high
+
+
+def solve_share_ranges(companies_data, tuchal_amount, sipyung_info, min_share=0.0):
+    """
+    컨소시엄 구성원별로 가능한 지분율(%) 범위를 계산합니다.
+
+    조건 (calculate_consortium / check_share_limit 과 같은 기준):
+    - 지분율 합계 100%, 각 업체 min_share% 이상
+    - 업체별 상한: 시평 / tuchal_amount * 100 (tuchal_amount 가 있을 때)
+    - 시평액 제한 '비율제': sum(시평 * 지분율 / 100) >= limit_amount
+    - 시평액 제한 '합산제': 지분율과 무관하게 sum(시평) >= limit_amount 여야 합니다.
+    한 업체의 범위 안의 어떤 값이든, 다른 업체 지분을 적절히 정하면 모든 조건을 만족할 수 있습니다.
+    """
+    sipyungs = [utils.parse_amount(str(comp['data'].get("시평", 0))) or 0 for comp in companies_data]
+    names = [comp.get('name') or comp['data'].get("검색된 회사", "") for comp in companies_data]
+
+    lowers = [float(min_share)] * len(companies_data)
+    caps = [(s / tuchal_amount) * 100 if tuchal_amount > 0 else None for s in sipyungs]
+    uppers = [100.0 if cap is None else min(100.0, cap) for cap in caps]
+
+    required = None
+    method = sipyung_info.get("method", "비율제")
+    limit_amount = sipyung_info.get("limit_amount", 0)
+    messages = []
+    feasible = bool(companies_data)
+    if sipyung_info.get("is_limited"):
+        if method == "비율제":
+            required = limit_amount
+        elif sum(sipyungs) < limit_amount:
+            feasible = False
+            messages.append(f"시평액 합계 미충족 (합산제) - 필요: {limit_amount:,.0f}원, 합계: {sum(sipyungs):,.0f}원")
+
+    weights = [s / 100.0 for s in sipyungs]
+    ranges = [_share_interval(j, weights, lowers, uppers, required) for j in range(len(companies_data))]
+    if any(r is None for r in ranges):
+        feasible = False
+        if required is not None:
+            messages.append(f"어떤 지분 배분으로도 시평액 비율제 조건({limit_amount:,.0f}원)과 업체별 상한을 함께 만족할 수 없습니다.")
+        else:
+            messages.append("업체별 상한/하한으로는 지분율 합계 100%를 만들 수 없습니다.")
+
+    results = []
+    for comp, name, sipyung, cap, share_range in zip(companies_data, names, sipyungs, caps, ranges):
+        row = {"name": name, "sipyung": sipyung, "cap_share": cap,
+               "min_share": None, "max_share": None, "input_share": comp.get('share')}
+        if feasible and share_range is not None:
+            # 표시용으로 자를 때 범위 밖으로 나가지 않도록 최소는 올림, 최대는 내림합니다.
+            row["min_share"] = math.ceil(round(share_range[0] * 10000, 6)) / 10000
+            row["max_share"] = math.floor(round(share_range[1] * 10000, 6)) / 10000
+            if row["input_share"] is not None:
+                row["in_range"] = row["min_share"] - 1e-6 <= float(row["input_share"]) <= row["max_share"] + 1e-6
+        results.append(row)
+
+    return {"feasible": feasible, "method": method if sipyung_info.get("is_limited") else None,
+            "messages": messages, "companies": results}
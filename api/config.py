@@ -12,6 +12,17 @@ RELATIVE_OFFSETS = {
     "일자리창출": 13, "품질평가": 14, "비고": 15
 }
 
+# 업로드 검증용: '회사명' 아래 A열 항목 이름에 들어 있어야 하는 단어 (공백 제거 후 비교)
+# 실제 파일은 '전기시공능력', '3년간 실적액'처럼 표기가 조금씩 달라서 핵심 단어만 봅니다.
+# 영업기간은 파일마다 표기(오타 포함)가 제각각이라 검사하지 않습니다.
+LAYOUT_LABELS = {
+    "대표자": ("대표자",), "사업자번호": ("사업자번호",), "지역": ("지역",),
+    "시평": ("시평", "시공능력"), "3년 실적": ("3년",), "5년 실적": ("5년",),
+    "부채비율": ("부채비율",), "유동비율": ("유동비율",), "신용평가": ("신용평가",),
+    "여성기업": ("여성기업",), "고용자수": ("고용",), "일자리창출": ("일자리",),
+    "품질평가": ("품질",), "비고": ("비고",),
+}
+
 # 업종별 평균 비율!!
 INDUSTRY_AVERAGES = {
     # 2024년 한국은행 기업경영분석 (E35-36, J61-63 기준)
@@ -19,6 +30,9 @@ INDUSTRY_AVERAGES = {
     "통신": {"부채비율": 124.03, "유동비율": 140.06},
     "소방": {"부채비율": 110.08, "유동비율": 139.32}
 }
+# 업로드 파일 타입 -> 업종 (INDUSTRY_AVERAGES 의 키)
+FILE_TYPE_INDUSTRY = {"eung": "전기", "tongsin": "통신", "sobang": "소방"}
+
 # [이 코드를 추가하세요]
 CONSORTIUM_RULES = {
     "행안부": {
@@ -175,6 +189,21 @@ PERFORMANCE_SCORE_TABLE = {
     # ]
 }
 
+# 입찰가격 점수 몬테카를로 시뮬레이션 기본값 (simulation.py, 요청에서 항목별로 바꿀 수 있음)
+# 예정가격 = 기초금액 x 사정률, 사정률은 기초금액 ±reserve_price_spread% 안의 복수예비가격 중
+# drawn_price_count 개를 추첨해 평균한 값입니다.
+# 입찰가격 점수 = max_score - penalty_per_point x |reference_rate - 투찰금액/예정가격(%)| (min_score~max_score)
+PRICE_SCORE_SIMULATION = {
+    "reserve_price_spread": 2.0,
+    "drawn_price_count": 4,
+    "floor_rates": [[87.745, 1.0]],  # [낙찰하한율(%), 확률] 목록. 투찰금액이 예정가격 x 하한율 미만이면 탈락
+    "max_score": 70.0,
+    "min_score": 2.0,
+    "reference_rate": 88.0,
+    "penalty_per_point": 4.0,
+    "pass_score": 95.0,  # 적격심사 통과 점수 (경영상태 + 시공경험 + 입찰가격)
+}
+
 
 
 
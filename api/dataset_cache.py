@@ -0,0 +1,541 @@
+# dataset_cache.py
+"""
+파싱된 업체 데이터셋을 프로세스 안에 보관하는 캐시.
+
+- 파일의 (수정시각, 크기)가 바뀌지 않았다면 다시 파싱하지 않습니다.
+- 같은 파일에 대한 파싱 요청이 동시에 들어오면 한 번만 파싱하고 결과를 함께 씁니다 (single-flight).
+- 비동기 뷰의 파싱은 크기가 제한된 별도 스레드 풀에서 실행되므로 이벤트 루프를 막지 않습니다.
+  동기 뷰(get_dataset)는 파싱을 맡게 되면 요청 스레드에서 직접 파싱합니다.
+- 업로드 직후에는 ingest() 로 여러 파일을 별도 프로세스에서 동시에 파싱해 바로 캐시에 넣습니다.
+- 지역(시트) 하나만 필요한 요청은 그 시트만 읽어 지역 데이터셋으로 보관하고, 나중에 전체 데이터셋이
+  필요해지면 이미 읽은 시트는 다시 읽지 않고 나머지 시트만 읽어 합칩니다.
+- 새 버전의 전체 데이터셋을 적재하면 snapshots 모듈이 과거 조회(as_of)용으로 보관합니다.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+
+from . import search_logic, utils
+from .indexes import BitmapIndex, IntervalIndex
+from .logging_utils import configure_worker_logging
+from .records import FIELD_INDEX, STATUS_CODES, SUMMARY_LABELS, normalize_biz_no, normalize_company_name
+
+logger = logging.getLogger(__name__)
+warmup_logger = logging.getLogger('api.warmup')  # settings.LOGGING 에서 INFO 로 따로 둡니다.
+
+FILE_TYPES = ['eung', 'tongsin', 'sobang']
+_BIZ_NO_INDEX = FIELD_INDEX['사업자번호']
+_CREDIT_INDEX = FIELD_INDEX['신용평가']
+
+# Dataset.derived(bounded=True) 로 보관하는 값(공고일/규칙별 특성 행렬 등)의 최대 개수
+DERIVED_CACHE_SIZE = 16
+
+# Dataset.serial 용. id() 와 달리 버려진 데이터셋의 번호가 새 데이터셋에 다시 쓰이지 않습니다.
+_serials = itertools.count(1)
+
+
+class Dataset:
+    """한 워크북을 파싱한 결과와, 적재 시점에 한 번 만들어 두는 인덱스."""
+
+    def __init__(self, file_path, signature, companies, sheet_names, parse_seconds):
+        self.file_path = file_path
+        self.signature = signature
+        self.companies = companies
+        self.sheet_names = sheet_names
+        self.parse_seconds = parse_seconds
+        self.loaded_at = time.time()
+        self.version = None   # 스냅숏으로 보관된 경우 그 버전 이름
+        self.serial = next(_serials)   # 이 프로세스 안에서 데이터셋마다 다른 번호 (결과 캐시 키용)
+
+        start = time.perf_counter()
+        self.all_mask = (1 << len(companies)) - 1
+        self.region_index = BitmapIndex(comp.region for comp in companies)
+        self.status_index = BitmapIndex(comp.summary for comp in companies)
+        self.biz_no_index = self._build_key_index(normalize_biz_no(comp.values[_BIZ_NO_INDEX]) for comp in companies)
+        self.name_index = self._build_key_index(normalize_company_name(comp.name) for comp in companies)
+        # 신용평가 유효기간 (공고일 기준 유효 여부, 만료 예정 조회용)
+        self.credit_index = IntervalIndex(self._credit_periods(companies), len(companies))
+        self.stats = self._build_stats()
+        self.index_seconds = time.perf_counter() - start
+
+        self._derived = {}
+        self._bounded_derived = OrderedDict()
+        self._derived_lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.companies)
+
+    def derived(self, key, build, bounded=False):
+        """
+        이 데이터셋에서 파생되는 값(추천용 특성 행렬, 정렬 순서 등)을 처음 요청될 때 build(self) 로 한 번 만들고
+        이후에는 그대로 돌려줍니다. 데이터셋이 교체되면 함께 버려집니다.
+
+        bounded=True 는 키에 요청 값(공고일, 규칙 등)이 들어 있어 종류가 계속 늘어날 수 있는 값입니다.
+        최근에 쓴 DATASET_DERIVED_CACHE_SIZE 개만 보관하고 오래 쓰지 않은 것부터 버립니다. (LRU)
+        """
+        if bounded:
+            return self._bounded(key, build)
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = self._derived[key] = build(self)
+        return value
+
+    def _bounded(self, key, build):
+        with self._derived_lock:
+            value = self._bounded_derived.get(key)
+            if value is not None:
+                self._bounded_derived.move_to_end(key)
+                return value
+            value = self._bounded_derived[key] = build(self)
+            limit = getattr(settings, 'DATASET_DERIVED_CACHE_SIZE', DERIVED_CACHE_SIZE)
+            while len(self._bounded_derived) > limit:
+                self._bounded_derived.popitem(last=False)
+            return value
+
+    def derived_values(self):
+        """지금 보관 중인 파생 값 목록 (메모리 어림용)"""
+        with self._derived_lock:
+            return list(self._derived.values()) + list(self._bounded_derived.values())
+
+    @staticmethod
+    def _build_key_index(keys):
+        """키 -> 위치 튜플. (같은 사업자번호가 여러 시트/행에 나오는 경우가 있어 위치를 모두 보관합니다)"""
+        index = {}
+        for pos, key in enumerate(keys):
+            if key:
+                index.setdefault(key, []).append(pos)
+        return {key: tuple(positions) for key, positions in index.items()}
+
+    @staticmethod
+    def _credit_periods(companies):
+        """신용평가 '(시작~종료)' 기간을 읽을 수 있는 업체의 (위치, 시작일, 종료일)"""
+        for pos, comp in enumerate(companies):
+            rating = comp.values[_CREDIT_INDEX]
+            if not rating or not isinstance(rating, str):
+                continue
+            try:
+                start, end = utils.parse_credit_period(rating)
+            except ValueError:
+                continue
+            yield pos, start, end
+
+    def find_by_biz_no(self, biz_no):
+        """사업자번호(하이픈 유무 무관)로 업체 목록을 반환합니다."""
+        return [self.companies[pos] for pos in self.biz_no_index.get(normalize_biz_no(biz_no), ())]
+
+    def find_by_name(self, name):
+        """업체명(법인 표기/공백 무시) 정확히 일치하는 업체 목록을 반환합니다."""
+        return [self.companies[pos] for pos in self.name_index.get(normalize_company_name(name), ())]
+
+    def _build_stats(self):
+        """지역별/요약상태별 업체 수"""
+        def count_by_status(within):
+            return {label: self.status_index.count(STATUS_CODES[label], within) for label in SUMMARY_LABELS}
+
+        regions = [name.strip() for name in self.sheet_names]
+        regions += [region for region in self.region_index.keys() if region not in regions]
+        return {
+            "total": len(self.companies),
+            "statuses": count_by_status(None),
+            "regions": {
+                region: {"total": self.region_index.count(region), **count_by_status(self.region_index.get(region))}
+                for region in regions
+            },
+        }
+
+
+_cache = {}      # file_path -> Dataset
+_previous = {}   # file_path -> 새 버전으로 교체되기 직전의 Dataset (변경 내역 비교용)
+_regions = {}    # file_path -> (signature, {지역: 그 시트만 읽은 Dataset})
+_inflight = {}   # (file_path, signature, 지역 또는 None) -> Future
+_lock = threading.RLock()
+_executor = None
+
+
+def get_excel_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'excel')
+
+
+def get_excel_path(file_type):
+    return os.path.join(get_excel_dir(), f"{file_type}.xlsx")
+
+
+def file_signature(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_signature_or_none(file_path):
+    try:
+        return file_signature(file_path)
+    except OSError:
+        return None
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, 'DATASET_PARSE_WORKERS', 2)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dataset-parse')
+        return _executor
+
+
+def _streaming_threshold():
+    return getattr(settings, 'STREAMING_PARSE_THRESHOLD_BYTES', search_logic.STREAMING_THRESHOLD_BYTES)
+
+
+def _timed_parse(file_path, streaming_threshold, sheet_names=None):
+    """워크북을 파싱하고 (업체 목록, 시트 이름, 걸린 시간)을 반환합니다. (ingest 의 자식 프로세스에서도 실행)"""
+    start = time.perf_counter()
+    companies, all_sheet_names = search_logic.parse_workbook(
+        file_path, sheet_names=sheet_names, streaming_threshold=streaming_threshold)
+    return companies, all_sheet_names, time.perf_counter() - start
+
+
+def _install(file_path, signature, parsed, reintern=False):
+    companies, sheet_names, parse_seconds = parsed
+    if reintern:
+        # ingest 의 자식 프로세스에서 파싱한 레코드 (intern 된 문자열을 다른 데이터셋과 다시 공유)
+        for comp in companies:
+            comp.intern_strings()
+    dataset = Dataset(file_path, signature, companies, sheet_names, parse_seconds)
+    with _lock:
+        # 파싱하는 동안 파일이 다시 바뀌었다면 이 결과는 캐시에 넣지 않습니다.
+        if signature == file_signature_or_none(file_path):
+            replaced = _cache.get(file_path)
+            if replaced is not None and replaced.signature != signature:
+                _previous[file_path] = replaced
+            _cache[file_path] = dataset
+            # 전체 데이터셋이 생겼으므로 지역별 데이터셋은 더 이상 필요 없습니다.
+            _regions.pop(file_path, None)
+            installed = True
+        else:
+            installed = False
+    if installed:
+        _archive(dataset)
+    return dataset
+
+
+def _archive(dataset):
+    from . import snapshots
+
+    try:
+        dataset.version = snapshots.archive(dataset)
+    except Exception:
+        # 보관에 실패해도 현재 데이터 검색에는 영향이 없어야 합니다.
+        logger.exception("스냅숏 보관 실패: %s", dataset.file_path)
+
+
+def archive_current(file_path):
+    """
+    file_path 를 교체하기 직전에, 이미 적재된 지금 버전이 아직 보관되지 않았으면 스냅숏으로 보관합니다.
+    캐시에 없는 버전은 여기서 파싱하지 않습니다. (업로드 요청 안에서 파일마다 파싱하게 되므로)
+    """
+    if not getattr(settings, 'SNAPSHOT_ARCHIVE', True):
+        return
+    dataset = get_cached_dataset(file_path)
+    if dataset is not None and dataset.version is None:
+        _archive(dataset)
+
+
+def _cached_regions(file_path, signature):
+    entry = _regions.get(file_path)
+    if entry is None or entry[0] != signature:
+        return {}
+    return dict(entry[1])
+
+
+def _load(file_path, signature):
+    threshold = _streaming_threshold()
+    loaded = _cached_regions(file_path, signature)
+    if not loaded:
+        return _install(file_path, signature, _timed_parse(file_path, threshold))
+
+    # 이미 읽은 지역 시트는 재사용하고, 나머지 시트만 읽어서 원래 시트 순서대로 합칩니다.
+    sheet_names = next(iter(loaded.values())).sheet_names
+    regions = [name.strip() for name in sheet_names]
+    if len(set(regions)) != len(regions):
+        return _install(file_path, signature, _timed_parse(file_path, threshold))
+
+    missing = [name for name, region in zip(sheet_names, regions) if region not in loaded]
+    parse_seconds = sum(dataset.parse_seconds for dataset in loaded.values())
+    by_region = {}
+    if missing:
+        companies, sheet_names, seconds = _timed_parse(file_path, threshold, sheet_names=missing)
+        parse_seconds += seconds
+        for comp in companies:
+            by_region.setdefault(comp.region, []).append(comp)
+
+    companies = []
+    for region in regions:
+        companies.extend(loaded[region].companies if region in loaded else by_region.get(region, ()))
+    return _install(file_path, signature, (companies, sheet_names, parse_seconds))
+
+
+def _load_region(file_path, signature, region):
+    """지역(시트) 하나만 읽어 지역 데이터셋을 만듭니다."""
+    companies, sheet_names, parse_seconds = _timed_parse(file_path, _streaming_threshold(), sheet_names=[region])
+    dataset = Dataset(file_path, signature, companies, sheet_names, parse_seconds)
+    with _lock:
+        full = _cache.get(file_path)
+        # 파일이 바뀌었거나, 그 사이 전체 데이터셋이 생겼다면 보관하지 않습니다.
+        if signature == file_signature_or_none(file_path) and (full is None or full.signature != signature):
+            entry = _regions.get(file_path)
+            if entry is None or entry[0] != signature:
+                entry = _regions[file_path] = (signature, {})
+            entry[1][region] = dataset
+    return dataset
+
+
+def get_cached_dataset(file_path):
+    """이미 최신 버전이 캐시에 있으면 반환하고, 없으면 None 을 반환합니다. 파싱하지 않습니다."""
+    signature = file_signature_or_none(file_path)
+    dataset = _cache.get(file_path)
+    if dataset is not None and dataset.signature == signature:
+        return dataset
+    return None
+
+
+def _region_key(region):
+    """'전체' 또는 빈 값이면 None(전체 데이터셋), 아니면 공백을 뺀 지역명"""
+    if not region or region.strip() == '전체':
+        return None
+    return region.strip()
+
+
+def _dataset_future(file_path, region=None, inline=False):
+    """
+    캐시된 데이터셋 또는 진행 중인 파싱 작업의 Future 를 돌려줍니다. 필요하면 파싱을 시작합니다.
+    region 이 있으면 전체 데이터셋이 캐시에 없을 때 그 지역 시트만 읽습니다.
+    inline=True 이면 새 파싱을 스레드 풀에 넘기지 않고 이 호출 스레드에서 끝낸 뒤 돌려줍니다.
+    (동기 뷰용. 요청 스레드에서 파싱해야 ?profile=1 프로파일에 파싱 시간이 잡힙니다.)
+    """
+    signature = file_signature(file_path)
+    region = _region_key(region)
+    key = (file_path, signature, region)
+    with _lock:
+        dataset = _cache.get(file_path)
+        if dataset is not None and dataset.signature == signature:
+            return dataset, None
+        if region is not None:
+            dataset = _cached_regions(file_path, signature).get(region)
+            if dataset is not None:
+                return dataset, None
+        future = _inflight.get(key)
+        if future is not None:
+            return None, future
+
+    if region is None:
+        job = lambda: _load(file_path, signature)
+    else:
+        job = lambda: _load_region(file_path, signature, region)
+    executor = None if inline else _get_executor()
+    owner = False
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            if inline:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                owner = True
+            else:
+                future = executor.submit(job)
+            _inflight[key] = future
+            future.add_done_callback(lambda done: _discard_inflight(key, done))
+
+    if owner:
+        # 같은 파일을 기다리는 다른 요청(동기/비동기)은 이 Future 로 결과를 함께 받습니다.
+        try:
+            future.set_result(job())
+        except BaseException as e:
+            future.set_exception(e)
+    return None, future
+
+
+def _discard_inflight(key, future):
+    # 같은 키로 나중에 등록된 다른 작업은 지우지 않습니다.
+    with _lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def get_dataset(file_path, region=None):
+    """
+    파일의 데이터셋을 반환합니다. 캐시에 없으면 파싱이 끝날 때까지 기다립니다.
+    region 을 주면 전체 데이터셋이 아직 없을 때 그 지역만 담긴 데이터셋을 돌려줄 수 있습니다.
+    처음 파싱을 맡게 되면 호출한 스레드에서 직접 파싱합니다.
+    """
+    dataset, future = _dataset_future(file_path, region, inline=True)
+    if dataset is not None:
+        return dataset
+    return future.result()
+
+
+async def aget_dataset(file_path, region=None):
+    """get_dataset 의 비동기 버전. 캐시 적중 시에는 스레드 풀을 거치지 않습니다."""
+    dataset, future = _dataset_future(file_path, region)
+    if dataset is not None:
+        return dataset
+    return await asyncio.wrap_future(future)
+
+
+def get_previous_dataset(file_path):
+    """현재 데이터셋으로 교체되기 직전 버전. 이 프로세스에서 교체된 적이 없으면 None."""
+    return _previous.get(file_path)
+
+
+def get_sheet_names(file_path):
+    """시트 이름 목록. 캐시된 데이터셋이 있으면 파일을 열지 않습니다."""
+    dataset = get_cached_dataset(file_path)
+    if dataset is not None:
+        return list(dataset.sheet_names)
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filename=file_path, read_only=True, keep_links=False)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def invalidate(file_path=None):
+    """캐시를 비웁니다. file_path 가 없으면 전체를 비웁니다."""
+    with _lock:
+        if file_path is None:
+            _cache.clear()
+            _previous.clear()
+            _regions.clear()
+        else:
+            _cache.pop(file_path, None)
+            _previous.pop(file_path, None)
+            _regions.pop(file_path, None)
+
+
+def ingest(file_paths):
+    """
+    새로 교체된 파일들을 병렬로 파싱해 캐시에 넣고, {file_path: Dataset 또는 예외} 를 반환합니다.
+
+    파일이 둘 이상이면 spawn 방식의 프로세스 풀에서 파일마다 따로 파싱합니다. (파싱은 CPU 작업이라
+    스레드로는 GIL 때문에 동시에 진행되지 않습니다.) 파싱하는 동안 들어온 검색 요청은
+    새로 파싱을 시작하지 않고 이 작업의 결과를 함께 기다립니다.
+    """
+    pending, joined = {}, {}
+    with _lock:
+        for file_path in file_paths:
+            key = (file_path, file_signature(file_path), None)
+            future = _inflight.get(key)
+            if future is not None:
+                # 같은 버전을 이미 다른 요청이 파싱하고 있으면 그 결과를 함께 씁니다.
+                joined[file_path] = future
+                continue
+            future = Future()
+            future.set_running_or_notify_cancel()
+            _inflight[key] = future
+            pending[file_path] = (key, future)
+
+    results = {}
+    threshold = _streaming_threshold()
+
+    def finish(file_path, parse, reintern=False):
+        key, future = pending[file_path]
+        try:
+            dataset = _install(file_path, key[1], parse(), reintern)
+        except Exception as e:
+            future.set_exception(e)
+            results[file_path] = e
+        else:
+            future.set_result(dataset)
+            results[file_path] = dataset
+        finally:
+            _discard_inflight(key, future)
+
+    if len(pending) == 1:
+        for file_path in pending:
+            finish(file_path, lambda: _timed_parse(file_path, threshold))
+    elif pending:
+        workers = min(len(pending), getattr(settings, 'DATASET_INGEST_PROCESSES', 3))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=configure_worker_logging) as pool:
+            jobs = {file_path: pool.submit(_timed_parse, file_path, threshold) for file_path in pending}
+            for file_path, job in jobs.items():
+                finish(file_path, job.result, reintern=True)
+
+    for file_path, future in joined.items():
+        try:
+            results[file_path] = future.result()
+        except Exception as e:
+            results[file_path] = e
+    return results
+
+
+def warm_up(file_types=None):
+    """
+    파일 타입별 데이터셋을 미리 적재하고, 걸린 시간을 목록으로 반환합니다.
+    (서버가 요청을 받기 전에 호출하여 첫 사용자가 파싱 비용을 치르지 않도록 합니다.)
+    """
+    pending = []
+    report = []
+    for file_type in file_types or FILE_TYPES:
+        file_path = get_excel_path(file_type)
+        if not os.path.exists(file_path):
+            report.append({"file_type": file_type, "status": "파일 없음"})
+            continue
+        # 세 파일을 먼저 모두 요청해 두고(제한된 스레드 풀에서 동시에 파싱) 결과를 차례로 기다립니다.
+        pending.append((file_type, time.perf_counter(), _dataset_future(file_path)))
+
+    for file_type, start, (dataset, future) in pending:
+        try:
+            if dataset is None:
+                dataset = future.result()
+        except Exception as e:
+            report.append({"file_type": file_type, "status": "오류", "error": str(e)})
+            continue
+        report.append({
+            "file_type": file_type,
+            "status": "완료",
+            "companies": len(dataset),
+            "parse_seconds": round(dataset.parse_seconds, 3),
+            "seconds": round(time.perf_counter() - start, 3),
+        })
+    return report
+
+
+def warm_up_imports():
+    """URLconf 와 뷰 모듈(drf_yasg 등)을 미리 불러와 첫 요청의 import 비용을 없앱니다."""
+    start = time.perf_counter()
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    return round(time.perf_counter() - start, 3)
+
+
+def warm_up_on_startup():
+    """
+    settings.DATASET_WARMUP_ON_STARTUP 이면 데이터셋과 URL/뷰 모듈을 미리 적재하고, 결과를 api.warmup 로거에
+    남긴 뒤 warm_up 의 결과 목록을 반환합니다. (꺼져 있으면 None)
+    요청을 받는 프로세스에서만 불러야 하므로 bigging/wsgi.py, asgi.py 에서 application 을 만든 뒤 호출합니다.
+    """
+    if not getattr(settings, 'DATASET_WARMUP_ON_STARTUP', False):
+        return None
+    report = warm_up()
+    for item in report:
+        if item["status"] == "완료":
+            warmup_logger.info("[warm-up] %s: 업체 %d개, %s초", item["file_type"], item["companies"], item["seconds"])
+        else:
+            warmup_logger.warning("[warm-up] %s: %s %s", item["file_type"], item["status"], item.get("error", ""))
+    warmup_logger.info("[warm-up] URL/뷰 모듈 로딩: %s초", warm_up_imports())
+    return report
@@ -0,0 +1,77 @@
+# diff.py
+"""
+같은 파일 타입의 이전 데이터셋과 새 데이터셋을 비교합니다.
+
+업체는 (사업자번호 숫자, 지역, 같은 키 안에서의 순번)으로 맞춥니다. 실제 파일에는 같은 사업자번호가
+같은 시트에 두 번 이상 나오는 경우가 있어, 순번까지 넣어야 업체가 일대일로 짝지어집니다.
+사업자번호가 비어 있으면 업체명으로 대신합니다.
+이전 데이터셋의 키 -> 위치 dict 를 한 번 만들고(hash join), 새 데이터셋을 한 번 훑으며 비교합니다.
+"""
+
+from .records import FIELD_INDEX, STATUS_LABELS, normalize_biz_no
+
+DIFF_FIELDS = ('시평', '3년 실적', '5년 실적', '부채비율')
+_DIFF_INDEXES = tuple((field, FIELD_INDEX[field]) for field in DIFF_FIELDS)
+_BIZ_NO_INDEX = FIELD_INDEX['사업자번호']
+
+
+def _company_keys(companies):
+    """업체마다 비교용 키를 만듭니다. (companies 순서와 같은 리스트)"""
+    seen = {}
+    keys = []
+    for comp in companies:
+        base = normalize_biz_no(comp.values[_BIZ_NO_INDEX]) or f"name:{str(comp.name).strip()}"
+        ordinal = seen.get((base, comp.region), 0)
+        seen[(base, comp.region)] = ordinal + 1
+        keys.append((base, comp.region, ordinal))
+    return keys
+
+
+def _identity(comp):
+    return {"사업자번호": comp.values[_BIZ_NO_INDEX], "업체명": comp.name, "지역": comp.region}
+
+
+def _compare(before, after):
+    """두 업체의 바뀐 값/상태를 반환합니다. 바뀐 것이 없으면 None."""
+    changes, status_changes = {}, {}
+    for field, idx in _DIFF_INDEXES:
+        if before.values[idx] != after.values[idx]:
+            changes[field] = {"before": before.values[idx], "after": after.values[idx]}
+        if before.statuses[idx] != after.statuses[idx]:
+            status_changes[field] = {"before": STATUS_LABELS[before.statuses[idx]],
+                                     "after": STATUS_LABELS[after.statuses[idx]]}
+    if before.summary != after.summary:
+        status_changes["요약상태"] = {"before": STATUS_LABELS[before.summary], "after": STATUS_LABELS[after.summary]}
+    if not changes and not status_changes:
+        return None
+    return {**_identity(after), "changes": changes, "status_changes": status_changes}
+
+
+def diff_datasets(previous, current):
+    """이전/현재 Dataset 의 추가·삭제·변경 업체 목록과 개수를 반환합니다."""
+    previous_positions = {key: pos for pos, key in enumerate(_company_keys(previous.companies))}
+
+    added, changed = [], []
+    matched = set()
+    for comp, key in zip(current.companies, _company_keys(current.companies)):
+        pos = previous_positions.get(key)
+        if pos is None:
+            added.append(_identity(comp))
+            continue
+        matched.add(pos)
+        change = _compare(previous.companies[pos], comp)
+        if change is not None:
+            changed.append(change)
+
+    removed = [_identity(comp) for pos, comp in enumerate(previous.companies) if pos not in matched]
+    return {
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "unchanged": len(matched) - len(changed),
+        },
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
@@ -0,0 +1,118 @@
+# export.py
+"""
+검색 결과와 컨소시엄 계산 결과를 CSV / XLSX 파일로 내려받기 위한 스트리밍 응답.
+
+행은 캐시된 CompanyRecord 의 값 튜플에서 바로 만들고(to_dict 를 거치지 않음) 청크 단위로 흘려보내므로,
+전체 데이터셋을 내보내도 응답 본문을 메모리에 모으지 않습니다.
+- CSV: 행 묶음(EXPORT_CHUNK_ROWS)마다 바로 전송하므로 다운로드가 곧바로 시작됩니다.
+- XLSX: openpyxl write_only 모드로 임시 파일에 쓰고(행은 디스크로 바로 나감), 저장이 끝나면 파일을
+  청크 단위로 읽어 보냅니다. xlsx 는 zip 형식이라 파일이 완성되기 전에는 보낼 수 없습니다.
+"""
+
+import csv
+import os
+import re
+import tempfile
+
+from django.http import StreamingHttpResponse
+
+from .records import FIELDS, STATUS_LABELS
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_CHUNK_ROWS = 1000
+FILE_CHUNK_BYTES = 64 * 1024
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+COMPANY_COLUMNS = ("업체명", "대표지역", *FIELDS, "요약상태")
+CONSORTIUM_COLUMNS = (
+    "팀", "팀 이름", "역할", "업체명", "사업자번호", "지분", "경영점수", "경영점수 근거", "5년 실적",
+    "팀 경영상태 점수", "팀 시공경험 점수", "실적 비율", "예상 점수", "시평액 검증",
+)
+
+# 엑셀 셀에 넣을 수 없는 제어 문자 (openpyxl 의 ILLEGAL_CHARACTERS_RE 와 같은 범위)
+_ILLEGAL_CHARACTERS = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+
+def company_rows(companies):
+    """CompanyRecord 목록을 COMPANY_COLUMNS 순서의 행으로 하나씩 만듭니다."""
+    for comp in companies:
+        yield (comp.name, comp.region, *comp.values, STATUS_LABELS[comp.summary])
+
+
+def consortium_rows(teams):
+    """[(팀 이름, calculate_consortium 결과)] 를 구성원 한 명당 한 행으로 만듭니다."""
+    for number, (name, result) in enumerate(teams, start=1):
+        team_values = (
+            result["final_business_score"], result["final_performance_score"], result["performance_ratio"],
+            result["expected_score"], result["sipyung_check_result"]["message"],
+        )
+        for member in result["company_details"]:
+            score = member["business_score_details"]
+            yield (
+                number, name, member.get("role") or "", member.get("name") or "",
+                member["data"].get("사업자번호", ""), member.get("share"),
+                score.get("total"), score.get("basis"), member.get("performance_5y"),
+                *team_values,
+            )
+
+
+class _Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 가짜 파일"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(columns, rows):
+    # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 으로 시작합니다.
+    writer = csv.writer(_Echo())
+    yield ("\ufeff" + writer.writerow(columns)).encode("utf-8")
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(["" if value is None else value for value in row]))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def _cell(value):
+    if isinstance(value, str):
+        return _ILLEGAL_CHARACTERS.sub("", value)
+    return value
+
+
+def stream_xlsx(columns, rows, sheet_title="결과"):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([_cell(value) for value in row])
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(tmp_path)
+        with open(tmp_path, "rb") as f:
+            for chunk in iter(lambda: f.read(FILE_CHUNK_BYTES), b""):
+                yield chunk
+    finally:
+        os.remove(tmp_path)
+
+
+def export_response(export_format, columns, rows, filename, sheet_title="결과"):
+    """rows(지연 생성기)를 export_format 형식의 첨부 파일로 흘려보내는 응답"""
+    if export_format == "xlsx":
+        content = stream_xlsx(columns, rows, sheet_title)
+    else:
+        content = stream_csv(columns, rows)
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,135 @@
+# indexes.py
+"""
+데이터셋 위에 미리 만들어 두는 검색용 인덱스.
+
+비트맵은 파이썬 정수 하나로 표현합니다. i 번째 비트가 1 이면 dataset.companies[i] 가 해당 값을 가진다는 뜻이며,
+여러 조건은 &, | 연산으로 조합하고 개수는 int.bit_count() 로 셉니다.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+def bitmap_from_positions(positions, size):
+    """위치 목록으로 비트맵(int)을 만듭니다."""
+    bits = bytearray((size + 7) // 8)
+    for pos in positions:
+        bits[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(bits, 'little')
+
+
+# 바이트 값(0~255) -> 1 인 비트 위치 목록
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_positions(mask):
+    """비트맵에서 1 인 비트의 위치를 오름차순으로 반환합니다."""
+    if not mask:
+        return []
+    positions = []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    for byte_idx, byte in enumerate(data):
+        if byte:
+            base = byte_idx << 3
+            positions.extend([base + bit for bit in _BYTE_BITS[byte]])
+    return positions
+
+
+class BitmapIndex:
+    """값 -> 비트맵 인덱스 (지역, 요약상태처럼 종류가 적은 값에 사용)"""
+
+    def __init__(self, values):
+        positions = {}
+        size = 0
+        for pos, value in enumerate(values):
+            positions.setdefault(value, []).append(pos)
+            size = pos + 1
+        self.size = size
+        self._bitmaps = {value: bitmap_from_positions(pos_list, size) for value, pos_list in positions.items()}
+
+    def get(self, value):
+        return self._bitmaps.get(value, 0)
+
+    def any_of(self, values):
+        mask = 0
+        for value in values:
+            mask |= self.get(value)
+        return mask
+
+    def count(self, value, within=None):
+        mask = self.get(value)
+        if within is not None:
+            mask &= within
+        return mask.bit_count()
+
+    def keys(self):
+        return self._bitmaps.keys()
+
+
+class PrefixIndex:
+    """
+    접두어 검색용 인덱스. 키를 정렬된 배열로 들고 있어, 접두어로 시작하는 키들은 bisect 로 찾은
+    연속 구간이 됩니다. (트리 노드를 만들지 않는 평평한 trie)
+    """
+
+    def __init__(self, keys):
+        pairs = sorted((key, pos) for pos, key in enumerate(keys) if key)
+        self.keys = [key for key, _ in pairs]
+        self.positions = [pos for _, pos in pairs]
+
+    def search(self, prefix, limit, accept=None):
+        """prefix 로 시작하는 키의 위치를 키 순서대로 최대 limit 개 반환합니다. accept(pos) 로 거를 수 있습니다."""
+        found = []
+        if not prefix:
+            return found
+        for idx in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[idx].startswith(prefix):
+                break
+            pos = self.positions[idx]
+            if accept is None or accept(pos):
+                found.append(pos)
+                if len(found) >= limit:
+                    break
+        return found
+
+
+class IntervalIndex:
+    """
+    [시작, 끝] 구간(양 끝 포함) 인덱스. 구간은 (위치, 시작, 끝) 으로 받습니다.
+
+    구간을 시작 값 순, 끝 값 순으로 정렬한 배열만 들고 있습니다. (메모리는 구간 수에 비례)
+    - 어떤 시점을 포함하는 구간: bisect 로 '시작 <= 시점' 과 '끝 < 시점' 의 경계를 찾고, 둘의 차집합을
+      비트맵으로 만듭니다. (다른 비트맵 조건과 바로 & 가능) 앞쪽(이미 시작한 구간)과 뒤쪽(아직 끝나지 않은 구간)
+      중 위치가 적은 쪽으로 만들어, 비용은 많아야 구간 수만큼입니다.
+    - 끝 값이 범위 안에 있는 구간: 끝 값 순 배열의 연속 구간으로 꺼냅니다.
+    """
+
+    def __init__(self, intervals, size):
+        self.size = size
+        self.intervals = sorted(intervals, key=lambda item: (item[2], item[0]))
+        self.ends = [end for _, _, end in self.intervals]
+        self._end_positions = [pos for pos, _, _ in self.intervals]
+        by_start = sorted((start, pos) for pos, start, _ in self.intervals)
+        self._starts = [start for start, _ in by_start]
+        self._start_positions = [pos for _, pos in by_start]
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def containing(self, point):
+        """point 를 포함하는(시작 <= point <= 끝) 구간들의 비트맵"""
+        total = len(self.intervals)
+        started = bisect_right(self._starts, point)   # 시작 <= point 인 구간 수
+        ended = bisect_left(self.ends, point)         # 끝 < point 인 구간 수 (모두 이미 시작한 구간)
+        if started + ended <= 2 * total - started - ended:
+            # 시작한 구간 - 끝난 구간
+            return (bitmap_from_positions(self._start_positions[:started], self.size)
+                    & ~bitmap_from_positions(self._end_positions[:ended], self.size))
+        # 끝나지 않은 구간 - 아직 시작하지 않은 구간
+        return (bitmap_from_positions(self._end_positions[ended:], self.size)
+                & ~bitmap_from_positions(self._start_positions[started:], self.size))
+
+    def ending_between(self, low=None, high=None):
+        """끝 값이 low 이상 high 미만인 (위치, 시작, 끝) 목록을 끝 값 순으로 반환합니다. None 이면 제한 없음."""
+        lo = 0 if low is None else bisect_left(self.ends, low)
+        hi = len(self.ends) if high is None else bisect_left(self.ends, high)
+        return self.intervals[lo:hi]
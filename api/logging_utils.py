@@ -0,0 +1,78 @@
+# logging_utils.py
+"""
+settings.LOGGING 에서 쓰는 로깅 도구.
+
+- QueueListenerHandler: 요청 처리 스레드는 로그 레코드를 큐에 넣기만 하고, 실제 파일 쓰기는
+  백그라운드 스레드(QueueListener)가 합니다. 디스크 I/O 가 검색/점수 계산 시간에 섞이지 않습니다.
+- JsonFormatter: 한 줄에 JSON 객체 하나. logger.error(..., extra={...}) 로 넘긴 값도 함께 기록합니다.
+"""
+
+import atexit
+import json
+import logging
+import logging.config
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord 기본 속성 (이 밖의 속성은 extra 로 넘어온 값으로 봅니다)
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """시각, 레벨, 로거, 메시지와 extra 값을 JSON 한 줄로 기록합니다."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _resolve_handlers(handlers):
+    # dictConfig 의 cfg://handlers.<이름> 은 참조하는 핸들러가 먼저 만들어져 있어야 객체로 바뀝니다.
+    # (dictConfig 는 핸들러를 이름 순으로 만들므로, 대상 핸들러 이름이 이 핸들러보다 앞서야 합니다.)
+    resolved = [handlers[i] for i in range(len(handlers))]
+    for handler in resolved:
+        if not isinstance(handler, logging.Handler):
+            raise ValueError("QueueListenerHandler 의 대상 핸들러가 아직 설정되지 않았습니다. (핸들러 이름 순서 확인)")
+    return resolved
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    받은 레코드를 큐에 넣고, 백그라운드 스레드에서 handlers 로 넘겨 기록하는 핸들러.
+
+    settings.LOGGING 예:
+        'queue': {'()': 'api.logging_utils.QueueListenerHandler', 'handlers': ['cfg://handlers.file']}
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        self.listener = QueueListener(self.queue, *_resolve_handlers(handlers),
+                                      respect_handler_level=respect_handler_level)
+        self.listener.start()
+        # 프로세스가 끝날 때 큐에 남은 레코드를 모두 기록하고 멈춥니다.
+        atexit.register(self.stop)
+
+    def stop(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+def configure_worker_logging():
+    """spawn 방식 작업 프로세스의 initializer. 부모와 같은 settings.LOGGING 으로 로그를 남깁니다."""
+    from django.conf import settings
+
+    logging.config.dictConfig(settings.LOGGING)
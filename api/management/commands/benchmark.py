@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmark
+
+
+class Command(BaseCommand):
+    help = "가상 워크북으로 파싱/검색/점수 계산 성능을 측정하고 결과를 JSON으로 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help="측정할 업체 수 목록 (기본값: 1000 10000 50000)")
+        parser.add_argument('--repeat', type=int, default=3, help="검색 시나리오별 반복 횟수")
+        parser.add_argument('--seed', type=int, default=0, help="가상 데이터 생성용 시드")
+        parser.add_argument('--work-dir', default=None, help="가상 워크북을 저장할 폴더 (기본값: 임시 폴더)")
+        parser.add_argument('--keep-files', action='store_true', help="측정 후 가상 워크북을 지우지 않습니다.")
+        parser.add_argument('--no-memory', action='store_true', help="최대 메모리 측정(tracemalloc)을 건너뜁니다.")
+        parser.add_argument('--output', default=None, help="결과 JSON을 저장할 파일 경로 (기본값: 표준출력)")
+        parser.add_argument('--baseline', default=None, help="비교할 이전 결과 JSON 파일")
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help="기준 대비 허용하는 최대 성능 저하 비율 (기본값: 0.2 = 20%%)")
+
+    def handle(self, *args, **options):
+        work_dir = options['work_dir'] or os.path.join(tempfile.gettempdir(), 'bigging_benchmark')
+        report = benchmark.run_benchmarks(
+            options['sizes'], work_dir,
+            repeat=options['repeat'],
+            measure_memory=not options['no_memory'],
+            seed=options['seed'],
+            keep_files=options['keep_files'],
+        )
+
+        regressions = []
+        if options['baseline']:
+            try:
+                with open(options['baseline'], 'r', encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                raise CommandError(f"기준 결과 파일을 읽을 수 없습니다: {e}")
+            regressions = benchmark.compare_results(baseline, report, options['max_regression'])
+            report["regressions"] = regressions
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+        else:
+            self.stdout.write(output)
+
+        if regressions:
+            raise CommandError(f"성능 저하가 감지되었습니다: {len(regressions)}개 지표")
@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import traffic
+
+
+class Command(BaseCommand):
+    help = "TrafficCaptureMiddleware 로 기록한 요청을 서버에 다시 보내고 엔드포인트별 처리량/지연 시간을 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('capture_file', help="기록 파일 (settings.TRAFFIC_CAPTURE_FILE)")
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help="요청을 보낼 서버 (기본값: http://127.0.0.1:8000)")
+        parser.add_argument('--concurrency', type=int, default=8, help="동시에 보내는 요청 수 (기본값: 8)")
+        parser.add_argument('--rate', type=float, default=None, help="초당 요청 수 (기본값: 제한 없음)")
+        parser.add_argument('--speed', type=float, default=None,
+                            help="기록된 요청 간격을 이 배수만큼 빠르게 재현합니다. (--rate 대신)")
+        parser.add_argument('--endpoint', action='append', default=None,
+                            help="이 엔드포인트만 재생 (예: /api/search/, 여러 번 지정 가능)")
+        parser.add_argument('--limit', type=int, default=None, help="재생할 최대 요청 수")
+        parser.add_argument('--repeat', type=int, default=1, help="기록 전체를 반복할 횟수 (기본값: 1)")
+        parser.add_argument('--timeout', type=float, default=30.0, help="요청별 제한 시간(초)")
+        parser.add_argument('--output', default=None, help="결과 JSON을 저장할 파일 경로 (기본값: 표준출력)")
+
+    def handle(self, *args, **options):
+        if options['rate'] and options['speed']:
+            raise CommandError("--rate 와 --speed 는 함께 쓸 수 없습니다.")
+        try:
+            entries = traffic.load_capture(options['capture_file'], options['endpoint'], options['limit'])
+        except OSError as e:
+            raise CommandError(f"기록 파일을 읽을 수 없습니다: {e}")
+        if not entries:
+            raise CommandError("재생할 수 있는 요청이 없습니다.")
+        if options['repeat'] > 1:
+            if options['speed']:
+                # 반복 회차마다 기록 전체 길이만큼 시각을 밀어 순서를 유지합니다.
+                span = entries[-1].get('ts', 0) - entries[0].get('ts', 0) + 1
+                entries = [{**entry, 'ts': entry.get('ts', 0) + span * round_} for round_ in range(options['repeat'])
+                           for entry in entries]
+            else:
+                entries = entries * options['repeat']
+
+        self.stderr.write(f"{len(entries)}개 요청을 {options['base_url']} 로 재생합니다.")
+        results, wall_seconds = traffic.replay(
+            entries, options['base_url'],
+            concurrency=options['concurrency'], rate=options['rate'], speed=options['speed'],
+            timeout=options['timeout'],
+        )
+        report = traffic.summarize(results, wall_seconds)
+        report["options"] = {key: options[key] for key in ('base_url', 'concurrency', 'rate', 'speed', 'repeat')}
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api import dataset_cache
+
+
+class Command(BaseCommand):
+    help = "eung/tongsin/sobang 데이터셋을 적재하고 파일별로 걸린 시간을 보여줍니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('file_types', nargs='*', help="적재할 파일 타입 (기본값: 전체)")
+
+    def handle(self, *args, **options):
+        for item in dataset_cache.warm_up(options['file_types'] or None):
+            if item["status"] == "완료":
+                self.stdout.write(self.style.SUCCESS(
+                    f"{item['file_type']}: 업체 {item['companies']}개, "
+                    f"파싱 {item['parse_seconds']}초 / 전체 {item['seconds']}초"))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"{item['file_type']}: {item['status']} {item.get('error', '')}".rstrip()))
+        self.stdout.write(f"URL/뷰 모듈 로딩: {dataset_cache.warm_up_imports()}초")
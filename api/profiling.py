@@ -0,0 +1,213 @@
+# profiling.py
+"""
+요청 단위 프로파일링 도구.
+
+관리자(staff) 계정이 ?profile=1 쿼리 또는 'X-Profile: 1' 헤더를 붙여 요청하면
+해당 요청만 cProfile 로 감싸서 실행하고, 결과를 logs/profiles/ 아래에 저장합니다.
+
+- DRF 뷰의 get/post 메서드에는 profile_view 를 붙입니다.
+- 비동기 뷰에는 profile_async_view 를 붙입니다. cProfile 은 스레드별로 동작하고 이벤트 루프 스레드에서는
+  다른 요청의 코루틴도 함께 돌기 때문에, 이 모듈의 to_thread 로 넘긴 작업만 스레드마다 기록해서 합칩니다.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import time
+from datetime import datetime
+
+from django.conf import settings
+
+PROFILE_SUFFIX = '.prof'
+META_SUFFIX = '.json'
+_SAFE_NAME = re.compile(r'^[\w.-]+$')
+
+# 프로파일링 중인 비동기 요청의 스레드별 프로파일러 목록 (asyncio.to_thread 가 컨텍스트를 넘겨줍니다)
+_thread_profilers = contextvars.ContextVar('thread_profilers', default=None)
+
+
+def get_profile_dir():
+    return getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'logs', 'profiles'))
+
+
+def _query_params(request):
+    # DRF Request 는 query_params, Django HttpRequest(비동기 뷰)는 GET
+    return getattr(request, 'query_params', request.GET)
+
+
+def _flag_set(request):
+    flag = _query_params(request).get('profile') or request.headers.get('X-Profile')
+    return bool(flag) and flag.lower() in ('1', 'true', 'yes')
+
+
+def _is_staff(user):
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def profiling_requested(request):
+    """프로파일링 요청 여부. staff 사용자에게만 허용합니다."""
+    return _flag_set(request) and _is_staff(getattr(request, 'user', None))
+
+
+async def aprofiling_requested(request):
+    """profiling_requested 의 비동기 버전 (비동기 뷰에서는 request.user 대신 auser() 로 읽습니다)"""
+    if not _flag_set(request) or not hasattr(request, 'auser'):
+        return False
+    return _is_staff(await request.auser())
+
+
+def _prune_old_profiles(profile_dir):
+    max_files = getattr(settings, 'PROFILE_MAX_FILES', 50)
+    profiles = sorted(
+        (entry for entry in os.scandir(profile_dir) if entry.name.endswith(PROFILE_SUFFIX)),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in profiles[:max(0, len(profiles) - max_files)]:
+        for path in (entry.path, entry.path[:-len(PROFILE_SUFFIX)] + META_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _save_profile(profilers, view_name, request, user, elapsed_ms, response):
+    """프로파일러들의 결과를 합쳐 하나의 .prof 와 메타 정보(.json)로 저장하고 응답에 X-Profile-Id 를 붙입니다."""
+    profile_dir = get_profile_dir()
+    os.makedirs(profile_dir, exist_ok=True)
+    name = f"{datetime.now():%Y%m%d-%H%M%S-%f}_{view_name}_{request.method.lower()}"
+    stats = pstats.Stats()
+    for profiler in profilers:
+        if profiler.getstats():   # 아무것도 기록하지 않은 프로파일러는 pstats 가 읽지 못합니다.
+            stats.add(profiler)
+    stats.dump_stats(os.path.join(profile_dir, name + PROFILE_SUFFIX))
+    meta = {
+        "name": name,
+        "view": view_name,
+        "method": request.method,
+        "path": request.path,
+        "query": _query_params(request).dict(),
+        "user": user.get_username(),
+        "duration_ms": round(elapsed_ms, 2),
+        "status": getattr(response, 'status_code', None),
+        "created": datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(os.path.join(profile_dir, name + META_SUFFIX), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    _prune_old_profiles(profile_dir)
+
+    response['X-Profile-Id'] = name
+
+
+def profile_view(method):
+    """APIView 의 get/post 메서드에 붙이는 데코레이터. 요청된 경우에만 프로파일링합니다."""
+
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        if not profiling_requested(request):
+            return method(view, request, *args, **kwargs)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = method(view, request, *args, **kwargs)
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        _save_profile([profiler], type(view).__name__, request, request.user, elapsed_ms, response)
+        return response
+
+    return wrapper
+
+
+def profile_async_view(view_func):
+    """
+    비동기 함수 뷰에 붙이는 데코레이터. 요청된 경우 뷰가 to_thread 로 넘긴 작업을 기록합니다.
+    (이벤트 루프에서 직접 도는 부분은 기록하지 않고, 걸린 시간만 전체 시간에 들어갑니다)
+    """
+
+    @functools.wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not await aprofiling_requested(request):
+            return await view_func(request, *args, **kwargs)
+
+        profilers = []
+        token = _thread_profilers.set(profilers)
+        start = time.perf_counter()
+        try:
+            response = await view_func(request, *args, **kwargs)
+        finally:
+            _thread_profilers.reset(token)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        user = await request.auser()
+        await asyncio.to_thread(_save_profile, profilers, view_func.__name__, request, user, elapsed_ms, response)
+        return response
+
+    return wrapper
+
+
+def is_profiling():
+    """지금 요청이 profile_async_view 로 프로파일링 중인지 여부"""
+    return _thread_profilers.get() is not None
+
+
+async def to_thread(func, *args, **kwargs):
+    """asyncio.to_thread 와 같습니다. 프로파일링 중인 요청이면 그 스레드에서의 실행을 함께 기록합니다."""
+    profilers = _thread_profilers.get()
+    if profilers is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def profiled():
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+        return profiler.runcall(func, *args, **kwargs)
+
+    return await asyncio.to_thread(profiled)
+
+
+def list_profiles(limit=20):
+    """최근에 저장된 프로파일 목록(메타 정보)을 최신순으로 반환합니다."""
+    profile_dir = get_profile_dir()
+    if not os.path.isdir(profile_dir):
+        return []
+
+    entries = sorted(
+        (entry for entry in os.scandir(profile_dir) if entry.name.endswith(PROFILE_SUFFIX)),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )[:limit]
+
+    profiles = []
+    for entry in entries:
+        name = entry.name[:-len(PROFILE_SUFFIX)]
+        meta = {"name": name, "created": datetime.fromtimestamp(entry.stat().st_mtime).isoformat(timespec='seconds')}
+        try:
+            with open(os.path.join(profile_dir, name + META_SUFFIX), 'r', encoding='utf-8') as f:
+                meta.update(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            pass
+        meta["size_bytes"] = entry.stat().st_size
+        profiles.append(meta)
+    return profiles
+
+
+def summarize_profile(name, sort_by='cumulative', top=40):
+    """저장된 프로파일의 상위 함수 통계를 텍스트로 반환합니다. 없으면 None."""
+    if not _SAFE_NAME.match(name):
+        return None
+    path = os.path.join(get_profile_dir(), name + PROFILE_SUFFIX)
+    if not os.path.exists(path):
+        return None
+
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.strip_dirs().sort_stats(sort_by).print_stats(top)
+    return stream.getvalue()
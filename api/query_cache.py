@@ -0,0 +1,105 @@
+# query_cache.py
+"""
+타이핑 중 검색(type-ahead)을 위한 검색 결과 캐시.
+
+프론트엔드는 글자를 칠 때마다 /api/search/?name=... 을 보냅니다. 사용자(세션 또는 IP)별로 최근 검색 결과를
+잠깐(SEARCH_REFINE_TTL 초) 보관해 두고, 새 검색이 이전 검색을 '좁힌' 것이면 (업체명이 더 길어짐,
+최소/최대 금액이 더 좁아짐, 지역/상태가 더 한정됨) 전체 데이터셋 대신 이전 결과 안에서만 다시 거릅니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from . import search_logic
+
+_SUBSTRING_FILTERS = ('name', 'manager')
+_AMOUNT_KEYS = ('sipyung', '3y', '5y')
+
+_clients = OrderedDict()  # client_key -> [(dataset_key, filters, results, saved_at)]
+_lock = threading.Lock()
+
+
+def client_key(request):
+    """세션이 있으면 세션 키, 없으면 IP + User-Agent 로 사용자를 구분합니다."""
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f"session:{session.session_key}"
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}:{request.META.get('HTTP_USER_AGENT', '')}"
+
+
+def _dataset_key(dataset):
+    # 지역 데이터셋과 전체 데이터셋은 같은 파일이어도 다른 업체 객체를 가지므로 구분합니다.
+    # id() 는 데이터셋이 버려진 뒤 새 데이터셋에 다시 쓰일 수 있어, 다시 쓰이지 않는 serial 을 씁니다.
+    return dataset.serial
+
+
+def _region(filters):
+    region = filters.get('region')
+    return None if not region or region.strip() == '전체' else region.strip()
+
+
+def narrows(new, old):
+    """new 검색 결과가 항상 old 검색 결과의 부분집합이면 True"""
+    old_region = _region(old)
+    if old_region is not None and old_region != _region(new):
+        return False
+
+    old_status = set(old.get('status') or ())
+    if old_status and not (new.get('status') and set(new['status']) <= old_status):
+        return False
+
+    for key in _SUBSTRING_FILTERS:
+        if old.get(key) and old[key].lower() not in (new.get(key) or '').lower():
+            return False
+
+    for key in _AMOUNT_KEYS:
+        old_min, new_min = old.get(f'min_{key}'), new.get(f'min_{key}')
+        if old_min is not None and (new_min is None or new_min < old_min):
+            return False
+        old_max, new_max = old.get(f'max_{key}'), new.get(f'max_{key}')
+        if old_max is not None and (new_max is None or new_max > old_max):
+            return False
+
+    known = {'region', 'status', *_SUBSTRING_FILTERS, *(f'{b}_{k}' for k in _AMOUNT_KEYS for b in ('min', 'max'))}
+    return all(new.get(key) == old.get(key) for key in set(new) | set(old) if key not in known)
+
+
+def search(client, dataset, filters):
+    """
+    search_logic.search_dataset 과 같은 결과를 반환합니다.
+    같은 사용자의 최근 검색 중 이번 검색을 포함하는 것이 있으면 그 결과 안에서만 거릅니다.
+    """
+    ttl = getattr(settings, 'SEARCH_REFINE_TTL', 60)
+    now = time.monotonic()
+    dataset_key = _dataset_key(dataset)
+
+    base = None
+    with _lock:
+        entries = [entry for entry in _clients.get(client, ()) if now - entry[3] < ttl]
+        for entry_key, old_filters, old_results, _ in entries:
+            if entry_key == dataset_key and narrows(filters, old_filters):
+                if base is None or len(old_results) < len(base):
+                    base = old_results
+
+    if base is None:
+        results = search_logic.search_dataset(dataset, filters)
+    else:
+        # 신용평가 유효일은 narrows 에서 이전 검색과 같아야 하므로 이전 결과가 이미 만족합니다.
+        results = search_logic.filter_companies(base, {key: value for key, value in filters.items()
+                                                       if key != 'credit_valid_on'})
+
+    with _lock:
+        entries = [entry for entry in _clients.pop(client, ()) if now - entry[3] < ttl]
+        entries.append((dataset_key, dict(filters), results, now))
+        _clients[client] = entries[-getattr(settings, 'SEARCH_REFINE_PER_CLIENT', 8):]
+        while len(_clients) > getattr(settings, 'SEARCH_REFINE_MAX_CLIENTS', 1000):
+            _clients.popitem(last=False)
+    return results
+
+
+def clear():
+    with _lock:
+        _clients.clear()
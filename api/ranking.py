@@ -0,0 +1,106 @@
+# ranking.py
+"""
+검색 결과의 서버 쪽 정렬과 상위 N 개 추출.
+
+정렬 기준 열마다 '값이 큰 순서의 위치 배열'을 데이터셋에 한 번 만들어 두고(Dataset.derived),
+- 검색 결과가 데이터셋의 큰 부분이면 미리 정렬된 순서를 따라가며 결과에 든 업체만 top 개를 고르고,
+- 결과가 작으면 heapq 로 부분 정렬합니다.
+어느 경우든 응답에는 top 개만 직렬화됩니다.
+"""
+
+import heapq
+import math
+
+from . import recommend, utils
+from .records import FIELD_INDEX
+
+# 정렬 기준 -> 값 종류
+SORT_FIELDS = {
+    "시평": "amount", "3년 실적": "amount", "5년 실적": "amount",
+    "부채비율": "ratio", "유동비율": "ratio", "경영점수": "score",
+}
+SORT_ALIASES = {
+    "sipyung": "시평", "3y": "3년 실적", "5y": "5년 실적",
+    "debt": "부채비율", "current": "유동비율", "score": "경영점수",
+}
+
+# 결과가 데이터셋의 이 비율 이상이면 미리 정렬된 순서를 따라갑니다.
+_PRESORTED_SCAN_RATIO = 0.25
+
+
+def resolve_sort_field(value):
+    """sort 파라미터 값을 정렬 기준 이름으로 바꿉니다. 모르는 값이면 ValueError."""
+    field = SORT_ALIASES.get(value, value)
+    if field not in SORT_FIELDS:
+        raise ValueError(f"정렬할 수 없는 항목입니다: {value} (가능: {', '.join(SORT_FIELDS)})")
+    return field
+
+
+class SortColumn:
+    """한 정렬 기준의 값과 미리 정렬된 위치 배열. 값이 없는 업체는 항상 맨 뒤에 둡니다."""
+
+    def __init__(self, dataset, values):
+        self.values = values
+        self.position_of = {id(comp): pos for pos, comp in enumerate(dataset.companies)}
+        present = [pos for pos, value in enumerate(values) if not math.isnan(value)]
+        # 값이 같으면 원래 순서(시트 순서)를 유지합니다.
+        self.descending = sorted(present, key=lambda pos: -values[pos])
+        self.ascending = sorted(present, key=lambda pos: values[pos])
+        self.missing = [pos for pos, value in enumerate(values) if math.isnan(value)]
+
+    def key(self, comp, descending):
+        value = self.values[self.position_of[id(comp)]]
+        if math.isnan(value):
+            return (1, 0.0)
+        return (0, -value if descending else value)
+
+
+def _column_values(dataset, field):
+    kind = SORT_FIELDS[field]
+    idx = FIELD_INDEX[field]
+    if kind == "amount":
+        return [utils.parse_amount(comp.values[idx]) or math.nan for comp in dataset.companies]
+    return [utils.parse_ratio(comp.values[idx]) for comp in dataset.companies]
+
+
+def get_sort_column(dataset, field, industry=None, rule=None, announcement_date=None):
+    if SORT_FIELDS[field] == "score":
+        key = ("sort", field, industry, tuple(rule), announcement_date)
+
+        def build(ds):
+            matrix = recommend.get_feature_matrix(ds, industry, rule, announcement_date)
+            return SortColumn(ds, matrix.raw[:, recommend.FEATURE_NAMES.index("경영점수")].tolist())
+        # 공고일/규칙별 정렬 순서는 특성 행렬처럼 최근에 쓴 것만 보관합니다.
+        return dataset.derived(key, build, bounded=True)
+
+    def build(ds):
+        return SortColumn(ds, _column_values(ds, field))
+    return dataset.derived(("sort", field), build)
+
+
+def sort_results(dataset, results, column, descending=True, top=None):
+    """results(dataset 의 업체 목록)를 column 기준으로 정렬해 top 개(없으면 전체)를 반환합니다."""
+    limit = len(results) if top is None else min(top, len(results))
+    if limit <= 0:
+        return []
+
+    if len(results) >= len(dataset.companies) * _PRESORTED_SCAN_RATIO:
+        wanted = {id(comp) for comp in results}
+        companies = dataset.companies
+        ordered = []
+        for pos in (column.descending if descending else column.ascending):
+            if id(companies[pos]) in wanted:
+                ordered.append(companies[pos])
+                if len(ordered) == limit:
+                    return ordered
+        for pos in column.missing:
+            if id(companies[pos]) in wanted:
+                ordered.append(companies[pos])
+                if len(ordered) == limit:
+                    break
+        return ordered
+
+    key = lambda comp: column.key(comp, descending)
+    if top is None:
+        return sorted(results, key=key)
+    return heapq.nsmallest(limit, results, key=key)
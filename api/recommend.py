@@ -0,0 +1,132 @@
+# recommend.py
+"""
+컨소시엄 파트너 후보 추천.
+
+업체마다 특성 벡터(시평, 3년/5년 실적의 log 값, 부채/유동비율, 경영상태 점수)를 numpy 행렬로 한 번 만들어
+데이터셋에 보관하고(Dataset.derived), 질의마다 조건(지역, 최신 자료 등)에 맞는 행만 골라 목표 벡터와의
+가중 거리가 가까운 k 개를 돌려줍니다. 업체 수가 수천 개 수준이라 트리 인덱스 없이 행렬 연산 한 번이면 충분합니다.
+"""
+
+import math
+
+import numpy as np
+
+from . import calculation_logic, utils
+from .config import CONSORTIUM_RULES
+from .indexes import bitmap_positions
+from .records import FIELD_INDEX, STATUS_LATEST
+
+# (특성 이름, 값 변환 방식, 기본 가중치)
+FEATURES = (
+    ("시평", "log_amount", 1.0),
+    ("3년 실적", "log_amount", 0.5),
+    ("5년 실적", "log_amount", 1.0),
+    ("부채비율", "ratio", 0.3),
+    ("유동비율", "ratio", 0.3),
+    ("경영점수", "score", 0.5),
+)
+FEATURE_NAMES = tuple(name for name, _, _ in FEATURES)
+AMOUNT_FEATURES = tuple(name for name, kind, _ in FEATURES if kind == "log_amount")
+DEFAULT_WEIGHTS = np.array([weight for _, _, weight in FEATURES])
+DEFAULT_RULE = ("행안부", "30억미만")
+
+
+def _amount(value):
+    return utils.parse_amount(value) or 0.0
+
+
+def _transform(kind, raw):
+    return math.log1p(raw) if kind == "log_amount" else raw
+
+
+class FeatureMatrix:
+    """한 데이터셋 + 한 규칙(경영점수 계산 기준)에 대한 특성 행렬"""
+
+    def __init__(self, dataset, industry, rule, announcement_date):
+        ruleset = CONSORTIUM_RULES[rule[0]][rule[1]]
+        companies = dataset.companies
+        self.raw = np.empty((len(companies), len(FEATURES)))
+        for row, comp in enumerate(companies):
+            score = calculation_logic.calculate_business_score(comp.to_dict(), industry, announcement_date, ruleset)
+            for col, (name, kind, _) in enumerate(FEATURES):
+                if kind == "log_amount":
+                    self.raw[row, col] = _amount(comp.values[FIELD_INDEX[name]])
+                elif kind == "ratio":
+                    self.raw[row, col] = utils.parse_ratio(comp.values[FIELD_INDEX[name]])
+                else:
+                    self.raw[row, col] = score.get('total', 0.0)
+
+        transformed = self.raw.copy()
+        for col, (_, kind, _) in enumerate(FEATURES):
+            if kind == "log_amount":
+                transformed[:, col] = np.log1p(np.maximum(transformed[:, col], 0))
+
+        # 열마다 표준화하고, 값이 없는 칸은 평균(0)으로 둡니다.
+        self.mean = np.nanmean(transformed, axis=0)
+        self.std = np.nanstd(transformed, axis=0)
+        self.std[~(self.std > 0)] = 1.0
+        self.mean = np.nan_to_num(self.mean)
+        self.normalized = np.nan_to_num((transformed - self.mean) / self.std)
+
+    def normalize(self, raw_vector):
+        values = np.array([_transform(kind, max(value, 0) if kind == "log_amount" else value)
+                           for (_, kind, _), value in zip(FEATURES, raw_vector)])
+        return np.nan_to_num((values - self.mean) / self.std)
+
+
+def get_feature_matrix(dataset, industry, rule=DEFAULT_RULE, announcement_date=None):
+    """
+    데이터셋에 캐시된 특성 행렬. 규칙/공고일별로 한 번만 계산합니다.
+    공고일/규칙은 요청마다 달라질 수 있으므로 최근에 쓴 것만 보관합니다. (Dataset.derived 의 bounded)
+    """
+    key = ("recommend", industry, tuple(rule), announcement_date)
+    return dataset.derived(key, lambda ds: FeatureMatrix(ds, industry, rule, announcement_date), bounded=True)
+
+
+def recommend(dataset, matrix, lead_position, k=10, region=None, latest_only=True,
+              targets=None, complement=None, weights=None, min_business_score=None):
+    """
+    lead_position 업체의 파트너 후보를 가까운 순서로 (위치, 거리) 목록으로 반환합니다.
+
+    - 목표 벡터는 기본적으로 대표사의 특성입니다.
+    - targets={"시평": 금액, ...} 로 특정 특성의 목표값을 직접 줄 수 있습니다.
+    - complement={"시평": 필요금액, "5년 실적": 필요금액} 이면 '필요금액 - 대표사 값'을 목표로 삼아
+      대표사에 부족한 만큼을 채워줄 업체를 찾습니다.
+    - region(기본: 대표사 지역), latest_only(요약상태 '최신'), min_business_score 로 후보를 거릅니다.
+    """
+    target = matrix.raw[lead_position].copy()
+    for name, amount in (complement or {}).items():
+        if name in AMOUNT_FEATURES:
+            col = FEATURE_NAMES.index(name)
+            target[col] = max(float(amount) - matrix.raw[lead_position, col], 0.0)
+    for name, value in (targets or {}).items():
+        if name in FEATURE_NAMES:
+            target[FEATURE_NAMES.index(name)] = float(value)
+
+    mask = dataset.all_mask
+    if region:
+        mask &= dataset.region_index.get(region)
+    if latest_only:
+        mask &= dataset.status_index.get(STATUS_LATEST)
+    mask &= ~(1 << lead_position)
+    candidates = np.array(bitmap_positions(mask), dtype=np.intp)
+    if min_business_score is not None and len(candidates):
+        candidates = candidates[matrix.raw[candidates, FEATURE_NAMES.index("경영점수")] >= min_business_score]
+    if not len(candidates):
+        return []
+
+    weight_vector = DEFAULT_WEIGHTS if weights is None else np.array(
+        [float(weights.get(name, default)) for name, default in zip(FEATURE_NAMES, DEFAULT_WEIGHTS)])
+    diff = matrix.normalized[candidates] - matrix.normalize(target)
+    distances = np.sqrt((diff * diff) @ weight_vector)
+
+    k = min(k, len(candidates))
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+    return [(int(candidates[i]), float(distances[i])) for i in nearest]
+
+
+def feature_values(matrix, position):
+    """응답용 원래 단위의 특성 값 (NaN 은 None)"""
+    return {name: (None if math.isnan(value) else round(value, 4))
+            for name, value in zip(FEATURE_NAMES, matrix.raw[position].tolist())}
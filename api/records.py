@@ -0,0 +1,116 @@
+# records.py
+"""
+파싱된 업체 한 곳을 작게 보관하기 위한 레코드 타입.
+
+업체마다 한글 키 dict(약 18개 키 + 15개 키의 '데이터상태' dict)를 만드는 대신,
+값은 RELATIVE_OFFSETS 순서의 튜플로, 항목별 상태는 작은 정수 코드(bytes)로 보관합니다.
+기존 JSON 형태의 dict 는 응답을 만들 때 to_dict() 로 한 번만 만듭니다.
+"""
+
+import sys
+
+from .config import RELATIVE_OFFSETS
+
+FIELDS = tuple(RELATIVE_OFFSETS)
+FIELD_INDEX = {field: idx for idx, field in enumerate(FIELDS)}
+
+# 상태 코드 <-> 상태 텍스트
+STATUS_LABELS = ("미지정", "최신", "1년 경과", "1년 이상 경과", "N/A")
+STATUS_CODES = {label: code for code, label in enumerate(STATUS_LABELS)}
+STATUS_UNKNOWN = STATUS_CODES["미지정"]
+STATUS_LATEST = STATUS_CODES["최신"]
+STATUS_ONE_YEAR = STATUS_CODES["1년 경과"]
+STATUS_OVER_ONE_YEAR = STATUS_CODES["1년 이상 경과"]
+STATUS_NA = STATUS_CODES["N/A"]
+
+# 요약상태로 나올 수 있는 값 (화면 표시 순서)
+SUMMARY_LABELS = ("최신", "1년 경과", "1년 이상 경과", "미지정")
+
+# 요약상태 계산에 쓰는 항목
+SUMMARY_FIELD_INDEXES = tuple(FIELD_INDEX[field] for field in ('시평', '3년 실적', '5년 실적'))
+
+# 같은 문자열이 많이 반복되는 항목(지역, 담당자, 날짜 등)은 sys.intern 으로 하나의 객체를 공유합니다.
+INTERNED_FIELD_INDEXES = frozenset(
+    FIELD_INDEX[field] for field in ('지역', '영업기간', '신용평가', '여성기업', '고용자수', '일자리창출', '품질평가', '비고')
+)
+
+
+def normalize_biz_no(value):
+    """사업자번호에서 숫자만 남깁니다. ('144-86-02239' -> '1448602239')"""
+    if value is None:
+        return ""
+    return "".join(ch for ch in str(value) if ch.isdigit())
+
+
+# 업체명 비교 시 무시하는 법인 표기
+_CORPORATE_MARKS = ("주식회사", "유한회사", "합자회사", "(주)", "(유)", "(합)", "㈜", "㈲")
+
+
+def normalize_company_name(name):
+    """업체명 정확히 일치 검색용 키. 법인 표기와 공백을 없애고 소문자로 바꿉니다. ('㈜거성전력' -> '거성전력')"""
+    if name is None:
+        return ""
+    key = "".join(str(name).split())
+    for mark in _CORPORATE_MARKS:
+        key = key.replace(mark, "")
+    return key.lower()
+
+
+def summary_status_code(status_codes):
+    """get_summary_status 와 같은 규칙을 상태 코드에 적용합니다."""
+    key_statuses = [status_codes[idx] for idx in SUMMARY_FIELD_INDEXES]
+    if STATUS_OVER_ONE_YEAR in key_statuses:
+        return STATUS_OVER_ONE_YEAR
+    if STATUS_ONE_YEAR in key_statuses:
+        return STATUS_ONE_YEAR
+    if all(code == STATUS_LATEST for code in key_statuses):
+        return STATUS_LATEST
+    return STATUS_UNKNOWN
+
+
+class CompanyRecord:
+    """업체 한 곳의 데이터. values/statuses 는 FIELDS 순서를 따릅니다."""
+
+    __slots__ = ('name', 'region', 'values', 'statuses', 'summary')
+
+    def __init__(self, name, region, values, statuses):
+        self.name = name
+        self.region = sys.intern(region)
+        self.values = tuple(
+            sys.intern(value) if idx in INTERNED_FIELD_INDEXES and isinstance(value, str) else value
+            for idx, value in enumerate(values)
+        )
+        self.statuses = bytes(statuses)
+        self.summary = summary_status_code(self.statuses)
+
+    def intern_strings(self):
+        """
+        다른 프로세스에서 파싱해 넘어온(unpickle 된) 레코드는 intern 이 풀려 있으므로,
+        __init__ 과 같은 항목을 이 프로세스에서 다시 intern 합니다.
+        """
+        self.region = sys.intern(self.region)
+        self.values = tuple(
+            sys.intern(value) if idx in INTERNED_FIELD_INDEXES and isinstance(value, str) else value
+            for idx, value in enumerate(self.values)
+        )
+
+    def value(self, field):
+        return self.values[FIELD_INDEX[field]]
+
+    def status(self, field):
+        return STATUS_LABELS[self.statuses[FIELD_INDEX[field]]]
+
+    @property
+    def summary_status(self):
+        return STATUS_LABELS[self.summary]
+
+    def to_dict(self):
+        """기존 응답과 같은 형태의 dict 로 변환합니다."""
+        data = {"검색된 회사": self.name, "대표지역": self.region}
+        data.update(zip(FIELDS, self.values))
+        data["데이터상태"] = {field: STATUS_LABELS[code] for field, code in zip(FIELDS, self.statuses)}
+        data["요약상태"] = STATUS_LABELS[self.summary]
+        return data
+
+    def __repr__(self):
+        return f"<CompanyRecord {self.name} ({self.region})>"
@@ -0,0 +1,186 @@
+# scenario.py
+"""
+한 컨소시엄 구성을 여러 기준금액(추정가격/기초금액)과 공고일에 대해 한 번에 평가하는 스윕(sweep).
+
+calculate_consortium 을 점마다 부르는 대신 두 축을 나눠 계산합니다.
+- 시공경험 점수는 기준금액에만 달려 있으므로, 가중 실적 합계를 한 번 구한 뒤 금액 배열 전체의 비율을
+  numpy 로 계산하고 PERFORMANCE_SCORE_TABLE 기준값에 searchsorted 로 점수를 찾습니다.
+- 경영상태 점수는 공고일에 따라 신용평가 유효 여부만 바뀝니다. 업체마다 신용평가 기간의 시작/종료일을
+  경계로 (이전, 기간 중, 이후) 세 구간만 calculate_business_score 로 계산하고, 날짜 배열은 searchsorted 로
+  구간에 배정합니다.
+예상 점수는 (경영상태 점수[날짜] + 시공경험 점수[금액] + 입찰가격 점수) 의 날짜 x 금액 격자입니다.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from . import calculation_logic, utils
+from .config import CONSORTIUM_RULES, PERFORMANCE_SCORE_TABLE
+
+DEFAULT_PRICE_COUNT = 101
+
+
+def price_grid(spec):
+    """[금액, ...] 또는 {"start", "stop", "count"|"step"} 를 금액 배열로 바꿉니다. 틀리면 ValueError."""
+    if isinstance(spec, (list, tuple)):
+        prices = np.array([float(value) for value in spec])
+    elif isinstance(spec, dict):
+        start, stop = float(spec['start']), float(spec['stop'])
+        if spec.get('step') not in (None, ''):
+            step = float(spec['step'])
+            if step <= 0:
+                raise ValueError("step 은 0보다 커야 합니다.")
+            # stop 도 포함되도록 반 칸 더 잡습니다.
+            prices = np.arange(start, stop + step / 2, step)
+        else:
+            count = spec.get('count')
+            prices = np.linspace(start, stop, int(count) if count not in (None, '') else DEFAULT_PRICE_COUNT)
+    else:
+        raise ValueError("prices 는 목록이나 {start, stop, count|step} 형식이어야 합니다.")
+    if not len(prices):
+        raise ValueError("평가할 금액이 없습니다.")
+    if np.any(prices < 0) or not np.all(np.isfinite(prices)):
+        raise ValueError("금액은 0 이상의 숫자여야 합니다.")
+    return prices
+
+
+def date_grid(spec, default=None):
+    """["YYYY-MM-DD", ...] 또는 {"start", "end", "step_days"} 를 date 목록으로 바꿉니다. 틀리면 ValueError."""
+    parse = lambda value: datetime.strptime(str(value), '%Y-%m-%d').date()
+    if not spec:
+        return [default or date.today()]
+    if isinstance(spec, str):
+        return [parse(spec)]
+    if isinstance(spec, (list, tuple)):
+        return [parse(value) for value in spec]
+    if isinstance(spec, dict):
+        start, end = parse(spec['start']), parse(spec['end'])
+        step = int(spec['step_days']) if spec.get('step_days') not in (None, '') else 1
+        if step <= 0 or end < start:
+            raise ValueError("날짜 범위가 올바르지 않습니다.")
+        return [start + timedelta(days=offset) for offset in range(0, (end - start).days + 1, step)]
+    raise ValueError("dates 는 목록이나 {start, end, step_days} 형식이어야 합니다.")
+
+
+def table_scores(values, table):
+    """
+    _get_score_from_table(value, table, lower_is_better=False) 의 배열 버전.
+    기준값이 큰 것부터 나열된 '이상' 점수표(PERFORMANCE_SCORE_TABLE 형식)를 searchsorted 로 찾습니다.
+    """
+    values = np.asarray(values, dtype=float)
+    if not table:
+        return np.zeros_like(values)
+    thresholds = np.array([threshold for threshold, _ in table], dtype=float)
+    scores = np.array([score for _, score in table], dtype=float)
+    if np.any(np.diff(thresholds) > 0):
+        # 내림차순이 아닌 표는 '처음 만족하는 행' 규칙을 그대로 따릅니다.
+        lookup = np.frompyfunc(lambda v: calculation_logic._get_score_from_table(v, table, lower_is_better=False), 1, 1)
+        return lookup(values).astype(float)
+
+    # 오름차순으로 뒤집은 기준값 중 value 이하인 개수 k -> 내림차순 표에서 처음 만족하는 행은 n - k
+    satisfied = np.searchsorted(thresholds[::-1], values, side='right')
+    first = np.minimum(len(table) - satisfied, len(table) - 1)
+    return np.where(satisfied > 0, scores[first], scores[-1])
+
+
+def performance_curve(ruleset, total_performance, base_amounts):
+    """_calculate_performance_score 를 기준금액 배열 전체에 대해 계산합니다. (점수 배열, 비율 배열)"""
+    base_amounts = np.asarray(base_amounts, dtype=float)
+    method = ruleset.get("performance_method")
+    positive = base_amounts > 0
+    safe_base = np.where(positive, base_amounts, 1.0)
+
+    if method == "ratio_table":
+        ratio = np.where(positive, total_performance / safe_base * 100, 0.0)
+        table = PERFORMANCE_SCORE_TABLE.get(ruleset.get("performance_score_table_id"), [])
+        score = table_scores(ratio, table)
+        return np.where(score > 0, score, ruleset.get("performance_base_score", 0.0)), ratio
+
+    if method == "direct_formula_v1":
+        params = ruleset.get("performance_params", {})
+        multiplier = params.get("base_multiplier", 1.0)
+        max_score = params.get("max_score", 15.0)
+        score = np.minimum(np.where(positive, total_performance / (safe_base * multiplier) * max_score, 0.0), max_score)
+        ratio = score / max_score * 100 if max_score > 0 else np.zeros_like(score)
+        return score, ratio
+
+    zeros = np.zeros_like(base_amounts)
+    return zeros, zeros
+
+
+def performance_boundaries(ruleset, total_performance, low, high):
+    """
+    ratio_table 규칙에서 점수가 바뀌는 기준금액. 기준금액이 price 이하이면 비율이 ratio% 이상이 되어
+    score 점을 받습니다. [low, high] 범위 안의 경계만 금액 순으로 반환합니다.
+    """
+    if ruleset.get("performance_method") != "ratio_table" or total_performance <= 0:
+        return []
+    table = PERFORMANCE_SCORE_TABLE.get(ruleset.get("performance_score_table_id"), [])
+    boundaries = []
+    for threshold, score in table:
+        if 0 < threshold < float('inf'):
+            price = total_performance * 100 / threshold
+            if low <= price <= high:
+                boundaries.append({"price": round(price, 2), "ratio": threshold, "score": score})
+    return sorted(boundaries, key=lambda row: row["price"])
+
+
+def _member_business_scores(member, ordinals, ruleset):
+    """한 업체의 경영상태 점수를 날짜(ordinal) 배열 전체에 대해 계산합니다."""
+    data = member['data']
+    industry = member.get('source_type', '전기')
+    score = lambda on: calculation_logic.calculate_business_score(data, industry, on, ruleset).get('total', 0.0)
+
+    try:
+        start, end = utils.parse_credit_period(data.get("신용평가"))
+    except ValueError:
+        start = end = None
+    if start is None or start > end or start == date.min or end == date.max:
+        # 공고일과 무관하게 같은 점수
+        return np.full(len(ordinals), score(date.fromordinal(int(ordinals[0]))))
+
+    segments = np.array([score(start - timedelta(days=1)), score(start), score(end + timedelta(days=1))])
+    edges = np.array([start.toordinal(), end.toordinal() + 1])
+    return segments[np.searchsorted(edges, ordinals, side='right')]
+
+
+def sweep(companies_data, rule_info, base_amounts, dates):
+    """
+    companies_data(calculate_consortium 과 같은 형식, share 필수)를 기준금액 x 공고일 격자에서 평가합니다.
+    base_amounts 는 규칙의 performance_base_key(추정가격 또는 기초금액)에 들어갈 금액들입니다.
+    """
+    ruleset = CONSORTIUM_RULES[rule_info[0]][rule_info[1]]
+    for comp in companies_data:
+        if comp.get('share') is None:
+            raise ValueError(f"'{comp.get('name')}' 업체의 지분율(share)이 필요합니다.")
+
+    base_amounts = np.asarray(base_amounts, dtype=float)
+    ordinals = np.array([day.toordinal() for day in dates])
+
+    business = np.zeros(len(ordinals))
+    total_performance = 0.0
+    for comp in companies_data:
+        business += _member_business_scores(comp, ordinals, ruleset) * comp['share']
+        total_performance += (utils.parse_amount(comp['data'].get("5년 실적", 0)) or 0) * comp['share']
+
+    performance, ratio = performance_curve(ruleset, total_performance, base_amounts)
+    expected = business[:, None] + performance[None, :] + calculation_logic.BID_SCORE
+
+    changed = np.flatnonzero(np.diff(business)) + 1
+    return {
+        "rule": list(rule_info),
+        "price_key": ruleset.get("performance_base_key", "estimation_price"),
+        "prices": base_amounts.round(2).tolist(),
+        "dates": [day.isoformat() for day in dates],
+        "total_weighted_performance": total_performance,
+        "performance_ratio": ratio.round(4).tolist(),
+        "final_performance_score": performance.round(4).tolist(),
+        "final_business_score": business.round(4).tolist(),
+        "bid_score": calculation_logic.BID_SCORE,
+        # expected_score[i][j]: dates[i], prices[j] 에서의 예상 점수
+        "expected_score": expected.round(4).tolist(),
+        "price_boundaries": performance_boundaries(ruleset, total_performance, base_amounts.min(), base_amounts.max()),
+        "date_boundaries": [{"date": dates[i].isoformat(), "final_business_score": round(float(business[i]), 4)}
+                            for i in changed],
+    }
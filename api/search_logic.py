@@ -2,23 +2,24 @@
 
 import re
 import logging
-from openpyxl import load_workbook
-from openpyxl.styles.colors import Color  # Color 객체를 import 해야 합니다.
 import os
-from .config import RELATIVE_OFFSETS
+from .config import RELATIVE_OFFSETS, LAYOUT_LABELS
+from .records import CompanyRecord, FIELD_INDEX, STATUS_CODES, STATUS_NA
+from .indexes import bitmap_positions
+from .utils import parse_credit_period
 
-# --- 로깅 설정 (사용자님 코드 그대로) ---
-log_dir = 'logs'
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-logging.basicConfig(filename=os.path.join(log_dir, 'search_errors.log'),
-                    level=logging.ERROR,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# 로그 출력 위치/형식은 settings.LOGGING 에서 정합니다.
+logger = logging.getLogger(__name__)
+
+# 시트별 오류 로그에 함께 남기는 업체별 오류 예시 개수
+ERROR_SAMPLES_PER_SHEET = 5
 
 
 # --- [핵심] 사용자님의 정확한 get_status_from_color 함수 ---
 def get_status_from_color(color_obj) -> str:
     """셀의 색상 객체를 분석하여 데이터 상태 텍스트("최신" 등)로 변환합니다."""
+    from openpyxl.styles.colors import Color  # openpyxl 은 실제로 파일을 읽을 때만 불러옵니다.
+
     # color_obj가 fill 객체일 수 있으므로, 실제 Color 객체는 fgColor에 있습니다.
     if not color_obj or not hasattr(color_obj, 'fgColor'):
         return "미지정"
@@ -77,93 +78,335 @@ def get_summary_status(statuses_dict):
 
 
 
-# --- 최종 find_and_filter_companies 함수 ---
-def find_and_filter_companies(file_path, filters):
-    value_wb, style_wb = None, None  # 변수를 미리 선언
+# --- 채우기 스타일 -> 상태 코드 캐시 ---
+class FillStatusCache:
+    """
+    워크북 안의 서로 다른 채우기(fill) 스타일마다 상태를 한 번만 계산해 둡니다.
+    셀마다 style proxy 를 만들고 get_status_from_color 를 다시 호출하는 대신, 셀의 스타일 번호로 표를 찾습니다.
+    """
+
+    def __init__(self, workbook):
+        # openpyxl 이 읽어 둔 스타일 표: _fills 는 채우기 목록, _cell_styles 는 cellXfs(셀 서식) 목록입니다.
+        self._fills = workbook._fills
+        self._cell_styles = workbook._cell_styles
+        self._by_fill_id = {}
+        self._by_xf_id = {}
+
+    def status_of_fill_id(self, fill_id):
+        code = self._by_fill_id.get(fill_id)
+        if code is None:
+            code = self._by_fill_id[fill_id] = STATUS_CODES[get_status_from_color(self._fills[fill_id])]
+        return code
+
+    def status_of_cell(self, cell):
+        """일반 모드 셀 (cell._style 은 cellXfs 항목의 StyleArray, 서식이 없으면 None)"""
+        style = cell._style
+        return self.status_of_fill_id(style.fillId if style else 0)
+
+    def status_of_read_only_cell(self, cell):
+        """읽기 전용 모드 셀 (cell._style_id 가 곧 cellXfs 번호, 빈 칸은 기본 서식)"""
+        xf_id = getattr(cell, '_style_id', None)
+        if xf_id is None:
+            return self.status_of_fill_id(0)
+        code = self._by_xf_id.get(xf_id)
+        if code is None:
+            code = self._by_xf_id[xf_id] = self.status_of_fill_id(self._cell_styles[xf_id].fillId)
+        return code
+
+
+# --- '회사명' 블록 단위 파싱 ---
+# 한 블록은 '회사명' 행과 그 아래 RELATIVE_OFFSETS 항목 행들로 이루어집니다.
+BLOCK_HEIGHT = max(RELATIVE_OFFSETS.values()) + 1
+_OFFSET_ITEMS = list(RELATIVE_OFFSETS.items())
+_RATIO_ITEMS = ("부채비율", "유동비율")
+
+# 읽기 전용 모드의 행 길이가 짧을 때 빈 칸으로 쓰는 값 (값 없음, 기본 서식)
+class _MissingCell:
+    __slots__ = ()
+    value = None
+    _style = None
+
+
+_MISSING_CELL = _MissingCell()
+
+# 이 크기 이상의 파일은 자동으로 스트리밍(read_only) 모드로 읽습니다.
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+
+def is_anchor_value(value):
+    return isinstance(value, str) and "회사명" in value.strip()
+
+
+def find_anchor_rows(sheet):
+    """A열을 한 번만 훑어서 '회사명' 행 번호 목록을 반환합니다."""
+    return [row_idx for row_idx, (first_value,) in
+            enumerate(sheet.iter_rows(min_col=1, max_col=1, values_only=True), start=1)
+            if is_anchor_value(first_value)]
+
+
+def parse_company_block(sheet_name, block_rows, status_of_cell, errors=None):
+    """
+    block_rows[0] 은 '회사명' 행, block_rows[k] 는 그 k 행 아래 행의 셀 목록입니다.
+    시트 끝을 넘어가는 항목은 기존과 같이 "N/A" 로 채웁니다.
+    처리하지 못한 업체는 건너뛰고 (열 번호, 오류) 를 errors 에 모읍니다. (없으면 바로 로그를 남깁니다)
+    """
+    companies = []
+    region = sheet_name.strip()
+    header = block_rows[0]
+    for col in range(1, len(header)):
+        try:
+            company_name = header[col].value
+            if not isinstance(company_name, str) or not company_name.strip():
+                continue
+
+            values, statuses = [], []
+            for item, offset in _OFFSET_ITEMS:
+                if offset < len(block_rows):
+                    row = block_rows[offset]
+                    cell = row[col] if col < len(row) else _MISSING_CELL
+                    value = cell.value
+                    if item in _RATIO_ITEMS and isinstance(value, (int, float)):
+                        processed_value = value * 100
+                    else:
+                        processed_value = clean_text(value) if isinstance(value, str) else value
+                    values.append(processed_value if processed_value is not None else "")
+                    statuses.append(status_of_cell(cell))
+                else:
+                    values.append("N/A")
+                    statuses.append(STATUS_NA)
+
+            companies.append(CompanyRecord(clean_text(company_name), region, values, statuses))
+        except Exception as e:
+            if errors is None:
+                log_sheet_errors(sheet_name, [(col + 1, e)])
+            else:
+                errors.append((col + 1, e))
+            continue
+    return companies
+
+
+def log_sheet_errors(sheet_name, errors):
+    """한 시트에서 모은 업체별 오류를 로그 한 건으로 남깁니다."""
+    if not errors:
+        return
+    logger.error(
+        "'%s' 시트 데이터 처리 중 오류 %d건", sheet_name, len(errors),
+        extra={"sheet": sheet_name, "error_count": len(errors),
+               "errors": [f"{col}열: {error}" for col, error in errors[:ERROR_SAMPLES_PER_SHEET]]},
+    )
+
+
+def _parse_sheet(sheet, sheet_name, fill_status):
+    """일반 모드: 시트 전체가 메모리에 있으므로 '회사명' 행을 먼저 찾고 블록만 읽습니다."""
+    companies, errors = [], []
+    max_row, max_column = sheet.max_row, sheet.max_column
+
+    # 1) A열만 한 번 훑어서 '회사명' 행을 찾고, 2) 그 아래 블록만 행 단위로 읽습니다.
+    for anchor_row in find_anchor_rows(sheet):
+        block_rows = list(sheet.iter_rows(min_row=anchor_row, max_row=min(anchor_row + BLOCK_HEIGHT - 1, max_row),
+                                          min_col=1, max_col=max_column))
+        companies.extend(parse_company_block(sheet_name, block_rows, fill_status.status_of_cell, errors))
+    log_sheet_errors(sheet_name, errors)
+    return companies
+
+
+def _parse_sheet_streaming(sheet, sheet_name, fill_status):
+    """
+    스트리밍 모드: 행을 위에서부터 한 번만 읽으면서, 아직 BLOCK_HEIGHT 행이 채워지지 않은
+    '회사명' 블록들만 들고 있습니다. 파일 크기와 관계없이 메모리에는 몇 개 블록 분량의 행만 남습니다.
+    """
+    companies, errors = [], []
+    open_blocks = []
+    for row in sheet.iter_rows():
+        for block in open_blocks:
+            block.append(row)
+        if row and is_anchor_value(row[0].value):
+            open_blocks.append([row])
+
+        while open_blocks and len(open_blocks[0]) == BLOCK_HEIGHT:
+            companies.extend(parse_company_block(sheet_name, open_blocks.pop(0), fill_status.status_of_read_only_cell, errors))
+
+    # 시트 끝에서 다 채워지지 않은 블록은 남은 항목을 "N/A" 로 처리합니다.
+    for block in open_blocks:
+        companies.extend(parse_company_block(sheet_name, block, fill_status.status_of_read_only_cell, errors))
+    log_sheet_errors(sheet_name, errors)
+    return companies
+
+
+# --- 워크북 파싱 (필터 없이 전체 업체 목록을 만듭니다) ---
+def parse_workbook(file_path, sheet_names=None, streaming=None, streaming_threshold=STREAMING_THRESHOLD_BYTES):
+    """
+    워크북을 읽어 (업체 목록(CompanyRecord), 전체 시트 이름 목록)을 반환합니다.
+    sheet_names 가 주어지면 해당 시트만 읽습니다. (앞뒤 공백을 뺀 이름, 즉 지역명으로도 찾습니다)
+    파일을 열 수 없으면 예외를 그대로 올립니다.
+    streaming 이 None 이면 일부 시트만 읽을 때, 또는 파일 크기가 streaming_threshold 이상일 때
+    스트리밍(read_only) 모드로 읽습니다. read_only 모드는 요청한 시트의 XML 만 읽으므로
+    시트 하나를 읽는 비용이 전체의 일부로 줄어듭니다. (일반 모드는 열 때 모든 시트를 읽습니다)
+    """
+    from openpyxl import load_workbook
+
+    if streaming is None:
+        streaming = sheet_names is not None or os.path.getsize(file_path) >= streaming_threshold
+
+    value_wb = None  # 변수를 미리 선언
     try:
-        # [핵심] 값용(value_wb)과 스타일용(style_wb)으로 파일을 두 번 엽니다.
-        value_wb = load_workbook(filename=file_path, data_only=True)
-        style_wb = load_workbook(filename=file_path, data_only=False)
-
-        all_companies = []
-        target_sheet_names = []
-        region_filter = filters.get('region')
-        if region_filter and region_filter != '전체':
-            if region_filter in value_wb.sheetnames:
-                target_sheet_names.append(region_filter)
+        # data_only=True 로 열어도 셀 서식(채우기 색상)은 그대로 읽히므로, 파일은 한 번만 엽니다.
+        value_wb = load_workbook(filename=file_path, data_only=True, read_only=streaming)
+        fill_status = FillStatusCache(value_wb)
+        parse_sheet = _parse_sheet_streaming if streaming else _parse_sheet
+
+        all_sheet_names = list(value_wb.sheetnames)
+        if sheet_names is None:
+            target_sheet_names = all_sheet_names
         else:
-            target_sheet_names = value_wb.sheetnames
+            wanted = set(sheet_names) | {name.strip() for name in sheet_names}
+            target_sheet_names = [name for name in all_sheet_names if name in wanted or name.strip() in wanted]
 
+        all_companies = []
         for sheet_name in target_sheet_names:
-            value_sheet = value_wb[sheet_name]
-            style_sheet = style_wb[sheet_name]
-            max_row = value_sheet.max_row
-
-            for r_idx in range(1, max_row + 1):
-                # ... (이하 모든 데이터 처리 로직은 이전과 동일합니다) ...
-                first_cell_value = value_sheet.cell(row=r_idx, column=1).value
-                if isinstance(first_cell_value, str) and "회사명" in first_cell_value.strip():
-                    for c_idx in range(2, value_sheet.max_column + 1):
-                        try:
-                            company_name = value_sheet.cell(row=r_idx, column=c_idx).value
-                            if not isinstance(company_name, str) or not company_name.strip():
-                                continue
-
-                            company_data = {"검색된 회사": clean_text(company_name)}
-                            company_data['대표지역'] = sheet_name.strip()
-
-                            company_statuses = {}
-                            for item, offset in RELATIVE_OFFSETS.items():
-                                target_row = r_idx + offset
-                                if target_row <= max_row:
-                                    value = value_sheet.cell(row=target_row, column=c_idx).value
-                                    style_cell = style_sheet.cell(row=target_row, column=c_idx)
-                                    status = get_status_from_color(style_cell.fill)
-                                    if item in ["부채비율", "유동비율"] and isinstance(value, (int, float)):
-                                        processed_value = value * 100
-                                    else:
-                                        processed_value = clean_text(value) if isinstance(value, str) else value
-                                    company_data[item] = processed_value if processed_value is not None else ""
-                                    company_statuses[item] = status
-                                else:
-                                    company_data[item] = "N/A"
-                                    company_statuses[item] = "N/A"
-
-                            company_data["데이터상태"] = company_statuses
-                            company_data["요약상태"] = get_summary_status(company_statuses)
-                            all_companies.append(company_data)
-                        except Exception as e:
-                            logging.error(f"'{sheet_name}' 시트 데이터 처리 중 오류: {e}")
-                            continue
-
-        # --- 필터링 로직 (이전과 동일) ---
-        filtered_results = all_companies
-        if filters.get('name'):
-            search_name = filters['name'].lower()
-            filtered_results = [comp for comp in filtered_results if search_name in str(comp.get("검색된 회사", "")).lower()]
-        if filters.get('manager'):
-            search_manager = filters['manager'].lower()
-            filtered_results = [comp for comp in filtered_results if search_manager in str(comp.get("비고", "")).lower()]
-        for key, field_name in [('sipyung', '시평'), ('3y', '3년 실적'), ('5y', '5년 실적')]:
-            min_val, max_val = filters.get(f'min_{key}'), filters.get(f'max_{key}')
-            if min_val is not None:
-                filtered_results = [comp for comp in filtered_results if
-                                    (val := parse_amount(str(comp.get(field_name)))) is not None and val >= min_val]
-            if max_val is not None:
-                filtered_results = [comp for comp in filtered_results if
-                                    (val := parse_amount(str(comp.get(field_name)))) is not None and val <= max_val]
-
-        return filtered_results
+            all_companies.extend(parse_sheet(value_wb[sheet_name], sheet_name, fill_status))
+
+        return all_companies, all_sheet_names
 
     except Exception as e:
-        logging.error(f"엑셀 파일 열기 실패: {file_path}, 오류: {e}")
-        return []
+        logger.error("엑셀 파일 열기 실패: %s, 오류: %s", file_path, e)
+        raise
     finally:
         # --- [핵심] 에러가 발생하든 안 하든, 작업이 끝나면 무조건 파일을 닫습니다. ---
         if value_wb:
             value_wb.close()
-        if style_wb:
-            style_wb.close()
+
+
+def _layout_mismatch(labels):
+    """'회사명' 아래 A열 값 목록(labels[k] = k 행 아래)이 RELATIVE_OFFSETS 배치와 다르면 첫 번째 어긋난 항목을 반환합니다."""
+    for item, keywords in LAYOUT_LABELS.items():
+        offset = RELATIVE_OFFSETS[item]
+        label = labels[offset] if offset < len(labels) else None
+        label = "".join(str(label).split()) if label is not None else ""
+        if not any(keyword in label for keyword in keywords):
+            return item, offset, label
+    return None
+
+
+def validate_workbook(file_path):
+    """
+    업로드된 워크북의 구조를 빠르게 확인합니다. (A열만 read_only 로 읽습니다)
+    - 시트가 있고, '회사명' 행이 하나 이상 있어야 합니다.
+    - 각 '회사명' 아래 항목 이름이 RELATIVE_OFFSETS 배치와 맞아야 합니다.
+    문제가 있으면 ValueError 를, 정상이면 {"sheets": 시트 수, "blocks": '회사명' 행 수} 를 반환합니다.
+    """
+    from openpyxl import load_workbook
+
+    # 임시 파일(.part)도 검사할 수 있도록 확장자 검사 없이 파일 객체로 엽니다.
+    with open(file_path, 'rb') as f:
+        try:
+            workbook = load_workbook(f, read_only=True, data_only=True, keep_links=False)
+        except Exception as e:
+            raise ValueError(f"엑셀 파일을 열 수 없습니다: {e}") from e
+        try:
+            if not workbook.sheetnames:
+                raise ValueError("시트가 없는 파일입니다.")
+            block_count = 0
+            for sheet_name in workbook.sheetnames:
+                column = [value for (value,) in workbook[sheet_name].iter_rows(min_col=1, max_col=1, values_only=True)]
+                for row_idx, value in enumerate(column):
+                    if not is_anchor_value(value):
+                        continue
+                    block_count += 1
+                    mismatch = _layout_mismatch(column[row_idx:row_idx + BLOCK_HEIGHT])
+                    if mismatch:
+                        item, offset, label = mismatch
+                        raise ValueError(
+                            f"'{sheet_name}' 시트 {row_idx + 1}행 '회사명' 블록의 배치가 다릅니다: "
+                            f"{offset}행 아래는 '{item}' 항목이어야 하지만 '{label}' 입니다."
+                        )
+            if block_count == 0:
+                raise ValueError("'회사명' 행을 찾을 수 없습니다.")
+            return {"sheets": len(workbook.sheetnames), "blocks": block_count}
+        finally:
+            workbook.close()
+
+
+# --- 필터링 (파싱된 업체 목록(CompanyRecord)에 검색 조건을 적용합니다) ---
+_MANAGER_INDEX = FIELD_INDEX["비고"]
+_AMOUNT_FILTERS = [('sipyung', FIELD_INDEX['시평']), ('3y', FIELD_INDEX['3년 실적']), ('5y', FIELD_INDEX['5년 실적'])]
+_CREDIT_INDEX = FIELD_INDEX['신용평가']
+
+
+def credit_valid_on(rating, day):
+    """신용평가 기간이 day 를 포함하면 True (calculation_logic._is_credit_rating_valid 의 '유효' 와 같은 기준)"""
+    if not rating or not isinstance(rating, str):
+        return False
+    try:
+        start, end = parse_credit_period(rating)
+    except ValueError:
+        return False
+    return start <= day <= end
+
+
+def filter_companies(companies, filters):
+    filtered_results = companies
+    region_filter = filters.get('region')
+    if region_filter and region_filter != '전체':
+        region_filter = region_filter.strip()
+        filtered_results = [comp for comp in filtered_results if comp.region == region_filter]
+    if filters.get('status'):
+        status_codes = {STATUS_CODES[label] for label in filters['status'] if label in STATUS_CODES}
+        filtered_results = [comp for comp in filtered_results if comp.summary in status_codes]
+    if filters.get('name'):
+        search_name = filters['name'].lower()
+        filtered_results = [comp for comp in filtered_results if search_name in str(comp.name).lower()]
+    if filters.get('manager'):
+        search_manager = filters['manager'].lower()
+        filtered_results = [comp for comp in filtered_results if search_manager in str(comp.values[_MANAGER_INDEX]).lower()]
+    for key, field_index in _AMOUNT_FILTERS:
+        min_val, max_val = filters.get(f'min_{key}'), filters.get(f'max_{key}')
+        if min_val is not None:
+            filtered_results = [comp for comp in filtered_results if
+                                (val := parse_amount(str(comp.values[field_index]))) is not None and val >= min_val]
+        if max_val is not None:
+            filtered_results = [comp for comp in filtered_results if
+                                (val := parse_amount(str(comp.values[field_index]))) is not None and val <= max_val]
+    if filters.get('credit_valid_on'):
+        day = filters['credit_valid_on']
+        filtered_results = [comp for comp in filtered_results if credit_valid_on(comp.values[_CREDIT_INDEX], day)]
+
+    return list(filtered_results)
+
+
+# --- 캐시된 데이터셋 검색 (지역/요약상태/신용평가 유효일은 비트맵 인덱스로 먼저 좁힙니다) ---
+_INDEXED_FILTERS = ('region', 'status', 'credit_valid_on')
+
+
+def search_dataset(dataset, filters):
+    mask = dataset.all_mask
+    region_filter = filters.get('region')
+    if region_filter and region_filter != '전체':
+        mask &= dataset.region_index.get(region_filter.strip())
+    if filters.get('status'):
+        mask &= dataset.status_index.any_of(STATUS_CODES[label] for label in filters['status'] if label in STATUS_CODES)
+    if filters.get('credit_valid_on'):
+        mask &= dataset.credit_index.containing(filters['credit_valid_on'])
+
+    if mask == dataset.all_mask:
+        candidates = dataset.companies
+    else:
+        companies = dataset.companies
+        candidates = [companies[pos] for pos in bitmap_positions(mask)]
+
+    remaining_filters = {key: value for key, value in filters.items() if key not in _INDEXED_FILTERS}
+    return filter_companies(candidates, remaining_filters)
+
+
+# --- 최종 find_and_filter_companies 함수 (캐시 없이 매번 파일을 읽습니다) ---
+def find_and_filter_companies(file_path, filters):
+    region_filter = filters.get('region')
+    sheet_names = [region_filter] if region_filter and region_filter != '전체' else None
+    try:
+        companies, _ = parse_workbook(file_path, sheet_names)
+    except Exception:
+        return []
+    return filter_companies(companies, filters)
 
 
 
@@ -0,0 +1,168 @@
+# simulation.py
+"""
+입찰 결과 몬테카를로 시뮬레이션.
+
+calculate_consortium 의 예상 점수는 입찰가격 점수를 고정값(BID_SCORE)으로 둡니다. 여기서는 입찰가격 점수를
+확률 변수로 봅니다. 추첨마다 사정률(복수예비가격 추첨 평균)과 낙찰하한율을 뽑아 예정가격과 투찰률을 정하고,
+경영상태 + 시공경험 점수(추첨과 무관)에 더해 통과 확률과 점수 분포를 구합니다.
+
+추첨은 컨소시엄마다 numpy 배열 한 번으로 계산합니다. 후보 컨소시엄이 여럿이면 spawn 방식 프로세스 풀에서
+팀마다 따로 돌립니다. (풀은 처음 쓸 때 만들어 계속 재사용합니다.) 시드는 SeedSequence(seed).spawn 으로 팀마다 나눠 주므로, 실행 순서나 프로세스 수와
+관계없이 같은 seed 면 같은 결과가 나옵니다.
+"""
+
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from django.conf import settings
+
+from .config import PRICE_SCORE_SIMULATION
+
+DEFAULT_DRAWS = 20000
+DEFAULT_SEED = 0
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# 전체 추첨 수(팀 수 x 추첨 횟수)가 이보다 적으면 프로세스 풀 없이 바로 계산합니다.
+# (추첨 20만 번이 0.1초 미만이라, 작은 요청은 작업을 넘기는 비용이 더 큽니다.)
+PARALLEL_MIN_DRAWS = 400000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# 숫자 하나로 받는 설정 항목
+_SCALAR_SETTINGS = ("reserve_price_spread", "max_score", "min_score", "reference_rate", "penalty_per_point", "pass_score")
+
+
+def _finite_float(name, value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 는 숫자여야 합니다: {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} 는 유한한 숫자여야 합니다: {value!r}")
+    return number
+
+
+def price_model(overrides=None):
+    """기본 설정(PRICE_SCORE_SIMULATION)에 요청 값을 덮어쓴 설정. 값이 틀리면 ValueError."""
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError("price_model 은 객체여야 합니다.")
+    model = {**PRICE_SCORE_SIMULATION, **(overrides or {})}
+    unknown = set(model) - set(PRICE_SCORE_SIMULATION)
+    if unknown:
+        raise ValueError(f"알 수 없는 설정입니다: {', '.join(sorted(unknown))}")
+
+    for name in _SCALAR_SETTINGS:
+        model[name] = _finite_float(name, model[name])
+    count = _finite_float("drawn_price_count", model["drawn_price_count"])
+    if count != int(count) or count < 1:
+        raise ValueError("drawn_price_count 는 1 이상의 정수여야 합니다.")
+    model["drawn_price_count"] = int(count)
+    if model["reserve_price_spread"] < 0:
+        raise ValueError("reserve_price_spread 는 0 이상이어야 합니다.")
+    if model["min_score"] > model["max_score"]:
+        raise ValueError("min_score 는 max_score 보다 클 수 없습니다.")
+    if model["penalty_per_point"] < 0:
+        raise ValueError("penalty_per_point 는 0 이상이어야 합니다.")
+
+    try:
+        pairs = [(_finite_float("floor_rates", rate), _finite_float("floor_rates", weight))
+                 for rate, weight in model["floor_rates"]]
+    except (TypeError, ValueError):
+        pairs = None
+    if not pairs or any(weight < 0 for _, weight in pairs) or sum(weight for _, weight in pairs) <= 0:
+        raise ValueError("floor_rates 는 [낙찰하한율, 확률] 목록이어야 합니다.")
+    total = sum(weight for _, weight in pairs)
+    model["floor_rates"] = [[rate, weight / total] for rate, weight in pairs]
+    return model
+
+
+def default_bid_rate(model):
+    """투찰률을 주지 않았을 때: 사정률 100% 를 가정하고 (평균) 낙찰하한율로 투찰합니다."""
+    return float(sum(rate * weight for rate, weight in model["floor_rates"]))
+
+
+def _summary(values, decimals=4):
+    if not len(values):
+        return None
+    return {str(q): round(float(v), decimals) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def simulate_team(static_score, bid_rate, model, draws, seed_sequence):
+    """
+    한 컨소시엄의 시뮬레이션. (프로세스 풀에서 실행되므로 숫자와 dict 만 주고받습니다.)
+
+    - static_score: 경영상태 + 시공경험 점수
+    - bid_rate: 기초금액 대비 투찰률(%)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    spread = float(model["reserve_price_spread"])
+
+    # 복수예비가격은 서로 독립인 균등분포이므로, 그중 무작위로 고른 k 개는 균등분포 k 번 추첨과 같습니다.
+    assessment = 100.0 + rng.uniform(-spread, spread, size=(draws, int(model["drawn_price_count"]))).mean(axis=1)
+    rates, weights = zip(*model["floor_rates"])
+    floor = rng.choice(np.array(rates), size=draws, p=np.array(weights))
+
+    # 투찰금액 / 예정가격 (%)
+    bid_ratio = bid_rate / assessment * 100.0
+    valid = bid_ratio >= floor
+    price_score = np.clip(
+        model["max_score"] - model["penalty_per_point"] * np.abs(model["reference_rate"] - bid_ratio),
+        model["min_score"], model["max_score"],
+    )
+    total = static_score + price_score
+    passed = valid & (total >= model["pass_score"])
+
+    return {
+        "draws": draws,
+        "win_probability": round(float(passed.mean()), 6),
+        "below_floor_probability": round(float(1.0 - valid.mean()), 6),
+        "mean_score": round(float(total[valid].mean()), 4) if valid.any() else None,
+        # 하한율 미만으로 탈락한 추첨은 점수 분포에서 뺍니다.
+        "score_percentiles": _summary(total[valid]),
+        "price_score_percentiles": _summary(price_score[valid]),
+        "assessment_rate_percentiles": _summary(assessment),
+    }
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=getattr(settings, 'SIMULATION_PROCESSES', 4),
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def simulate_teams(teams, model, draws=DEFAULT_DRAWS, seed=DEFAULT_SEED):
+    """
+    teams: [(static_score, bid_rate), ...] 를 시뮬레이션해 같은 순서의 결과 목록을 반환합니다.
+    팀이 둘 이상이고 계산량이 크면 프로세스 풀에서 동시에 계산합니다.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(teams))
+    jobs = [(static_score, bid_rate, model, draws, seed_sequence)
+            for (static_score, bid_rate), seed_sequence in zip(teams, seeds)]
+    min_draws = getattr(settings, 'SIMULATION_PARALLEL_MIN_DRAWS', PARALLEL_MIN_DRAWS)
+    if len(jobs) <= 1 or getattr(settings, 'SIMULATION_PROCESSES', 4) <= 1 or len(jobs) * draws < min_draws:
+        return [simulate_team(*job) for job in jobs]
+
+    try:
+        futures = [_get_pool().submit(simulate_team, *job) for job in jobs]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # 작업 프로세스가 죽었으면 풀을 버리고 이번 요청은 바로 계산합니다. 시드가 같으므로 결과도 같습니다.
+        _reset_pool()
+        return [simulate_team(*job) for job in jobs]
@@ -0,0 +1,351 @@
+# snapshots.py
+"""
+업체 데이터셋의 과거 버전(스냅숏) 보관과 시점(as_of) 조회.
+
+업로드할 때마다 media/excel/{type}.xlsx 가 덮어써지므로, 새 버전의 전체 데이터셋이 적재될 때마다
+파싱된 업체 목록을 압축된 형태(레코드 튜플의 pickle)로 SNAPSHOT_DIR/{type}/ 에 보관합니다.
+- 버전 이름은 '파일 수정시각-SHA-256 앞 12자리' 입니다. 여러 워커가 같은 파일을 적재해도 이름이 같아
+  한 번만 저장됩니다. 버전마다 업체 데이터(.pkl)와 메타데이터(.json) 파일을 둡니다.
+- 업로드 API 로 파일을 교체할 때는 덮어쓰기 직전에, 적재되어 있지만 아직 보관되지 않은 나가는 버전을 보관합니다.
+- as_of=YYYY-MM-DD 이면 그날까지 올라온 마지막 버전, as_of=버전 이름이면 그 버전을 씁니다.
+- 읽어 들인 과거 데이터셋은 메모리 예산(SNAPSHOT_CACHE_BYTES) 안에서 LRU 로 보관합니다. 예산을 넘으면
+  가장 오래 쓰지 않은 것부터 내려놓고, 다시 필요하면 디스크에서 읽습니다. (엑셀 파싱 없이 수십 ms)
+  현재 버전은 dataset_cache 가 보관하므로 여기에 두 번 올리지 않습니다.
+"""
+
+import itertools
+import json
+import logging
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+
+from django.conf import settings
+
+from . import dataset_cache
+from .records import CompanyRecord
+from .uploads import compute_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+_VERSION_PATTERN = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{12}$')
+
+_manifests = {}   # file_type -> (폴더 수정시각, 버전 메타데이터 목록)
+_manifest_lock = threading.Lock()
+
+
+def snapshot_dir(file_type):
+    base = getattr(settings, 'SNAPSHOT_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'snapshots')
+    return os.path.join(base, file_type)
+
+
+def _check_file_type(file_type):
+    if file_type not in dataset_cache.FILE_TYPES:
+        raise ValueError(f"알 수 없는 파일 타입입니다: {file_type}")
+
+
+def _file_type_of(file_path):
+    """media/excel/{type}.xlsx 이면 type, 그 밖의 파일이면 None"""
+    for file_type in dataset_cache.FILE_TYPES:
+        if os.path.abspath(file_path) == os.path.abspath(dataset_cache.get_excel_path(file_type)):
+            return file_type
+    return None
+
+
+def version_name(signature, sha256):
+    mtime = datetime.fromtimestamp(signature[0] / 1e9)
+    return f"{mtime:%Y%m%dT%H%M%S}-{sha256[:12]}"
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# --- 보관 ---
+
+def archive(dataset):
+    """
+    현재 파일로 적재된 전체 데이터셋을 스냅숏으로 보관하고 버전 이름을 반환합니다.
+    이미 보관된 버전이면 다시 쓰지 않습니다. 보관 대상이 아니거나(지역 데이터셋, 다른 파일)
+    그 사이 파일이 바뀌었으면 None.
+    """
+    file_type = _file_type_of(dataset.file_path)
+    if file_type is None or not getattr(settings, 'SNAPSHOT_ARCHIVE', True):
+        return None
+    # 업로드 API 를 거치지 않고 바뀐 파일은 지문 파일(.sha256)이 옛 값일 수 있어 직접 계산합니다.
+    # (새 버전이 적재될 때 한 번, 수 MB 파일이면 수 ms)
+    try:
+        sha256 = compute_fingerprint(dataset.file_path)
+    except OSError:
+        return None
+    # 지문을 구하는 사이 파일이 교체되었다면 이 데이터셋의 지문이 아닙니다.
+    if dataset_cache.file_signature_or_none(dataset.file_path) != dataset.signature:
+        return None
+
+    version = version_name(dataset.signature, sha256)
+    directory = snapshot_dir(file_type)
+    meta_path = os.path.join(directory, f"{version}.json")
+    if os.path.exists(meta_path):
+        return version
+
+    start = time.perf_counter()
+    payload = pickle.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "sheet_names": list(dataset.sheet_names),
+        "records": [(comp.name, comp.region, comp.values, comp.statuses) for comp in dataset.companies],
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+    meta = {
+        "version": version,
+        "file_type": file_type,
+        "uploaded_at": datetime.fromtimestamp(dataset.signature[0] / 1e9).isoformat(timespec='seconds'),
+        "archived_at": datetime.now().isoformat(timespec='seconds'),
+        "sha256": sha256,
+        "signature": list(dataset.signature),
+        "companies": len(dataset),
+        "sheet_names": list(dataset.sheet_names),
+        "bytes": len(payload),
+    }
+    os.makedirs(directory, exist_ok=True)
+    # 데이터 파일을 먼저 쓰고 메타데이터를 마지막에 써서, 목록에 보이는 버전은 항상 읽을 수 있게 합니다.
+    _write_atomic(os.path.join(directory, f"{version}.pkl"), payload)
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+    logger.info("스냅숏 보관: %s/%s (업체 %d개, %.1f KB, %.3f초)", file_type, version, len(dataset),
+                len(payload) / 1024, time.perf_counter() - start)
+    return version
+
+
+# --- 조회 ---
+
+def list_versions(file_type):
+    """보관된 버전의 메타데이터 목록 (오래된 것부터). 폴더가 바뀌지 않았으면 다시 읽지 않습니다."""
+    _check_file_type(file_type)
+    directory = snapshot_dir(file_type)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+
+    cached = _manifests.get(file_type)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    versions = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                versions.append(json.load(f))
+        except (OSError, ValueError):
+            logger.warning("스냅숏 메타데이터를 읽을 수 없습니다: %s", entry.path)
+    # 버전 이름이 수정시각으로 시작하므로 이름 순이 시간 순입니다.
+    versions.sort(key=lambda meta: meta["version"])
+    with _manifest_lock:
+        _manifests[file_type] = (mtime, versions)
+    return versions
+
+
+def resolve(file_type, as_of):
+    """
+    as_of(YYYY-MM-DD 또는 버전 이름)에 해당하는 버전의 메타데이터.
+    형식이 틀리면 ValueError, 해당하는 버전이 없으면 LookupError.
+    """
+    versions = list_versions(file_type)
+    as_of = str(as_of).strip()
+    if _VERSION_PATTERN.match(as_of):
+        for meta in versions:
+            if meta["version"] == as_of:
+                return meta
+        raise LookupError(f"'{as_of}' 버전이 없습니다.")
+
+    try:
+        day = datetime.strptime(as_of, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"as_of 는 YYYY-MM-DD 또는 버전 이름이어야 합니다: {as_of}") from None
+    matched = None
+    for meta in versions:
+        if datetime.fromisoformat(meta["uploaded_at"]).date() <= day:
+            matched = meta
+    if matched is None:
+        raise LookupError(f"{day.isoformat()} 이전에 보관된 자료가 없습니다.")
+    return matched
+
+
+def load_snapshot(file_type, version):
+    """디스크의 스냅숏을 Dataset 으로 읽습니다. (엑셀을 다시 파싱하지 않음)"""
+    path = os.path.join(snapshot_dir(file_type), f"{version}.pkl")
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        payload = pickle.load(f)
+    if payload.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"지원하지 않는 스냅숏 형식입니다: {version}")
+    companies = [CompanyRecord(*row) for row in payload["records"]]
+    dataset = dataset_cache.Dataset(path, ('snapshot', version), companies, payload["sheet_names"],
+                                    time.perf_counter() - start)
+    dataset.version = version
+    return dataset
+
+
+# 큰 컨테이너는 앞쪽 몇 개만 재서 개수만큼 늘려 잡습니다.
+_SIZE_SAMPLE = 64
+
+
+def _sampled_size(value, seen):
+    """value 와 그 안의 값들이 차지하는 메모리 어림값. 이미 센 객체(seen)는 다시 세지 않습니다."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    nbytes = getattr(value, 'nbytes', None)   # numpy 배열
+    if isinstance(nbytes, int):
+        return sys.getsizeof(value) if value.base is None else nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(itertools.islice(value.items(), _SIZE_SAMPLE))
+        sampled = sum(_sampled_size(key, seen) + _sampled_size(item, seen) for key, item in items)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(itertools.islice(value, _SIZE_SAMPLE))
+        sampled = sum(_sampled_size(item, seen) for item in items)
+    elif hasattr(value, '__dict__'):
+        return size + _sampled_size(vars(value), seen)
+    else:
+        return size
+    if items:
+        size += sampled * len(value) // len(items)
+    return size
+
+
+def derived_bytes(dataset):
+    """데이터셋에 붙은 파생 값(특성 행렬, 정렬 순서, 이름 접두어 인덱스 등)의 메모리 어림값"""
+    # 파생 값이 들고 있는 데이터셋/업체 목록 참조는 세지 않습니다.
+    seen = {id(dataset), id(dataset.companies)}
+    return sum(_sampled_size(value, seen) for value in dataset.derived_values())
+
+
+def estimate_bytes(dataset):
+    """
+    데이터셋이 차지하는 메모리 어림값.
+    업체 레코드와 적재 시 만드는 인덱스(비트맵, 사업자번호/이름, 신용평가 기간)에 지금까지 만들어진 파생 값을 더합니다.
+    intern 된 문자열도 업체마다 세므로 실제보다 조금 크게 잡힙니다.
+    """
+    size = sys.getsizeof(dataset.companies)
+    for comp in dataset.companies:
+        size += (sys.getsizeof(comp) + sys.getsizeof(comp.name) + sys.getsizeof(comp.values)
+                 + sys.getsizeof(comp.statuses))
+        size += sum(sys.getsizeof(value) for value in comp.values if value is not None)
+    for index in (dataset.region_index, dataset.status_index):
+        size += sum(sys.getsizeof(index.get(key)) for key in index.keys())
+    seen = {id(dataset.companies)}
+    for index in (dataset.biz_no_index, dataset.name_index, dataset.credit_index):
+        size += _sampled_size(index, seen)
+    return size + derived_bytes(dataset)
+
+
+class SnapshotCache:
+    """
+    (file_type, 버전) -> Dataset 을 메모리 예산(바이트) 안에서 보관하는 LRU.
+    같은 버전을 동시에 요청하면 한 번만 읽고 결과를 함께 씁니다.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()   # key -> (Dataset, 파생 값을 뺀 어림 크기)
+        self._loading = {}              # key -> Future
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, file_type, version):
+        key = (file_type, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+                self.misses += 1
+        if not owner:
+            return future.result()
+
+        try:
+            dataset = load_snapshot(file_type, version)
+            self._put(key, dataset, estimate_bytes(dataset) - derived_bytes(dataset))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(dataset)
+            return dataset
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _put(self, key, dataset, size):
+        with self._lock:
+            if size > self.budget_bytes:
+                # 예산보다 큰 스냅숏은 이번 요청에만 쓰고 보관하지 않습니다.
+                return
+            self._entries[key] = (dataset, size)
+            # 보관 중인 데이터셋에도 조회하면서 파생 값이 붙으므로, 내려놓을 것을 고를 때마다 다시 잽니다.
+            sizes = {entry_key: base + derived_bytes(entry_dataset)
+                     for entry_key, (entry_dataset, base) in self._entries.items()}
+            self.total_bytes = sum(sizes.values())
+            while self.total_bytes > self.budget_bytes:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.total_bytes -= sizes[evicted_key]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self.total_bytes,
+                "resident": [f"{file_type}/{version}" for file_type, version in self._entries],
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SnapshotCache(getattr(settings, 'SNAPSHOT_CACHE_BYTES', DEFAULT_CACHE_BYTES))
+        return _cache
+
+
+def get_dataset(file_type, as_of):
+    """
+    as_of 시점의 데이터셋. 그 시점의 버전이 지금 파일과 같으면 dataset_cache 의 현재 데이터셋을 돌려줍니다.
+    형식이 틀리면 ValueError, 해당하는 버전이 없으면 LookupError.
+    """
+    _check_file_type(file_type)
+    meta = resolve(file_type, as_of)
+    file_path = dataset_cache.get_excel_path(file_type)
+    if tuple(meta.get("signature") or ()) == dataset_cache.file_signature_or_none(file_path):
+        return dataset_cache.get_dataset(file_path)
+    return get_cache().get(file_type, meta["version"])
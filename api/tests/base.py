@@ -0,0 +1,90 @@
+# base.py
+"""
+테스트 공용 준비물.
+
+업체 데이터는 benchmark.generate_workbook 이 만드는 가상 워크북을 씁니다. 실제 엑셀과 같은
+'회사명' + RELATIVE_OFFSETS 배치와 채우기 색상을 가지므로 파싱/색상 판정까지 함께 확인됩니다.
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+from .. import benchmark, dataset_cache, query_cache, snapshots, uploads
+
+FIXTURE_COMPANIES = 120
+FIXTURE_SEED = 7
+
+
+def record_tuples(companies):
+    """파싱 결과 비교용: 업체마다 (이름, 지역, 값, 상태)"""
+    return [(comp.name, comp.region, comp.values, comp.statuses) for comp in companies]
+
+
+class WorkbookFixtureMixin:
+    """테스트 클래스마다 가상 워크북 하나(workbook_path)를 임시 폴더에 만듭니다."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = tempfile.mkdtemp(prefix='bigging-test-')
+        cls.workbook_path = benchmark.generate_workbook(
+            os.path.join(cls.tmp_dir, 'fixture.xlsx'), FIXTURE_COMPANIES, seed=FIXTURE_SEED)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def generate(self, name, company_count=FIXTURE_COMPANIES, seed=FIXTURE_SEED):
+        """다른 내용의 워크북이 필요할 때 임시 폴더에 하나 더 만듭니다."""
+        return benchmark.generate_workbook(os.path.join(self.tmp_dir, name), company_count, seed=seed)
+
+
+class MediaFixtureMixin(WorkbookFixtureMixin):
+    """
+    테스트마다 빈 MEDIA_ROOT/SNAPSHOT_DIR/PROFILE_DIR 를 쓰고, 프로세스 안의 캐시를 비웁니다.
+    install_fixture(file_type) 로 가상 워크북을 media/excel/{file_type}.xlsx 자리에 둡니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp(dir=self.tmp_dir)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            SNAPSHOT_DIR=os.path.join(self.media_root, 'snapshots'),
+            PROFILE_DIR=os.path.join(self.media_root, 'profiles'),
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(self.reset_caches)
+        self.reset_caches()
+
+    @staticmethod
+    def reset_caches():
+        dataset_cache.invalidate()
+        query_cache.clear()
+        snapshots.get_cache().clear()
+        snapshots._manifests.clear()
+
+    def install_fixture(self, file_type='eung', source=None):
+        dest_path = dataset_cache.get_excel_path(file_type)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(source or self.workbook_path, dest_path)
+        return dest_path
+
+    def fixture_bytes(self, source=None):
+        with open(source or self.workbook_path, 'rb') as f:
+            return f.read()
+
+    def leftover_staged_files(self):
+        """업로드 후 media/excel/ 에 남은 임시 파일(.part) 이름 목록"""
+        excel_dir = dataset_cache.get_excel_dir()
+        if not os.path.isdir(excel_dir):
+            return []
+        return [name for name in os.listdir(excel_dir) if name.endswith(uploads.STAGING_SUFFIX)]
+
+    def fixture_dataset(self, file_type='eung'):
+        return dataset_cache.get_dataset(dataset_cache.get_excel_path(file_type))
@@ -0,0 +1,86 @@
+# test_anchors.py
+"""'회사명' 행 위치(앵커)만 찾아 업체 블록을 읽는 파서"""
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+
+from .. import search_logic
+from ..config import RELATIVE_OFFSETS
+from ..records import STATUS_NA
+from .base import WorkbookFixtureMixin
+
+
+def _block_rows(sheet, anchor_row, height=search_logic.BLOCK_HEIGHT):
+    return list(sheet.iter_rows(min_row=anchor_row, max_row=min(anchor_row + height - 1, sheet.max_row),
+                                min_col=1, max_col=sheet.max_column))
+
+
+def _company_sheet():
+    """안내 문구, 빈 줄, 블록 사이 메모가 섞인 시트. 두 번째 블록은 시트 끝에서 잘립니다."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = ' 서울 '
+    sheet.append(["업체 현황 (2024)"])
+    sheet.append([])
+    sheet.append(["회사명", "㈜가나전기", "  ", "다라전기"])
+    for item in RELATIVE_OFFSETS:
+        sheet.append([item, f"가나-{item}", None, f"다라-{item}"])
+    sheet.append(["※ 회사명은 법인 표기 포함"])   # A열에 '회사명' 이 들어 있지만 업체는 없는 메모 행
+    sheet.append([" 회사명 ", "마바전기"])
+    sheet.append(["대표자", "대표3"])
+    return workbook, sheet
+
+
+class AnchorTests(SimpleTestCase):
+
+    def test_is_anchor_value(self):
+        self.assertTrue(search_logic.is_anchor_value("회사명"))
+        self.assertTrue(search_logic.is_anchor_value(" 회사명 "))
+        self.assertFalse(search_logic.is_anchor_value("업체명"))
+        self.assertFalse(search_logic.is_anchor_value(None))
+        self.assertFalse(search_logic.is_anchor_value(3))
+
+    def test_find_anchor_rows_matches_full_scan(self):
+        _, sheet = _company_sheet()
+        expected = [row[0].row for row in sheet.iter_rows() if search_logic.is_anchor_value(row[0].value)]
+        self.assertEqual(search_logic.find_anchor_rows(sheet), expected)
+
+    def test_block_parsing_skips_blank_columns_and_fills_missing_rows(self):
+        _, sheet = _company_sheet()
+        first_anchor = search_logic.find_anchor_rows(sheet)[0]
+        companies = search_logic.parse_company_block(
+            sheet.title, _block_rows(sheet, first_anchor), lambda cell: 0)
+        self.assertEqual([comp.name for comp in companies], ["㈜가나전기", "다라전기"])
+        self.assertEqual(companies[0].region, '서울')
+        self.assertEqual(companies[1].value('비고'), '다라-비고')
+
+        note_anchor, last_anchor = search_logic.find_anchor_rows(sheet)[1:]
+        self.assertEqual(search_logic.parse_company_block(sheet.title, _block_rows(sheet, note_anchor), lambda cell: 0), [])
+        (truncated,) = search_logic.parse_company_block(sheet.title, _block_rows(sheet, last_anchor), lambda cell: 0)
+        self.assertEqual(truncated.value('대표자'), '대표3')
+        self.assertEqual(truncated.value('사업자번호'), 'N/A')
+        self.assertEqual(truncated.statuses[-1], STATUS_NA)
+
+    def test_bad_company_is_collected_not_raised(self):
+        _, sheet = _company_sheet()
+        first_anchor = search_logic.find_anchor_rows(sheet)[0]
+
+        def status_of_cell(cell):
+            if cell.value == '다라-시평':
+                raise ValueError("bad cell")
+            return 0
+
+        errors = []
+        companies = search_logic.parse_company_block(sheet.title, _block_rows(sheet, first_anchor), status_of_cell, errors)
+        self.assertEqual([comp.name for comp in companies], ["㈜가나전기"])
+        self.assertEqual([(col, str(error)) for col, error in errors], [(4, "bad cell")])
+
+
+class AnchorParseTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_anchor_count_matches_parsed_blocks(self):
+        info = search_logic.validate_workbook(self.workbook_path)
+        companies, sheet_names = search_logic.parse_workbook(self.workbook_path, streaming=False)
+        self.assertEqual(info["sheets"], len(sheet_names))
+        # 가상 워크북의 블록마다 업체가 하나 이상 있습니다.
+        self.assertLessEqual(info["blocks"], len(companies))
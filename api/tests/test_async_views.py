@@ -0,0 +1,109 @@
+# test_async_views.py
+"""ASGI 용 비동기 뷰 (/api/async/...) 와 데이터셋 single-flight 적재"""
+
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from .. import dataset_cache, search_logic
+from .base import MediaFixtureMixin
+
+
+def _counting_parse(calls, delay=0.2):
+    """parse_workbook 을 감싸 호출 수를 세고, 동시 요청이 겹치도록 조금 늦춥니다."""
+    parse = search_logic.parse_workbook
+
+    def wrapper(*args, **kwargs):
+        calls.append(threading.current_thread().name)
+        time.sleep(delay)
+        return parse(*args, **kwargs)
+    return wrapper
+
+
+class AsyncViewTests(MediaFixtureMixin, TestCase):
+
+    async def test_search_matches_sync_view(self):
+        self.install_fixture('eung')
+        for params in ({}, {'name': '전기'}, {'min_sipyung': '5000000000'}, {'sort': 'sipyung', 'top': '5'}):
+            params = dict(params, file_type='eung')
+            expected = (await self.async_client.get('/api/search/', params)).json()
+            response = await self.async_client.get('/api/async/search/', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), expected, params)
+
+    async def test_region_search_matches_sync_view(self):
+        self.install_fixture('eung')
+        region = self.fixture_dataset().sheet_names[0].strip()
+        self.reset_caches()
+        # 지역 검색은 그 시트만 읽어 답합니다.
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'region': region})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json())
+        self.assertTrue(all(row['대표지역'] == region for row in response.json()))
+        expected = (await self.async_client.get('/api/search/', {'file_type': 'eung', 'region': region})).json()
+        self.assertEqual(response.json(), expected)
+
+    async def test_missing_file_returns_empty_list(self):
+        for url in ('/api/async/search/', '/api/async/get_regions/'):
+            response = await self.async_client.get(url, {'file_type': 'sobang'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), [])
+
+    async def test_invalid_sort_params_are_rejected(self):
+        self.install_fixture('eung')
+        for params in ({'top': '-1'}, {'top': 'abc'}, {'sort': 'sipyung', 'order': 'up'},
+                       {'sort': 'score', 'announcement_date': '2024/01/01'}):
+            response = await self.async_client.get('/api/async/search/', dict(params, file_type='eung'))
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    async def test_unknown_as_of_version(self):
+        self.install_fixture('eung')
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'as_of': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'as_of': '2000-01-01'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_sheet_names_and_file_status(self):
+        self.install_fixture('eung')
+        expected = (await self.async_client.get('/api/get_regions/', {'file_type': 'eung'})).json()
+        response = await self.async_client.get('/api/async/get_regions/', {'file_type': 'eung'})
+        self.assertEqual(response.json(), expected)
+        self.assertTrue(expected)
+
+        response = await self.async_client.get('/api/async/check_files/')
+        self.assertEqual(response.json(), {'eung': True, 'tongsin': False, 'sobang': False})
+        self.assertEqual(response.json(), (await self.async_client.get('/api/check_files/')).json())
+
+    async def test_async_views_only_accept_get(self):
+        for url in ('/api/async/search/', '/api/async/get_regions/', '/api/async/check_files/'):
+            self.assertEqual((await self.async_client.post(url)).status_code, 405, url)
+
+    async def test_concurrent_cold_requests_parse_once(self):
+        path = self.install_fixture('eung')
+        calls = []
+        with mock.patch.object(search_logic, 'parse_workbook', _counting_parse(calls)):
+            datasets = await asyncio.gather(*(dataset_cache.aget_dataset(path) for _ in range(5)))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(dataset is datasets[0] for dataset in datasets))
+        # 캐시 적중은 파싱 풀을 거치지 않습니다.
+        self.assertIs(await dataset_cache.aget_dataset(path), datasets[0])
+
+    def test_sync_callers_join_inflight_parse(self):
+        path = self.install_fixture('eung')
+        calls, results = [], []
+        with mock.patch.object(search_logic, 'parse_workbook', _counting_parse(calls)):
+            threads = [threading.Thread(target=lambda: results.append(dataset_cache.get_dataset(path)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(dataset is results[0] for dataset in results))
+        # 처음 요청한 스레드가 풀에 넘기지 않고 직접 파싱합니다.
+        self.assertFalse(calls[0].startswith('dataset-parse'))
@@ -0,0 +1,70 @@
+# test_benchmark.py
+"""가상 워크북 생성기와 benchmark 명령"""
+
+import json
+import os
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from .. import benchmark, search_logic
+from .base import FIXTURE_COMPANIES, WorkbookFixtureMixin
+
+
+class GenerateWorkbookTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_generated_companies_are_parsed(self):
+        companies, sheet_names = search_logic.parse_workbook(self.workbook_path)
+        self.assertEqual(sheet_names, benchmark.REGIONS)
+        self.assertEqual(len(companies), FIXTURE_COMPANIES)
+        self.assertEqual(len({comp.name for comp in companies}), FIXTURE_COMPANIES)
+        # 업체는 지역 시트마다 고르게 나뉩니다.
+        per_region = {region: sum(1 for comp in companies if comp.region == region) for region in benchmark.REGIONS}
+        self.assertLessEqual(max(per_region.values()) - min(per_region.values()), 1)
+
+    def test_same_seed_gives_same_records(self):
+        other = self.generate('same-seed.xlsx')
+        first, _ = search_logic.parse_workbook(self.workbook_path)
+        second, _ = search_logic.parse_workbook(other)
+        self.assertEqual([(comp.name, comp.values, comp.statuses) for comp in first],
+                         [(comp.name, comp.values, comp.statuses) for comp in second])
+
+
+class CompareResultsTests(SimpleTestCase):
+
+    def _report(self, parse_s, search_s):
+        return {"results": [{"companies": 100, "cold_parse_s": parse_s, "warm_search": {"all": {"best_s": search_s}}}]}
+
+    def test_regression_over_threshold_is_reported(self):
+        regressions = benchmark.compare_results(self._report(1.0, 0.01), self._report(1.5, 0.011), 0.2)
+        self.assertEqual([item["metric"] for item in regressions], ["cold_parse_s"])
+        self.assertEqual(regressions[0]["ratio"], 1.5)
+
+    def test_other_sizes_are_not_compared(self):
+        baseline = {"results": [{"companies": 200, "cold_parse_s": 0.001}]}
+        self.assertEqual(benchmark.compare_results(baseline, self._report(1.0, 0.01)), [])
+
+
+class BenchmarkCommandTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_writes_report_and_fails_on_regression(self):
+        output = os.path.join(self.tmp_dir, 'report.json')
+        call_command('benchmark', '--sizes', '40', '--repeat', '1', '--no-memory', '--work-dir', self.tmp_dir,
+                     '--output', output, stdout=StringIO())
+        with open(output, encoding='utf-8') as f:
+            report = json.load(f)
+        [result] = report["results"]
+        self.assertEqual(result["parsed_companies"], 40)
+        self.assertEqual(result["warm_search"]["all"]["rows"], 40)
+        self.assertIn("cold_parse_streaming_s", result)
+
+        # 훨씬 빠른 기준과 비교하면 실패합니다.
+        for item in report["results"]:
+            item["cold_parse_s"] = item["cold_parse_s"] / 100
+        baseline = os.path.join(self.tmp_dir, 'baseline.json')
+        with open(baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f)
+        with self.assertRaises(CommandError):
+            call_command('benchmark', '--sizes', '40', '--repeat', '1', '--no-memory', '--work-dir', self.tmp_dir,
+                         '--baseline', baseline, '--output', output, stdout=StringIO())
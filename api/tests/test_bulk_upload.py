@@ -0,0 +1,122 @@
+# test_bulk_upload.py
+"""세 파일 한 번에 올리기 (/api/upload/bulk/) 와 병렬 적재(dataset_cache.ingest)"""
+
+import os
+import threading
+from concurrent.futures import Future
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from .. import dataset_cache, uploads
+from .base import FIXTURE_COMPANIES, MediaFixtureMixin
+
+
+class BulkUploadTests(MediaFixtureMixin, TestCase):
+
+    def _bulk(self, **files):
+        data = {
+            field: [SimpleUploadedFile(f'{field}.xlsx', content) for content in contents]
+            if isinstance(contents, list) else SimpleUploadedFile(f'{field}.xlsx', contents)
+            for field, contents in files.items()
+        }
+        return self.client.post('/api/upload/bulk/', data)
+
+    def test_upload_two_files_and_search_both(self):
+        other = self.fixture_bytes(self.generate('other.xlsx', company_count=40, seed=3))
+        response = self._bulk(eung=self.fixture_bytes(), sobang=other)
+        self.assertEqual(response.status_code, 201)
+        files = response.json()["files"]
+        self.assertEqual(files["eung"]["status"], "완료")
+        self.assertEqual(files["eung"]["companies"], FIXTURE_COMPANIES)
+        self.assertEqual(files["sobang"]["companies"], 40)
+        self.assertNotIn("tongsin", files)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+        # 응답 전에 캐시에 들어가 있으므로 다음 검색은 파싱하지 않습니다.
+        for file_type, count in (('eung', FIXTURE_COMPANIES), ('sobang', 40)):
+            self.assertIsNotNone(dataset_cache.get_cached_dataset(dataset_cache.get_excel_path(file_type)))
+            self.assertEqual(len(self.client.get('/api/search/', {'file_type': file_type}).json()), count)
+
+    def test_same_content_is_not_replaced(self):
+        path = self.install_fixture('eung')
+        self.fixture_dataset('eung')
+        mtime = os.stat(path).st_mtime_ns
+        response = self._bulk(eung=self.fixture_bytes())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["files"]["eung"], {"status": "변경 없음", "companies": FIXTURE_COMPANIES})
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_no_known_fields_is_rejected(self):
+        self.assertEqual(self.client.post('/api/upload/bulk/', {}).status_code, 400)
+        response = self._bulk(other=self.fixture_bytes())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_one_invalid_file_replaces_nothing(self):
+        response = self._bulk(eung=self.fixture_bytes(), tongsin=b'not an excel file')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('[tongsin]', response.json()["error"])
+        self.assertFalse(os.path.exists(dataset_cache.get_excel_path('eung')))
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_repeated_field_leaves_no_staged_files(self):
+        response = self._bulk(eung=[self.fixture_bytes(), self.fixture_bytes()])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+        response = self.client.post('/api/upload/', {
+            'type': 'tongsin',
+            # 같은 필드의 마지막 파일만 쓰고, 앞의 파일은 임시 파일까지 지웁니다.
+            'file': [SimpleUploadedFile('a.xlsx', b'x'), SimpleUploadedFile('b.xlsx', self.fixture_bytes())],
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_path_traversal_type_is_rejected(self):
+        for file_type in ('../../x', '../eung', 'eung/../../x', ''):
+            response = self.client.post('/api/upload/', {
+                'type': file_type, 'file': SimpleUploadedFile('upload.xlsx', self.fixture_bytes())})
+            self.assertEqual(response.status_code, 400, file_type)
+        self.assertEqual(self.leftover_staged_files(), [])
+        written = [name for _, _, names in os.walk(self.tmp_dir) for name in names]
+        self.assertFalse([name for name in written if name.startswith('x')])
+
+    def test_install_uploads_rejects_unknown_type(self):
+        with self.assertRaises(ValueError):
+            uploads.install_uploads({'../x': None})
+
+
+class IngestTests(MediaFixtureMixin, TestCase):
+
+    def test_ingest_joins_inflight_parse(self):
+        path = self.install_fixture('eung')
+        key = (path, dataset_cache.file_signature(path), None)
+        inflight = Future()
+        dataset_cache._inflight[key] = inflight
+        self.addCleanup(dataset_cache._inflight.pop, key, None)
+
+        results = {}
+        worker = threading.Thread(target=lambda: results.update(dataset_cache.ingest([path])))
+        worker.start()
+        worker.join(0.2)
+        # 이미 파싱 중인 요청의 결과를 기다리며, 그 요청의 Future 를 덮어쓰지 않습니다.
+        self.assertTrue(worker.is_alive())
+        self.assertIs(dataset_cache._inflight[key], inflight)
+
+        marker = object()
+        inflight.set_result(marker)
+        worker.join()
+        self.assertIs(results[path], marker)
+        self.assertIs(dataset_cache._inflight[key], inflight)
+
+    def test_ingest_reports_errors_per_file(self):
+        good = self.install_fixture('eung')
+        bad = self.install_fixture('sobang')
+        with open(bad, 'wb') as f:
+            f.write(b'not a workbook')
+        results = dataset_cache.ingest([good, bad])
+        self.assertEqual(len(results[good]), FIXTURE_COMPANIES)
+        self.assertIsInstance(results[bad], Exception)
+        self.assertEqual(dataset_cache._inflight, {})
@@ -0,0 +1,89 @@
+# test_company_lookup.py
+"""사업자번호/업체명으로 바로 조회 (/api/companies/<biz_no>/, /api/companies/lookup/)"""
+
+import os
+
+from django.test import TestCase
+from openpyxl import Workbook
+
+from ..config import RELATIVE_OFFSETS
+from .base import MediaFixtureMixin
+
+
+def _duplicate_workbook(path):
+    """같은 사업자번호의 업체가 '서울'과 '경기' 시트에 모두 있는 워크북"""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for region, name in (('서울', '㈜가나전기'), ('경기', '가나전기 경기지사')):
+        sheet = workbook.create_sheet(region)
+        sheet.append(["회사명", name])
+        for item in RELATIVE_OFFSETS:
+            sheet.append([item, '123-45-67890' if item == '사업자번호' else f"{region}-{item}"])
+    workbook.save(path)
+    return path
+
+
+class CompanyDetailTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.company = self.fixture_dataset().companies[5]
+        self.biz_no = self.company.value('사업자번호')
+
+    def test_detail_by_biz_no_with_or_without_hyphens(self):
+        for key in (self.biz_no, self.biz_no.replace('-', '')):
+            response = self.client.get(f'/api/companies/{key}/', {'file_type': 'eung'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['검색된 회사'], self.company.name)
+            self.assertEqual(response.json()['업체명'], self.company.name)
+
+    def test_detail_not_found(self):
+        response = self.client.get('/api/companies/000-00-00000/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(f'/api/companies/{self.biz_no}/', {'file_type': 'sobang'}).status_code, 404)
+        self.assertEqual(self.client.get(f'/api/companies/{self.biz_no}/', {'as_of': 'abc'}).status_code, 400)
+
+    def test_region_picks_among_duplicates(self):
+        self.install_fixture('tongsin', source=_duplicate_workbook(os.path.join(self.media_root, 'dup.xlsx')))
+        url = '/api/companies/1234567890/'
+        self.assertEqual(self.client.get(url, {'file_type': 'tongsin'}).json()['대표지역'], '서울')
+        self.assertEqual(self.client.get(url, {'file_type': 'tongsin', 'region': ' 경기 '}).json()['대표지역'], '경기')
+        # 없는 지역이면 첫 번째 업체를 돌려줍니다.
+        self.assertEqual(self.client.get(url, {'file_type': 'tongsin', 'region': '부산'}).json()['대표지역'], '서울')
+
+
+class CompanyLookupTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.companies = self.fixture_dataset().companies
+
+    def _lookup(self, body):
+        return self.client.post('/api/companies/lookup/', body, content_type='application/json')
+
+    def test_lookup_keeps_request_order(self):
+        first, second = self.companies[3], self.companies[10]
+        response = self._lookup({
+            'file_type': 'eung',
+            'biz_nos': [second.value('사업자번호'), '없는번호'],
+            'names': [' ' + first.name.replace('㈜', '주식회사 ') + ' '],
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([(item["by"], item["company"] and item["company"]["검색된 회사"]) for item in results],
+                         [('biz_no', second.name), ('biz_no', None), ('name', first.name)])
+        self.assertEqual(results[1]["key"], '없는번호')
+
+    def test_invalid_requests(self):
+        cases = [
+            ({'file_type': 'eung'}, 400),
+            ({'biz_nos': '123-45-67890'}, 400),
+            ({'names': {'a': 1}}, 400),
+            ({'biz_nos': ['1'] * 501}, 400),
+            ({'file_type': 'sobang', 'biz_nos': ['1']}, 404),
+            ({'biz_nos': ['1'], 'as_of': 'abc'}, 400),
+        ]
+        for body, expected in cases:
+            self.assertEqual(self._lookup(body).status_code, expected, body)
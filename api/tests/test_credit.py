@@ -0,0 +1,150 @@
+# test_credit.py
+"""신용평가 유효기간 인덱스 (IntervalIndex), credit_valid_on 검색 필터와 /api/credit/expiring/"""
+
+import random
+from datetime import date
+
+from django.test import SimpleTestCase, TestCase
+
+from .. import calculation_logic, dataset_cache, search_logic
+from ..indexes import IntervalIndex, bitmap_positions
+from ..utils import parse_credit_period
+from .base import MediaFixtureMixin, WorkbookFixtureMixin
+
+
+class IntervalIndexTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_interval_index_matches_brute_force(self):
+        rng = random.Random(3)
+        size = 400
+        intervals = []
+        for pos in range(size):
+            if rng.random() < 0.8:
+                start = rng.randint(0, 100)
+                intervals.append((pos, start, start + rng.randint(0, 40)))
+        index = IntervalIndex(intervals, size)
+        for point in range(-1, 145):
+            expected = sorted(pos for pos, start, end in intervals if start <= point <= end)
+            self.assertEqual(bitmap_positions(index.containing(point)), expected, point)
+        for low, high in ((None, None), (10, 50), (50, 10), (None, 30), (120, None)):
+            expected = sorted((item for item in intervals
+                               if (low is None or item[2] >= low) and (high is None or item[2] < high)),
+                              key=lambda item: (item[2], item[0]))
+            self.assertEqual(index.ending_between(low, high), expected)
+
+    def test_dataset_credit_index_matches_rating_check(self):
+        companies, sheet_names = search_logic.parse_workbook(self.workbook_path)
+        dataset = dataset_cache.Dataset(self.workbook_path, (0, 0), companies, sheet_names, 0.0)
+        for day in (date(2023, 1, 1), date(2024, 6, 15), date(2025, 3, 1), date(2026, 12, 31), date(2028, 1, 1)):
+            expected = [pos for pos, comp in enumerate(companies)
+                        if calculation_logic._is_credit_rating_valid(comp.value('신용평가'), day) == "유효"]
+            self.assertEqual(bitmap_positions(dataset.credit_index.containing(day)), expected, day)
+
+    def test_credit_valid_on(self):
+        day = date(2025, 1, 1)
+        self.assertTrue(search_logic.credit_valid_on("A0\n(24.06.30~25.06.29)", day))
+        self.assertTrue(search_logic.credit_valid_on("A0 (25.01.01~26.01.01)", day))
+        self.assertFalse(search_logic.credit_valid_on("A0 (23.06.30~24.06.29)", day))
+        for rating in (None, "", "A0", 3.5):
+            self.assertFalse(search_logic.credit_valid_on(rating, day), rating)
+
+
+class CreditValidOnFilterTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+
+    def _names(self, params):
+        response = self.client.get('/api/search/', {'file_type': 'eung', **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['검색된 회사'] for row in response.json()]
+
+    def _expected(self, day, region=None):
+        return [comp.name for comp in self.dataset.companies
+                if search_logic.credit_valid_on(comp.value('신용평가'), day) and (region is None or comp.region == region)]
+
+    def test_index_path_matches_filter(self):
+        for day in (date(2024, 6, 15), date(2025, 3, 1), date(2030, 1, 1)):
+            filters = {'credit_valid_on': day}
+            self.assertEqual(search_logic.search_dataset(self.dataset, filters),
+                             search_logic.filter_companies(self.dataset.companies, filters), day)
+
+    def test_search_endpoint(self):
+        expected = self._expected(date(2025, 3, 1))
+        self.assertTrue(expected)
+        self.assertEqual(self._names({'credit_valid_on': '2025-03-01'}), expected)
+        region = self.dataset.companies[0].region
+        self.assertEqual(self._names({'credit_valid_on': '2025-03-01', 'region': region}),
+                         self._expected(date(2025, 3, 1), region))
+
+    def test_invalid_date_is_ignored(self):
+        # 다른 검색 필터처럼 형식이 틀린 값은 조건에서 빠집니다.
+        everyone = [comp.name for comp in self.dataset.companies]
+        self.assertEqual(self._names({'credit_valid_on': '2025/03/01'}), everyone)
+        self.assertEqual(self._names({'credit_valid_on': ''}), everyone)
+
+
+class CreditExpiringViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+
+    def _get(self, **params):
+        return self.client.get('/api/credit/expiring/', {'file_type': 'eung', **params})
+
+    def _expected(self, after, before, accept=lambda comp: True):
+        expiring = []
+        for pos, comp in enumerate(self.dataset.companies):
+            try:
+                start, end = parse_credit_period(comp.value('신용평가'))
+            except ValueError:
+                continue
+            if after <= end < before and accept(comp):
+                expiring.append((end, pos, comp))
+        return [(comp.name, end.isoformat()) for end, pos, comp in sorted(expiring, key=lambda item: item[:2])]
+
+    def _results(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [(row["검색된 회사"], row["종료일"]) for row in response.json()["results"]]
+
+    def test_matches_brute_force(self):
+        response = self._get(after='2025-01-01', before='2025-07-01')
+        expected = self._expected(date(2025, 1, 1), date(2025, 7, 1))
+        self.assertTrue(expected)
+        self.assertEqual(self._results(response), expected)
+        data = response.json()
+        self.assertEqual((data["after"], data["before"], data["total"]), ("2025-01-01", "2025-07-01", len(expected)))
+        row = data["results"][0]
+        self.assertEqual(row["남은 일수"], (date.fromisoformat(row["종료일"]) - date.today()).days)
+
+    def test_region_status_and_limit(self):
+        region = self.dataset.companies[0].region
+        response = self._get(after='2024-01-01', before='2028-01-01', region=region, status='최신,1년 경과')
+        expected = self._expected(date(2024, 1, 1), date(2028, 1, 1),
+                                  lambda comp: comp.region == region and comp.summary_status in ('최신', '1년 경과'))
+        self.assertEqual(self._results(response), expected)
+
+        response = self._get(after='2024-01-01', before='2028-01-01', limit='3')
+        everyone = self._expected(date(2024, 1, 1), date(2028, 1, 1))
+        self.assertEqual(self._results(response), everyone[:3])
+        self.assertEqual(response.json()["total"], len(everyone))
+
+    def test_invalid_requests(self):
+        cases = [
+            ({}, 400, "before(YYYY-MM-DD)가 필요합니다."),
+            ({'before': '2025/07/01'}, 400, "요청 값이 올바르지 않습니다"),
+            ({'before': '2025-07-01', 'after': 'x'}, 400, "요청 값이 올바르지 않습니다"),
+            ({'before': '2025-07-01', 'limit': 'many'}, 400, "요청 값이 올바르지 않습니다"),
+            ({'before': '2025-01-01', 'after': '2025-01-01'}, 400, "before 는 after 보다 뒤의 날짜여야 합니다."),
+            ({'before': '2025-07-01', 'after': '2025-01-01', 'as_of': 'abc'}, 400, "as_of"),
+            ({'before': '2025-07-01', 'after': '2025-01-01', 'as_of': '2000-01-01'}, 404, "이전에 보관된 자료가 없습니다."),
+            ({'before': '2025-07-01', 'after': '2025-01-01', 'file_type': 'sobang'}, 404, "파일이 없습니다."),
+        ]
+        for params, status_code, message in cases:
+            response = self._get(**params)
+            self.assertEqual(response.status_code, status_code, params)
+            self.assertIn(message, response.json()["error"])
@@ -0,0 +1,93 @@
+# test_diff.py
+"""이전 버전과 현재 버전의 업체 비교 (diff.diff_datasets, /api/diff/)"""
+
+from django.test import SimpleTestCase, TestCase
+
+from .. import dataset_cache
+from ..diff import diff_datasets
+from ..records import FIELDS, STATUS_CODES, CompanyRecord
+from .base import MediaFixtureMixin
+
+
+def _company(name, biz_no, region='서울', sipyung=100, status='최신'):
+    values = {'사업자번호': biz_no, '시평': sipyung, '3년 실적': 0, '5년 실적': 0, '부채비율': 50}
+    statuses = [STATUS_CODES[status] if field in ('시평', '3년 실적', '5년 실적') else 0 for field in FIELDS]
+    return CompanyRecord(name, region, [values.get(field, '') for field in FIELDS], statuses)
+
+
+def _dataset(companies):
+    return dataset_cache.Dataset('/tmp/diff.xlsx', (0, 0), companies, ['서울', '경기'], 0.0)
+
+
+class DiffDatasetsTests(SimpleTestCase):
+
+    def test_added_removed_and_changed(self):
+        previous = _dataset([
+            _company('가나', '111-11-11111'),
+            _company('다라', '222-22-22222', sipyung=200),
+            _company('마바', '333-33-33333'),
+            _company('사업자없음', ''),
+        ])
+        current = _dataset([
+            _company('가나', '1111111111'),                      # 하이픈만 다름 -> 같은 업체
+            _company('다라(상호변경)', '222-22-22222', sipyung=250, status='1년 경과'),
+            _company('사업자없음', ''),
+            _company('새업체', '444-44-44444'),
+        ])
+        diff = diff_datasets(previous, current)
+        self.assertEqual(diff["summary"], {"added": 1, "removed": 1, "changed": 1, "unchanged": 2})
+        self.assertEqual([item["업체명"] for item in diff["added"]], ['새업체'])
+        self.assertEqual([item["업체명"] for item in diff["removed"]], ['마바'])
+        (changed,) = diff["changed"]
+        self.assertEqual(changed["업체명"], '다라(상호변경)')
+        self.assertEqual(changed["changes"], {"시평": {"before": 200, "after": 250}})
+        self.assertEqual(changed["status_changes"]["시평"], {"before": "최신", "after": "1년 경과"})
+        self.assertEqual(changed["status_changes"]["요약상태"], {"before": "최신", "after": "1년 경과"})
+
+    def test_duplicate_biz_no_is_matched_in_order(self):
+        # 같은 시트에 같은 사업자번호가 두 번 나오면 나온 순서대로 짝짓습니다.
+        previous = _dataset([_company('가나', '111', sipyung=1), _company('가나', '111', sipyung=2),
+                             _company('가나', '111', region='경기', sipyung=3)])
+        current = _dataset([_company('가나', '111', sipyung=1), _company('가나', '111', sipyung=5),
+                            _company('가나', '111', region='경기', sipyung=3)])
+        diff = diff_datasets(previous, current)
+        self.assertEqual(diff["summary"], {"added": 0, "removed": 0, "changed": 1, "unchanged": 2})
+        self.assertEqual(diff["changed"][0]["changes"]["시평"], {"before": 2, "after": 5})
+
+    def test_identical_datasets(self):
+        companies = [_company('가나', '111'), _company('다라', '222')]
+        diff = diff_datasets(_dataset(companies), _dataset(list(companies)))
+        self.assertEqual(diff["summary"], {"added": 0, "removed": 0, "changed": 0, "unchanged": 2})
+
+
+class DiffViewTests(MediaFixtureMixin, TestCase):
+
+    def test_diff_after_file_is_replaced(self):
+        self.install_fixture('eung')
+        previous = self.fixture_dataset('eung')
+        self.install_fixture('eung', source=self.generate('changed.xlsx', seed=8))
+        current = self.fixture_dataset('eung')
+        self.assertIsNot(previous, current)
+
+        response = self.client.get('/api/diff/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        expected = diff_datasets(previous, current)
+        self.assertEqual(data["summary"], expected["summary"])
+        self.assertEqual(data["previous"]["companies"], len(previous))
+        self.assertEqual(data["current"]["companies"], len(current))
+        self.assertEqual(len(data["changed"]), expected["summary"]["changed"])
+        self.assertGreater(expected["summary"]["changed"], 0)
+
+    def test_missing_file_or_previous_version(self):
+        response = self.client.get('/api/diff/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 404)
+        self.install_fixture('eung')
+        response = self.client.get('/api/diff/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["error"], "비교할 이전 버전이 없습니다.")
+
+    def test_bad_as_of(self):
+        self.install_fixture('eung')
+        self.assertEqual(self.client.get('/api/diff/', {'file_type': 'eung', 'as_of': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/diff/', {'file_type': 'eung', 'as_of': '2000-01-01'}).status_code, 404)
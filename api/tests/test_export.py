@@ -0,0 +1,144 @@
+# test_export.py
+"""검색/컨소시엄 결과 CSV·XLSX 내려받기 (export.py, /api/export/search/, /api/export/consortium/)"""
+
+import csv
+import io
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from openpyxl import load_workbook
+
+from .. import export, ranking, search_logic
+from .base import MediaFixtureMixin
+
+
+def _csv_rows(response):
+    content = b"".join(response.streaming_content).decode("utf-8")
+    if not content.startswith("\ufeff"):
+        raise AssertionError("UTF-8 BOM 으로 시작해야 합니다.")
+    return list(csv.reader(io.StringIO(content[1:])))
+
+
+def _xlsx_rows(response):
+    workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True)
+    return workbook.active.title, [list(row) for row in workbook.active.iter_rows(values_only=True)]
+
+
+def _as_csv(row):
+    return ["" if value is None else str(value) for value in row]
+
+
+class StreamTests(SimpleTestCase):
+
+    def test_csv_is_sent_in_chunks(self):
+        rows = [(pos, f"업체{pos}", None) for pos in range(25)]
+        with mock.patch.object(export, "EXPORT_CHUNK_ROWS", 10):
+            chunks = list(export.stream_csv(("번호", "이름", "값"), iter(rows)))
+        # 머리행 + 10행 + 10행 + 5행
+        self.assertEqual(len(chunks), 4)
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8")[1:])))
+        self.assertEqual(parsed, [["번호", "이름", "값"]] + [_as_csv(row) for row in rows])
+
+    def test_xlsx_drops_illegal_characters(self):
+        response = export.export_response("xlsx", ("이름",), iter([("가\x01나",), (3,)]), "test", sheet_title="시트")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="test.xlsx"')
+        self.assertEqual(_xlsx_rows(response), ("시트", [["이름"], ["가나"], [3]]))
+
+
+class SearchExportViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+
+    def _get(self, **params):
+        return self.client.get('/api/export/search/', {'file_type': 'eung', **params})
+
+    def test_csv_matches_search_results(self):
+        response = self._get(region='경기')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], export.CONTENT_TYPES["csv"])
+        self.assertIn('filename="search_eung_', response["Content-Disposition"])
+        expected = search_logic.search_dataset(self.dataset, {'region': '경기'})
+        self.assertTrue(expected)
+        self.assertEqual(_csv_rows(response),
+                         [list(export.COMPANY_COLUMNS)] + [_as_csv(row) for row in export.company_rows(expected)])
+
+    def test_xlsx_follows_sort_and_top(self):
+        response = self._get(export_format='XLSX', sort='sipyung', top='5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], export.CONTENT_TYPES["xlsx"])
+        column = ranking.get_sort_column(self.dataset, '시평')
+        expected = ranking.sort_results(self.dataset, self.dataset.companies, column, True, 5)
+        title, rows = _xlsx_rows(response)
+        self.assertEqual(title, "검색 결과")
+        self.assertEqual(rows[0], list(export.COMPANY_COLUMNS))
+        self.assertEqual([row[0] for row in rows[1:]], [comp.name for comp in expected])
+
+    def test_invalid_requests(self):
+        cases = [
+            ({'export_format': 'pdf'}, 400, "지원하지 않는 형식입니다: pdf"),
+            ({'sort': '이름'}, 400, "정렬할 수 없는 항목입니다: 이름"),
+            ({'top': '-1'}, 400, "top 은 0 이상의 정수여야 합니다."),
+            ({'as_of': '2024/06/01'}, 400, ""),
+            ({'file_type': 'sobang'}, 404, "파일이 없습니다."),
+        ]
+        for params, status_code, message in cases:
+            response = self._get(**params)
+            self.assertEqual(response.status_code, status_code, params)
+            self.assertIn(message, response.json()["error"])
+
+
+class ConsortiumExportViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.companies = [comp for comp in self.fixture_dataset().companies if comp.value('신용평가')]
+        self.teams = [
+            {"name": "A", "companies": [{"biz_no": self.companies[0].value('사업자번호'), "share": 0.6},
+                                        {"biz_no": self.companies[1].value('사업자번호'), "share": 0.4}]},
+            {"companies": [{"biz_no": self.companies[2].value('사업자번호'), "share": 1}]},
+        ]
+
+    def _post(self, **body):
+        body = {"teams": self.teams, "rule": ["행안부", "30억미만"], "announcement_date": "2024-06-01",
+                "price_data": {"estimation_price": 2000000000}, **body}
+        return self.client.post('/api/export/consortium/', body, content_type='application/json')
+
+    def test_one_row_per_member(self):
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="consortium_', response["Content-Disposition"])
+        rows = _csv_rows(response)
+        self.assertEqual(rows[0], list(export.CONSORTIUM_COLUMNS))
+        self.assertEqual([(row[0], row[1], row[4]) for row in rows[1:]], [
+            ("1", "A", self.companies[0].value('사업자번호')),
+            ("1", "A", self.companies[1].value('사업자번호')),
+            ("2", self.companies[2].name, self.companies[2].value('사업자번호')),
+        ])
+        # 팀 점수 열은 팀의 모든 구성원 행에서 같습니다.
+        self.assertEqual(rows[1][9:], rows[2][9:])
+
+    def test_xlsx(self):
+        title, rows = _xlsx_rows(self._post(export_format='xlsx'))
+        self.assertEqual(title, "컨소시엄")
+        self.assertEqual(len(rows), 4)
+
+    def test_invalid_requests(self):
+        cases = [
+            {"export_format": "pdf"},
+            {"teams": []},
+            {"teams": [self.teams[0]] * 201},
+            {"teams": [{"companies": [{"biz_no": "000-00-00000", "share": 1}]}]},
+            {"teams": [{"companies": [{"biz_no": self.companies[0].value('사업자번호')}]}]},
+            {"price_data": {}},
+            {"price_data": {"estimation_price": 0}},
+            {"rule": ["행안부", "없는규칙"]},
+            {"announcement_date": "2024/06/01"},
+        ]
+        for body in cases:
+            response = self._post(**body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.json())
@@ -0,0 +1,78 @@
+# test_fill_status.py
+"""채우기 색상 -> 데이터상태 판정과 스타일별 캐시 (search_logic.FillStatusCache)"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+from openpyxl.styles.colors import Color
+
+from .. import search_logic
+from ..records import STATUS_CODES
+from .base import WorkbookFixtureMixin
+
+
+def _fill(**color):
+    return PatternFill(fill_type='solid', fgColor=Color(**color))
+
+
+class StatusFromColorTests(SimpleTestCase):
+
+    def test_theme_and_rgb_colors(self):
+        cases = [
+            (_fill(theme=6), "최신"), (_fill(theme=3), "1년 경과"),
+            (_fill(theme=0), "1년 이상 경과"), (_fill(theme=1), "1년 이상 경과"), (_fill(theme=4), "미지정"),
+            (_fill(rgb="FFE2EFDA"), "최신"), (_fill(rgb="ffddebf7"), "1년 경과"),
+            (_fill(rgb="FFFDEDEC"), "1년 이상 경과"), (_fill(rgb="FF123456"), "미지정"),
+            (PatternFill(), "1년 이상 경과"), (None, "미지정"),
+        ]
+        for fill, expected in cases:
+            self.assertEqual(search_logic.get_status_from_color(fill), expected, fill)
+
+
+class FillStatusCacheTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_colors_are_read_as_statuses(self):
+        companies, _ = search_logic.parse_workbook(self.workbook_path, streaming=True)
+        seen = {comp.status('시평') for comp in companies}
+        self.assertTrue({"최신", "1년 경과", "1년 이상 경과"} <= seen)
+
+    def test_cache_matches_per_cell_lookup(self):
+        workbook = load_workbook(self.workbook_path)
+        cache = search_logic.FillStatusCache(workbook)
+        checked = 0
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(max_row=40):
+                for cell in row:
+                    expected = STATUS_CODES[search_logic.get_status_from_color(cell.fill)]
+                    self.assertEqual(cache.status_of_cell(cell), expected, cell.coordinate)
+                    checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_read_only_cells_match_normal_cells(self):
+        normal = load_workbook(self.workbook_path)
+        read_only = load_workbook(self.workbook_path, read_only=True)
+        try:
+            normal_cache = search_logic.FillStatusCache(normal)
+            read_only_cache = search_logic.FillStatusCache(read_only)
+            sheet_name = normal.sheetnames[0]
+            normal_rows = normal[sheet_name].iter_rows(max_row=40)
+            read_only_rows = read_only[sheet_name].iter_rows(max_row=40)
+            for normal_row, read_only_row in zip(normal_rows, read_only_rows):
+                for normal_cell, read_only_cell in zip(normal_row, read_only_row):
+                    self.assertEqual(read_only_cache.status_of_read_only_cell(read_only_cell),
+                                     normal_cache.status_of_cell(normal_cell), normal_cell.coordinate)
+        finally:
+            read_only.close()
+
+    def test_each_fill_is_resolved_once(self):
+        workbook = load_workbook(self.workbook_path)
+        cache = search_logic.FillStatusCache(workbook)
+        with mock.patch.object(search_logic, 'get_status_from_color',
+                               wraps=search_logic.get_status_from_color) as lookup:
+            for sheet in workbook.worksheets:
+                for row in sheet.iter_rows():
+                    for cell in row:
+                        cache.status_of_cell(cell)
+        self.assertLessEqual(lookup.call_count, len(workbook._fills))
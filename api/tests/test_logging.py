@@ -0,0 +1,132 @@
+# test_logging.py
+"""큐 기반 JSON 로깅 (logging_utils.py, settings.LOGGING)"""
+
+import json
+import logging
+import logging.config
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import date
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .. import calculation_logic, search_logic
+from ..logging_utils import JsonFormatter, QueueListenerHandler
+
+
+class _ListHandler(logging.Handler):
+    """받은 레코드와 그 레코드를 기록한 스레드를 모아 두는 핸들러"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+
+def _record(msg, *args, exc_info=None, **extra):
+    record = logging.LogRecord('api.test', logging.ERROR, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+class JsonFormatterTests(SimpleTestCase):
+
+    def test_message_and_extra_fields(self):
+        entry = json.loads(JsonFormatter().format(_record("'%s' 시트 오류 %d건", '서울', 2, sheet='서울', when=date(2024, 6, 1))))
+        self.assertEqual(entry["level"], "ERROR")
+        self.assertEqual(entry["logger"], "api.test")
+        self.assertEqual(entry["message"], "'서울' 시트 오류 2건")
+        self.assertEqual(entry["sheet"], "서울")
+        # JSON 으로 바꿀 수 없는 값은 문자열로 남깁니다.
+        self.assertEqual(entry["when"], "2024-06-01")
+        self.assertNotIn("args", entry)
+        self.assertNotIn("exc_info", entry)
+
+    def test_one_line_with_exception(self):
+        try:
+            raise ValueError("잘못된 값")
+        except ValueError:
+            line = JsonFormatter().format(_record("실패", exc_info=sys.exc_info()))
+        self.assertNotIn("\n", line)
+        self.assertIn("잘못된 값", line)
+        self.assertIn("ValueError: 잘못된 값", json.loads(line)["exc_info"])
+
+
+class QueueListenerHandlerTests(SimpleTestCase):
+
+    def test_records_are_written_by_listener_thread(self):
+        target = _ListHandler()
+        handler = QueueListenerHandler([target])
+        self.addCleanup(handler.close)
+        for number in range(50):
+            handler.handle(_record("기록 %d", number))
+        handler.stop()
+        self.assertEqual([record.getMessage() for record in target.records], [f"기록 {n}" for n in range(50)])
+        self.assertTrue(all(thread is not threading.current_thread() for thread in target.threads))
+        # 두 번 멈춰도 괜찮습니다.
+        handler.stop()
+
+    def test_unresolved_handler_reference(self):
+        with self.assertRaises(ValueError):
+            QueueListenerHandler(['cfg://handlers.file'])
+
+    def test_dict_config_writes_json_lines(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        log_path = os.path.join(tmp_dir, 'test.log')
+        config = {
+            'version': 1,
+            'disable_existing_loggers': False,
+            'formatters': {'json': {'()': 'api.logging_utils.JsonFormatter'}},
+            'handlers': {
+                'file': {'class': 'logging.FileHandler', 'filename': log_path, 'encoding': 'utf-8',
+                         'delay': True, 'formatter': 'json'},
+                'queue': {'()': 'api.logging_utils.QueueListenerHandler', 'handlers': ['cfg://handlers.file']},
+            },
+            'loggers': {'api.logging_test': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False}},
+        }
+        logging.config.dictConfig(config)
+        logger = logging.getLogger('api.logging_test')
+        self.addCleanup(logger.handlers.clear)
+        logger.info("첫 줄", extra={"file_type": "eung"})
+        logger.debug("남지 않음")
+        logger.warning("둘째 줄")
+        for handler in logger.handlers:
+            handler.close()
+
+        with open(log_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([(entry["level"], entry["message"]) for entry in entries], [("INFO", "첫 줄"), ("WARNING", "둘째 줄")])
+        self.assertEqual(entries[0]["file_type"], "eung")
+
+    def test_settings_log_file_is_absolute(self):
+        self.assertTrue(os.path.isabs(settings.LOGGING['handlers']['file']['filename']))
+
+
+class ApiLoggingTests(SimpleTestCase):
+
+    def test_sheet_errors_are_one_record(self):
+        errors = [(col, ValueError(f"오류{col}")) for col in range(1, 8)]
+        with self.assertLogs('api.search_logic', 'ERROR') as logs:
+            search_logic.log_sheet_errors('서울', errors)
+            search_logic.log_sheet_errors('경기', [])
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.getMessage(), "'서울' 시트 데이터 처리 중 오류 7건")
+        self.assertEqual(record.error_count, 7)
+        self.assertEqual(record.errors, [f"{col}열: 오류{col}" for col in range(1, search_logic.ERROR_SAMPLES_PER_SHEET + 1)])
+
+    def test_unknown_rule_is_a_warning(self):
+        with self.assertLogs('api.calculation_logic', 'WARNING') as logs:
+            result = calculation_logic.calculate_consortium(
+                [], {"estimation_price": 1}, date(2024, 6, 1), ("행안부", "없는규칙"), {}, "전체")
+        self.assertIsNone(result)
+        self.assertEqual(logs.records[0].levelname, "WARNING")
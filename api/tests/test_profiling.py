@@ -0,0 +1,96 @@
+# test_profiling.py
+"""요청 단위 프로파일링 (?profile=1 / X-Profile 헤더, staff 전용)"""
+
+import os
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .. import profiling
+from .base import MediaFixtureMixin
+
+SHARE_RANGE_BODY = {
+    "companies": [{"data": {"검색된 회사": "A", "시평": "3000000000"}, "share": 60},
+                  {"data": {"검색된 회사": "B", "시평": "2000000000"}, "share": 40}],
+    "tuchal_amount": 2000000000,
+}
+
+
+class ProfilingTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_login(self.staff)
+
+    def _saved_profiles(self):
+        profile_dir = profiling.get_profile_dir()
+        if not os.path.isdir(profile_dir):
+            return []
+        return sorted(name for name in os.listdir(profile_dir) if name.endswith(profiling.PROFILE_SUFFIX))
+
+    def test_staff_search_is_profiled_and_listed(self):
+        response = self.client.get('/api/search/', {'file_type': 'eung', 'profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile-Id']
+        self.assertEqual(self._saved_profiles(), [name + profiling.PROFILE_SUFFIX])
+
+        listed = self.client.get('/api/profiles/').json()
+        self.assertEqual(listed[0]["name"], name)
+        self.assertEqual(listed[0]["view"], "CompanySearchView")
+        self.assertEqual(listed[0]["user"], "staff")
+
+        detail = self.client.get(f'/api/profiles/{name}/', {'sort': 'cumulative'})
+        self.assertEqual(detail.status_code, 200)
+        # 첫 요청이므로 파싱도 요청 스레드에서 실행되어 프로파일에 잡힙니다.
+        self.assertIn('parse_workbook', detail.json()["stats"])
+        self.assertEqual(self.client.get(f'/api/profiles/{name}/', {'sort': 'bogus'}).json()["sort"], 'cumulative')
+
+    def test_post_views_are_profiled_with_header(self):
+        response = self.client.post('/api/consortium/share_range/', SHARE_RANGE_BODY, format='json',
+                                    HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ShareRangeView_post', response['X-Profile-Id'])
+        for url in ('/api/consortium/sweep/', '/api/consortium/simulate/', '/api/recommend/'):
+            response = self.client.post(url + '?profile=1', {}, format='json')
+            self.assertTrue(response.has_header('X-Profile-Id'), url)
+
+    def test_without_flag_or_staff_nothing_is_saved(self):
+        self.assertFalse(self.client.get('/api/search/', {'file_type': 'eung'}).has_header('X-Profile-Id'))
+
+        user = User.objects.create_user('user', password='pw')
+        client = APIClient()
+        client.force_login(user)
+        self.assertFalse(client.get('/api/search/', {'file_type': 'eung', 'profile': '1'}).has_header('X-Profile-Id'))
+        self.assertEqual(client.get('/api/profiles/').status_code, 403)
+        self.assertEqual(APIClient().get('/api/profiles/').status_code, 403)
+        self.assertEqual(self._saved_profiles(), [])
+
+    def test_unknown_profile_is_404(self):
+        self.assertEqual(self.client.get('/api/profiles/nope/').status_code, 404)
+        self.assertEqual(self.client.get('/api/profiles/..%5Cx/').status_code, 404)
+
+    @override_settings(PROFILE_MAX_FILES=2)
+    def test_old_profiles_are_pruned(self):
+        for _ in range(3):
+            self.client.get('/api/search/', {'file_type': 'eung', 'profile': '1'})
+        self.assertEqual(len(self._saved_profiles()), 2)
+
+    async def test_async_search_records_worker_threads(self):
+        await self.async_client.aforce_login(self.staff)
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'profile': 'yes'})
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile-Id']
+        self.assertIn('company_search_get', name)
+        summary = profiling.summarize_profile(name, top=5000)
+        # 파싱과 필터링 모두 스레드에서 실행되지만 하나의 프로파일로 합쳐집니다.
+        self.assertIn('parse_workbook', summary)
+        self.assertIn('search_dataset', summary)
+
+    async def test_async_view_needs_staff(self):
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('X-Profile-Id'))
@@ -0,0 +1,137 @@
+# test_query_cache.py
+"""타이핑 중 검색 결과 재사용 (query_cache.py) 과 업체명 자동완성 (/api/autocomplete/)"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import dataset_cache, query_cache, search_logic
+from ..indexes import PrefixIndex
+from ..records import normalize_company_name
+from .base import MediaFixtureMixin
+
+
+class NarrowsTests(SimpleTestCase):
+
+    def test_narrowing_filters(self):
+        cases = [
+            ({'name': '가상1'}, {'name': '가상'}, True),
+            ({'name': '가상'}, {'name': '가상1'}, False),
+            ({'name': 'ABC전기'}, {'name': 'abc'}, True),
+            ({'region': '서울'}, {}, True),
+            ({}, {'region': '서울'}, False),
+            ({'region': '경기'}, {'region': '서울'}, False),
+            ({'region': ' 서울 '}, {'region': '서울'}, True),
+            ({'status': ['최신']}, {'status': ['최신', '1년 경과']}, True),
+            ({'status': ['미지정']}, {'status': ['최신']}, False),
+            ({}, {'status': ['최신']}, False),
+            ({'min_sipyung': 20}, {'min_sipyung': 10}, True),
+            ({'min_sipyung': 5}, {'min_sipyung': 10}, False),
+            ({'max_5y': 5}, {'max_5y': 10}, True),
+            ({}, {'max_5y': 10}, False),
+            ({'credit_valid_on': 1}, {'credit_valid_on': 2}, False),
+            ({'credit_valid_on': 1, 'name': '가나'}, {'credit_valid_on': 1, 'name': '가'}, True),
+        ]
+        for new, old, expected in cases:
+            self.assertEqual(query_cache.narrows(new, old), expected, (new, old))
+
+    def test_prefix_index_matches_brute_force(self):
+        keys = ['가나', '가다', '가나다', None, '나가', '가', '가나']
+        index = PrefixIndex(keys)
+        self.assertEqual(index.search('가나', 10), [0, 6, 2])
+        self.assertEqual(index.search('가나', 2), [0, 6])
+        self.assertEqual(index.search('가', 10, accept=lambda pos: pos != 0), [5, 6, 2, 1])
+        self.assertEqual(index.search('', 10), [])
+
+
+class QueryCacheTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+        self.full_search = mock.patch.object(search_logic, 'search_dataset', wraps=search_logic.search_dataset).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _typing(self, client, dataset, sequence):
+        for filters in sequence:
+            results = query_cache.search(client, dataset, filters)
+            self.assertEqual(results, search_logic.filter_companies(dataset.companies, filters), filters)
+
+    def test_refinements_reuse_previous_results(self):
+        sequence = [{'name': '가'}, {'name': '가상'}, {'name': '가상1'},
+                    {'name': '가상1', 'min_sipyung': 1000000000}, {'name': '가상1', 'status': ['최신']}]
+        self._typing('a', self.dataset, sequence)
+        self.assertEqual(self.full_search.call_count, 1)
+
+        # 좁히지 않는 검색(지운 글자)은 다시 전체에서 찾습니다.
+        self._typing('a', self.dataset, [{'name': '나'}])
+        self.assertEqual(self.full_search.call_count, 2)
+
+    def test_clients_do_not_share_results(self):
+        self._typing('a', self.dataset, [{'name': '가상'}])
+        self._typing('b', self.dataset, [{'name': '가상1'}])
+        self.assertEqual(self.full_search.call_count, 2)
+
+    def test_replaced_dataset_is_not_reused(self):
+        self._typing('a', self.dataset, [{'name': '가상'}])
+        self.install_fixture('eung', source=self.generate('changed.xlsx', company_count=40, seed=5))
+        replaced = self.fixture_dataset()
+        self.assertNotEqual(replaced.serial, self.dataset.serial)
+        self._typing('a', replaced, [{'name': '가상1'}])
+        self.assertEqual(self.full_search.call_count, 2)
+
+    def test_region_dataset_is_not_mixed_with_full_dataset(self):
+        self.reset_caches()
+        region_dataset = dataset_cache.get_dataset(self.path, '서울')
+        self._typing('a', region_dataset, [{'name': '가상', 'region': '서울'}])
+        full = self.fixture_dataset()
+        self._typing('a', full, [{'name': '가상1', 'region': '서울'}])
+        self.assertEqual(self.full_search.call_count, 2)
+
+    @override_settings(SEARCH_REFINE_TTL=0)
+    def test_expired_results_are_not_reused(self):
+        self._typing('a', self.dataset, [{'name': '가상'}, {'name': '가상1'}])
+        self.assertEqual(self.full_search.call_count, 2)
+
+    def test_typing_through_search_endpoint(self):
+        for name in ('가', '가상', '가상1', '가상11'):
+            response = self.client.get('/api/search/', {'file_type': 'eung', 'name': name})
+            expected = search_logic.filter_companies(self.dataset.companies, {'name': name})
+            self.assertEqual([row['검색된 회사'] for row in response.json()], [comp.name for comp in expected], name)
+        self.assertEqual(self.full_search.call_count, 1)
+
+
+class AutocompleteTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.companies = self.fixture_dataset().companies
+
+    def _names(self, params):
+        response = self.client.get('/api/autocomplete/', dict({'file_type': 'eung'}, **params))
+        self.assertEqual(response.status_code, 200)
+        return [row['업체명'] for row in response.json()]
+
+    def _expected(self, prefix, limit, region=None):
+        matches = sorted((normalize_company_name(comp.name), comp.name) for comp in self.companies
+                         if normalize_company_name(comp.name).startswith(prefix)
+                         and (region is None or comp.region == region))
+        return [name for _, name in matches[:limit]]
+
+    def test_prefix_matches_in_name_order(self):
+        self.assertEqual(self._names({'q': '가상1'}), self._expected('가상1', 10))
+        self.assertEqual(self._names({'q': '㈜ 가상1', 'limit': '3'}), self._expected('가상1', 3))
+        self.assertEqual(len(self._names({'q': '가상', 'limit': '500'})), 50)
+
+    def test_region_limits_candidates(self):
+        region = self.companies[0].region
+        self.assertEqual(self._names({'q': '가상', 'region': region, 'limit': 50}), self._expected('가상', 50, region))
+
+    def test_empty_or_bad_params(self):
+        self.assertEqual(self._names({}), [])
+        self.assertEqual(self._names({'q': '㈜ '}), [])
+        self.assertEqual(self._names({'q': '가상', 'limit': 'abc'}), self._expected('가상', 10))
+        self.assertEqual(self._names({'q': '없는업체'}), [])
+        self.assertEqual(self._names({'q': '가상', 'file_type': 'sobang'}), [])
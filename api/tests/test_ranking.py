@@ -0,0 +1,99 @@
+# test_ranking.py
+"""서버 쪽 정렬과 상위 N 개 (ranking.py, /api/search/?sort=&order=&top=)"""
+
+import math
+from datetime import date
+
+from django.test import TestCase
+
+from .. import ranking, recommend
+from .base import MediaFixtureMixin
+
+
+def _brute_force(companies, values, descending, top=None):
+    present = [(value, pos) for pos, value in enumerate(values) if not math.isnan(value)]
+    present.sort(key=lambda item: -item[0] if descending else item[0])
+    ordered = [pos for _, pos in present] + [pos for pos, value in enumerate(values) if math.isnan(value)]
+    ordered = ordered if top is None else ordered[:top]
+    return [companies[pos].name for pos in ordered]
+
+
+class SortResultsTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+
+    def test_matches_brute_force(self):
+        companies = self.dataset.companies
+        # 결과가 크면 미리 정렬된 순서를, 작으면 heapq 를 씁니다. 두 경로 모두 같은 결과여야 합니다.
+        subsets = {'all': list(range(len(companies))), 'small': list(range(0, len(companies), 9))}
+        for field in ('시평', '3년 실적', '부채비율', '유동비율'):
+            column = ranking.get_sort_column(self.dataset, field)
+            for name, positions in subsets.items():
+                results = [companies[pos] for pos in positions]
+                values = [column.values[pos] for pos in positions]
+                for descending in (True, False):
+                    for top in (None, 0, 1, 7, 1000):
+                        got = [comp.name for comp in ranking.sort_results(self.dataset, results, column, descending, top)]
+                        self.assertEqual(got, _brute_force(results, values, descending, top),
+                                         (field, name, descending, top))
+
+    def test_sort_column_is_cached(self):
+        self.assertIs(ranking.get_sort_column(self.dataset, '시평'), ranking.get_sort_column(self.dataset, '시평'))
+
+    def test_resolve_sort_field(self):
+        self.assertEqual(ranking.resolve_sort_field('sipyung'), '시평')
+        self.assertEqual(ranking.resolve_sort_field('5년 실적'), '5년 실적')
+        with self.assertRaisesMessage(ValueError, "정렬할 수 없는 항목입니다: 이름"):
+            ranking.resolve_sort_field('이름')
+
+
+class SortedSearchViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+
+    def _names(self, params):
+        response = self.client.get('/api/search/', dict({'file_type': 'eung'}, **params))
+        self.assertEqual(response.status_code, 200, params)
+        return [row['검색된 회사'] for row in response.json()]
+
+    def test_sort_and_top(self):
+        companies = self.dataset.companies
+        values = ranking.get_sort_column(self.dataset, '시평').values
+        self.assertEqual(self._names({'sort': 'sipyung', 'top': '5'}), _brute_force(companies, values, True, 5))
+        self.assertEqual(self._names({'sort': '시평', 'order': 'asc'}), _brute_force(companies, values, False))
+        self.assertEqual(self._names({'top': '3'}), [comp.name for comp in companies[:3]])
+        self.assertEqual(self._names({'sort': 'sipyung', 'top': '0'}), [])
+
+    def test_sort_with_filters(self):
+        region = self.dataset.companies[0].region
+        names = self._names({'region': region, 'sort': '5y', 'top': '4'})
+        in_region = [comp for comp in self.dataset.companies if comp.region == region]
+        column = ranking.get_sort_column(self.dataset, '5년 실적')
+        values = [column.values[self.dataset.companies.index(comp)] for comp in in_region]
+        self.assertEqual(names, _brute_force(in_region, values, True, 4))
+
+    def test_score_sort_uses_rule_and_date(self):
+        matrix = recommend.get_feature_matrix(self.dataset, '전기', ('조달청', '50억미만'), date(2024, 6, 1))
+        scores = matrix.raw[:, recommend.FEATURE_NAMES.index("경영점수")].tolist()
+        names = self._names({'sort': 'score', 'rule': '조달청/50억미만', 'announcement_date': '2024-06-01', 'top': '10'})
+        self.assertEqual(names, _brute_force(self.dataset.companies, scores, True, 10))
+
+    def test_invalid_params(self):
+        cases = [
+            ({'sort': '이름'}, "정렬할 수 없는 항목입니다: 이름"),
+            ({'top': '-1'}, "top 은 0 이상의 정수여야 합니다."),
+            ({'top': 'abc'}, "top 은 0 이상의 정수여야 합니다."),
+            ({'sort': 'sipyung', 'order': 'up'}, "order 는 asc 또는 desc 입니다."),
+            ({'sort': 'score', 'announcement_date': '2024/06/01'}, "announcement_date 는 YYYY-MM-DD 형식이어야 합니다."),
+            ({'sort': 'score', 'rule': '행안부/없는규칙'}, "알 수 없는 규칙입니다"),
+        ]
+        for params, message in cases:
+            response = self.client.get('/api/search/', dict({'file_type': 'eung'}, **params))
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(message, response.json()["error"])
@@ -0,0 +1,105 @@
+# test_recommend.py
+"""파트너 후보 추천 (recommend.py, /api/recommend/)"""
+
+from datetime import date
+
+import numpy as np
+from django.test import TestCase
+
+from .. import recommend
+from ..records import STATUS_LATEST
+from .base import MediaFixtureMixin
+
+
+class RecommendTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.dataset = self.fixture_dataset()
+        self.matrix = recommend.get_feature_matrix(self.dataset, '전기', recommend.DEFAULT_RULE, date(2024, 6, 1))
+
+    def _brute_force(self, lead, k, region=None, latest_only=True, target=None, weights=recommend.DEFAULT_WEIGHTS):
+        target = self.matrix.normalize(self.matrix.raw[lead] if target is None else target)
+        scored = []
+        for pos, comp in enumerate(self.dataset.companies):
+            if pos == lead or (region and comp.region != region) or (latest_only and comp.summary != STATUS_LATEST):
+                continue
+            diff = self.matrix.normalized[pos] - target
+            scored.append((float(np.sqrt((diff * diff) @ weights)), pos))
+        return [pos for _, pos in sorted(scored)[:k]]
+
+    def test_matches_brute_force(self):
+        for lead in (0, 17, 59):
+            for region, latest_only in ((None, False), (None, True), (self.dataset.companies[lead].region, False)):
+                matches = recommend.recommend(self.dataset, self.matrix, lead, k=7, region=region, latest_only=latest_only)
+                self.assertEqual([pos for pos, _ in matches],
+                                 self._brute_force(lead, 7, region, latest_only), (lead, region, latest_only))
+                distances = [distance for _, distance in matches]
+                self.assertEqual(distances, sorted(distances))
+
+    def test_complement_targets_the_shortfall(self):
+        lead = 3
+        need = self.matrix.raw[lead, 0] + 5e9
+        matches = recommend.recommend(self.dataset, self.matrix, lead, k=5, latest_only=False, complement={"시평": need})
+        target = self.matrix.raw[lead].copy()
+        target[0] = 5e9
+        self.assertEqual([pos for pos, _ in matches], self._brute_force(lead, 5, latest_only=False, target=target))
+
+    def test_feature_matrix_is_cached_per_rule_and_date(self):
+        again = recommend.get_feature_matrix(self.dataset, '전기', recommend.DEFAULT_RULE, date(2024, 6, 1))
+        self.assertIs(again, self.matrix)
+        other = recommend.get_feature_matrix(self.dataset, '전기', recommend.DEFAULT_RULE, date(2024, 6, 2))
+        self.assertIsNot(other, self.matrix)
+
+    def test_no_candidates(self):
+        self.assertEqual(recommend.recommend(self.dataset, self.matrix, 0, region='없는지역'), [])
+
+
+class RecommendViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.lead = self.fixture_dataset().companies[0]
+
+    def _post(self, body):
+        return self.client.post('/api/recommend/', body, content_type='application/json')
+
+    def test_recommend_same_region_latest_partners(self):
+        response = self._post({'file_type': 'eung', 'lead': self.lead.value('사업자번호'), 'k': 3,
+                               'announcement_date': '2024-06-01'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["lead"]["검색된 회사"], self.lead.name)
+        self.assertEqual(data["rule"], list(recommend.DEFAULT_RULE))
+        self.assertLessEqual(len(data["results"]), 3)
+        for item in data["results"]:
+            self.assertEqual(item["company"]["대표지역"], self.lead.region)
+            self.assertEqual(item["company"]["요약상태"], "최신")
+            self.assertEqual(set(item["특성"]), set(recommend.FEATURE_NAMES))
+        distances = [item["distance"] for item in data["results"]]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_lead_by_name_and_all_regions(self):
+        response = self._post({'lead_name': self.lead.name, 'region': '전체', 'latest_only': False, 'k': 200})
+        self.assertEqual(response.status_code, 200)
+        # 후보는 119곳이지만 k 는 최대 100 입니다.
+        self.assertEqual(len(response.json()["results"]), 100)
+
+    def test_invalid_requests(self):
+        lead = self.lead.value('사업자번호')
+        cases = [
+            ({'file_type': 'other', 'lead': lead}, 400),
+            ({'lead': lead, 'rule': ['행안부', '없는규칙']}, 400),
+            ({'lead': lead, 'announcement_date': '2024/06/01'}, 400),
+            ({'lead': lead, 'k': 'abc'}, 400),
+            ({'lead': lead, 'min_business_score': 'x'}, 400),
+            ({'lead': lead, 'weights': {'시평': 'x'}}, 400),
+            ({'lead': lead, 'complement': ['시평']}, 400),
+            ({'lead': '000-00-00000'}, 404),
+            ({}, 404),
+            ({'file_type': 'sobang', 'lead': lead}, 404),
+        ]
+        for body, expected in cases:
+            self.assertEqual(self._post(body).status_code, expected, body)
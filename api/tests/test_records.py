@@ -0,0 +1,79 @@
+# test_records.py
+"""작은 업체 레코드 (records.CompanyRecord) 와 응답 형태"""
+
+import itertools
+import pickle
+
+from django.test import SimpleTestCase, TestCase
+
+from .. import records, search_logic
+from ..records import FIELDS, STATUS_CODES, STATUS_LABELS, CompanyRecord
+from .base import MediaFixtureMixin
+
+
+def _record(statuses=None, region='서울', **values):
+    codes = [STATUS_CODES[statuses.get(field, '미지정')] if statuses else 0 for field in FIELDS]
+    return CompanyRecord('㈜가나전기', region, [values.get(field, '') for field in FIELDS], codes)
+
+
+class CompanyRecordTests(SimpleTestCase):
+
+    def test_summary_matches_legacy_rule(self):
+        # 기준 세 항목의 모든 상태 조합에서 기존 get_summary_status 와 같아야 합니다.
+        for combo in itertools.product(STATUS_LABELS, repeat=3):
+            statuses = dict(zip(('시평', '3년 실적', '5년 실적'), combo))
+            record = _record(statuses)
+            self.assertEqual(record.summary_status, search_logic.get_summary_status(statuses), combo)
+
+    def test_to_dict_keeps_response_shape(self):
+        record = _record({'시평': '최신', '3년 실적': '최신', '5년 실적': '1년 경과', '비고': 'N/A'},
+                         시평=3000000000, 비고='홍길동')
+        data = record.to_dict()
+        self.assertEqual(list(data), ['검색된 회사', '대표지역', *FIELDS, '데이터상태', '요약상태'])
+        self.assertEqual(data['검색된 회사'], '㈜가나전기')
+        self.assertEqual(data['시평'], 3000000000)
+        self.assertEqual(data['데이터상태']['비고'], 'N/A')
+        self.assertEqual(data['데이터상태']['대표자'], '미지정')
+        self.assertEqual(data['요약상태'], '1년 경과')
+        self.assertEqual(record.value('비고'), '홍길동')
+        self.assertEqual(record.status('5년 실적'), '1년 경과')
+
+    def test_repeated_strings_are_shared(self):
+        first = _record(region=''.join(['서', '울']), 비고=''.join(['홍', '길동']), 대표자=''.join(['대', '표']))
+        second = _record(region=''.join(['서', '울']), 비고=''.join(['홍', '길동']), 대표자=''.join(['대', '표']))
+        self.assertIs(first.region, second.region)
+        self.assertIs(first.value('비고'), second.value('비고'))
+        # 업체마다 다른 값(대표자 등)은 intern 하지 않습니다.
+        self.assertIsNot(first.value('대표자'), second.value('대표자'))
+
+    def test_unpickled_record_is_reinterned(self):
+        record = _record(비고='홍길동')
+        copy = pickle.loads(pickle.dumps(record))
+        copy.intern_strings()
+        self.assertIs(copy.value('비고'), record.value('비고'))
+        self.assertIs(copy.region, record.region)
+        self.assertEqual(copy.to_dict(), record.to_dict())
+
+    def test_records_have_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            _record().extra = 1
+
+    def test_normalizers(self):
+        self.assertEqual(records.normalize_biz_no('144-86-02239'), '1448602239')
+        self.assertEqual(records.normalize_biz_no(None), '')
+        self.assertEqual(records.normalize_company_name('㈜ 거성 전력'), '거성전력')
+        self.assertEqual(records.normalize_company_name('주식회사 ABC'), 'abc')
+
+
+class SearchResponseShapeTests(MediaFixtureMixin, TestCase):
+
+    def test_search_rows_keep_legacy_keys(self):
+        self.install_fixture('eung')
+        response = self.client.get('/api/search/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertEqual(len(rows), len(self.fixture_dataset()))
+        for row in rows:
+            self.assertEqual(row['업체명'], row['검색된 회사'])
+            self.assertEqual(set(row['데이터상태']), set(FIELDS))
+            self.assertEqual(row['요약상태'], search_logic.get_summary_status(row['데이터상태']))
@@ -0,0 +1,71 @@
+# test_regions.py
+"""지역 검색 시 그 지역 시트만 읽기 (dataset_cache 의 지역 데이터셋)"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from .. import benchmark, dataset_cache, search_logic
+from .base import MediaFixtureMixin, WorkbookFixtureMixin, record_tuples
+
+
+class SheetSubsetTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_sheet_subset_matches_full_parse(self):
+        full, _ = search_logic.parse_workbook(self.workbook_path, streaming=False)
+        subset, sheet_names = search_logic.parse_workbook(self.workbook_path, sheet_names=['경기', ' 서울 '])
+        self.assertEqual(sheet_names, benchmark.REGIONS)
+        expected = [comp for comp in full if comp.region in ('서울', '경기')]
+        self.assertEqual(sorted(record_tuples(subset)), sorted(record_tuples(expected)))
+
+
+class RegionLoadTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.install_fixture('eung')
+        self.parse = mock.patch.object(search_logic, 'parse_workbook', wraps=search_logic.parse_workbook).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _parsed_sheets(self):
+        return [call.kwargs.get('sheet_names') for call in self.parse.call_args_list]
+
+    def test_region_search_reads_only_that_sheet(self):
+        response = self.client.get('/api/search/', {'file_type': 'eung', 'region': '경기'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json())
+        self.assertTrue(all(row['대표지역'] == '경기' for row in response.json()))
+        self.assertEqual(self._parsed_sheets(), [['경기']])
+        self.assertIsNone(dataset_cache.get_cached_dataset(self.path))
+
+        # 같은 지역은 다시 읽지 않습니다.
+        self.client.get('/api/search/', {'file_type': 'eung', 'region': ' 경기 '})
+        self.assertEqual(len(self.parse.call_args_list), 1)
+
+    def test_full_load_reuses_loaded_regions(self):
+        seoul = dataset_cache.get_dataset(self.path, '서울')
+        dataset_cache.get_dataset(self.path, '경기')
+        full = dataset_cache.get_dataset(self.path)
+        missing = self._parsed_sheets()[-1]
+        self.assertEqual(missing, [name for name in benchmark.REGIONS if name not in ('서울', '경기')])
+
+        # 시트 순서와 업체 순서는 한 번에 읽은 것과 같아야 합니다.
+        expected, sheet_names = search_logic.parse_workbook(self.path)
+        self.assertEqual(full.sheet_names, sheet_names)
+        self.assertEqual(record_tuples(full.companies), record_tuples(expected))
+        self.assertTrue(set(map(id, seoul.companies)) <= set(map(id, full.companies)))
+
+        # 전체 데이터셋이 생기면 지역 요청도 전체 데이터셋에서 답합니다.
+        self.assertIs(dataset_cache.get_dataset(self.path, '부산'), full)
+
+    def test_unknown_region_returns_empty(self):
+        response = self.client.get('/api/search/', {'file_type': 'eung', 'region': '없는지역'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_region_datasets_are_dropped_when_file_changes(self):
+        dataset_cache.get_dataset(self.path, '서울')
+        self.install_fixture('eung', source=self.generate('changed.xlsx', company_count=40, seed=5))
+        changed = dataset_cache.get_dataset(self.path, '서울')
+        expected, _ = search_logic.parse_workbook(self.path, sheet_names=['서울'])
+        self.assertEqual(record_tuples(changed.companies), record_tuples(expected))
@@ -0,0 +1,105 @@
+# test_share_range.py
+"""지분율 가능 범위 계산 (calculation_logic.solve_share_ranges, /api/consortium/share_range/)"""
+
+import itertools
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from .. import calculation_logic
+from .base import MediaFixtureMixin
+
+
+def _share_ranges_brute_force(sipyungs, tuchal_amount, required, min_share, step=1.0):
+    """step% 간격의 모든 지분 배분을 훑어 업체별 가능한 (최소, 최대) 지분율을 구합니다. 불가능하면 None."""
+    caps = [min(100.0, s / tuchal_amount * 100) if tuchal_amount > 0 else 100.0 for s in sipyungs]
+    grid = [k * step for k in range(int(100 / step) + 1)]
+    lows, highs = [None] * len(sipyungs), [None] * len(sipyungs)
+    for head in itertools.product(grid, repeat=len(sipyungs) - 1):
+        shares = list(head) + [100.0 - sum(head)]
+        if any(share < min_share - 1e-9 or share > cap + 1e-9 for share, cap in zip(shares, caps)):
+            continue
+        if required is not None and sum(s * share / 100 for s, share in zip(sipyungs, shares)) < required - 1e-6:
+            continue
+        for idx, share in enumerate(shares):
+            lows[idx] = share if lows[idx] is None else min(lows[idx], share)
+            highs[idx] = share if highs[idx] is None else max(highs[idx], share)
+    if lows[0] is None:
+        return None
+    return list(zip(lows, highs))
+
+
+class ShareRangeTests(SimpleTestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(4)
+        for _ in range(40):
+            sipyungs = [rng.choice([1, 2, 3, 4, 5, 6, 8, 10]) * 100000000 for _ in range(rng.choice([2, 3]))]
+            tuchal_amount = rng.choice([0, 500000000, 1000000000])
+            required = rng.choice([None, 300000000, 500000000])
+            min_share = rng.choice([0, 10])
+            members = [{"data": {"시평": str(s)}, "share": None, "name": str(idx)} for idx, s in enumerate(sipyungs)]
+            sipyung_info = {"is_limited": required is not None, "limit_amount": required or 0, "method": "비율제"}
+
+            result = calculation_logic.solve_share_ranges(members, tuchal_amount, sipyung_info, min_share)
+            expected = _share_ranges_brute_force(sipyungs, tuchal_amount, required, min_share)
+            case = (sipyungs, tuchal_amount, required, min_share)
+            if expected is None:
+                self.assertFalse(result["feasible"], case)
+                continue
+            self.assertTrue(result["feasible"], case)
+            for row, (low, high) in zip(result["companies"], expected):
+                # 격자 간격(1%) 만큼의 차이는 허용합니다.
+                self.assertLessEqual(abs(row["min_share"] - low), 1.01, case)
+                self.assertLessEqual(abs(row["max_share"] - high), 1.01, case)
+
+    def test_sum_method_shortfall_is_infeasible(self):
+        members = [{"data": {"시평": "100000000"}, "share": None, "name": "a"},
+                   {"data": {"시평": "200000000"}, "share": None, "name": "b"}]
+        sipyung_info = {"is_limited": True, "limit_amount": 500000000, "method": "합산제"}
+        result = calculation_logic.solve_share_ranges(members, 0, sipyung_info)
+        self.assertFalse(result["feasible"])
+
+
+class ShareRangeViewTests(MediaFixtureMixin, TestCase):
+
+    def _post(self, body):
+        return self.client.post('/api/consortium/share_range/', body, content_type='application/json')
+
+    def test_data_members_match_solver(self):
+        companies = [{"data": {"검색된 회사": "A", "시평": "3000000000"}, "share": 60},
+                     {"data": {"검색된 회사": "B", "시평": "2000000000"}, "share": 40}]
+        sipyung = {"is_limited": True, "limit_amount": 2500000000, "method": "비율제"}
+        response = self._post({"companies": companies, "tuchal_amount": 4000000000, "sipyung": sipyung, "min_share": 10})
+        self.assertEqual(response.status_code, 200)
+        members = [{"data": comp["data"], "share": comp["share"], "name": comp["data"]["검색된 회사"]}
+                   for comp in companies]
+        self.assertEqual(response.json(), calculation_logic.solve_share_ranges(members, 4000000000.0, sipyung, 10.0))
+        self.assertTrue(response.json()["feasible"])
+
+    def test_biz_no_members_are_resolved(self):
+        self.install_fixture('eung')
+        first, second = self.fixture_dataset().companies[:2]
+        response = self._post({"companies": [{"biz_no": first.value('사업자번호')}, {"biz_no": second.value('사업자번호')}],
+                               "tuchal_amount": 1000000000})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["name"] for row in response.json()["companies"]], [first.name, second.name])
+
+    def test_invalid_requests(self):
+        member = {"data": {"시평": "100"}, "share": 50}
+        cases = [
+            {},
+            {"companies": []},
+            {"companies": "A"},
+            {"companies": ["A"]},
+            {"companies": [member], "tuchal_amount": "abc"},
+            {"companies": [member], "min_share": "x"},
+            {"companies": [member], "sipyung": ["비율제"]},
+            {"companies": [dict(member, share="x")]},
+            {"companies": [{"biz_no": "000-00-00000"}]},           # 파일이 없으면 찾을 수 없습니다.
+            {"companies": [{"biz_no": "1"}], "as_of": "abc"},
+        ]
+        for body in cases:
+            response = self._post(body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.json())
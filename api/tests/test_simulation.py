@@ -0,0 +1,147 @@
+# test_simulation.py
+"""입찰 결과 몬테카를로 시뮬레이션 (simulation.py, /api/consortium/simulate/)"""
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import simulation
+from ..config import PRICE_SCORE_SIMULATION
+from .base import MediaFixtureMixin
+
+
+class PriceModelTests(SimpleTestCase):
+
+    def test_defaults_and_overrides(self):
+        model = simulation.price_model()
+        self.assertEqual(model["max_score"], PRICE_SCORE_SIMULATION["max_score"])
+        model = simulation.price_model({"max_score": "80", "drawn_price_count": 2.0, "floor_rates": [[87, 3], [88, 1]]})
+        self.assertEqual(model["max_score"], 80.0)
+        self.assertEqual(model["drawn_price_count"], 2)
+        self.assertEqual(model["floor_rates"], [[87.0, 0.75], [88.0, 0.25]])
+
+    def test_invalid_overrides(self):
+        cases = [
+            ["max_score"],
+            {"unknown": 1},
+            {"max_score": "abc"},
+            {"pass_score": None},
+            {"reference_rate": float("inf")},
+            {"drawn_price_count": 1.5},
+            {"drawn_price_count": 0},
+            {"reserve_price_spread": -1},
+            {"min_score": 80, "max_score": 70},
+            {"penalty_per_point": -1},
+            {"floor_rates": []},
+            {"floor_rates": [[87, -1]]},
+            {"floor_rates": [[87, 0]]},
+            {"floor_rates": "x"},
+            {"floor_rates": [["a", 1]]},
+        ]
+        for overrides in cases:
+            with self.assertRaises(ValueError, msg=overrides):
+                simulation.price_model(overrides)
+
+
+class SimulateTeamTests(SimpleTestCase):
+
+    def _model(self, **overrides):
+        return simulation.price_model({"reserve_price_spread": 0, **overrides})
+
+    def test_fixed_draw_matches_formula(self):
+        # 사정률이 항상 100% 이고 하한율이 하나면 매 추첨이 같으므로 점수를 직접 계산할 수 있습니다.
+        model = self._model(floor_rates=[[87.745, 1]])
+        price_score = model["max_score"] - model["penalty_per_point"] * abs(model["reference_rate"] - 88.5)
+        for static_score, win in ((30.0, 1.0), (20.0, 0.0)):
+            outcome = simulation.simulate_team(static_score, 88.5, model, 100, 0)
+            self.assertEqual(outcome["win_probability"], win if static_score + price_score >= model["pass_score"] else 0.0)
+            self.assertEqual(outcome["below_floor_probability"], 0.0)
+            self.assertAlmostEqual(outcome["mean_score"], static_score + price_score, places=4)
+
+    def test_bid_below_floor_always_fails(self):
+        outcome = simulation.simulate_team(50.0, 80.0, self._model(), 100, 0)
+        self.assertEqual(outcome["below_floor_probability"], 1.0)
+        self.assertEqual(outcome["win_probability"], 0.0)
+        self.assertIsNone(outcome["mean_score"])
+        self.assertIsNone(outcome["score_percentiles"])
+
+    def test_same_seed_same_result(self):
+        model = simulation.price_model()
+        teams = [(25.0, 88.0), (27.0, 87.9), (24.0, 88.3)]
+        first = simulation.simulate_teams(teams, model, draws=2000, seed=42)
+        self.assertEqual(first, simulation.simulate_teams(teams, model, draws=2000, seed=42))
+        self.assertNotEqual(first, simulation.simulate_teams(teams, model, draws=2000, seed=43))
+        self.assertTrue(all(0 <= outcome["win_probability"] <= 1 for outcome in first))
+
+    @override_settings(SIMULATION_PARALLEL_MIN_DRAWS=0, SIMULATION_PROCESSES=2)
+    def test_process_pool_gives_same_result(self):
+        self.addCleanup(simulation._reset_pool)
+        model = simulation.price_model()
+        teams = [(25.0, 88.0), (27.0, 87.9)]
+        parallel = simulation.simulate_teams(teams, model, draws=1000, seed=7)
+        with override_settings(SIMULATION_PROCESSES=1):
+            self.assertEqual(parallel, simulation.simulate_teams(teams, model, draws=1000, seed=7))
+
+
+class SimulateViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        companies = [comp for comp in self.fixture_dataset().companies if comp.value('신용평가')]
+        self.teams = [
+            {"name": "A", "companies": [{"biz_no": companies[0].value('사업자번호'), "share": 0.6},
+                                        {"biz_no": companies[1].value('사업자번호'), "share": 0.4}]},
+            {"companies": [{"data": companies[2].to_dict(), "share": 1}], "bid_rate": 88.2},
+        ]
+
+    def _post(self, **body):
+        body = {"teams": self.teams, "rule": ["행안부", "30억미만"], "announcement_date": "2024-06-01",
+                "price_data": {"estimation_price": 2000000000}, "draws": 2000, "seed": 3, **body}
+        return self.client.post('/api/consortium/simulate/', body, content_type='application/json')
+
+    def test_simulate_teams(self):
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["seed"], 3)
+        self.assertEqual([team["name"] for team in data["teams"]][0], "A")
+        self.assertEqual(data["teams"][1]["bid_rate"], 88.2)
+        self.assertEqual(data["teams"][0]["bid_rate"], simulation.default_bid_rate(data["price_model"]))
+        for team in data["teams"]:
+            self.assertEqual(team["draws"], 2000)
+            self.assertTrue(0 <= team["win_probability"] <= 1)
+        # 같은 seed 면 같은 결과입니다.
+        self.assertEqual(self._post().json(), data)
+
+    def test_notice_base_amount_rule(self):
+        body = {"rule": ["조달청", "50억미만"]}
+        self.assertEqual(self._post(price_data={"notice_base_amount": 3000000000}, **body).status_code, 200)
+        for price_data in ({"estimation_price": 3000000000}, {"notice_base_amount": 0},
+                           {"notice_base_amount": "abc"}, {"notice_base_amount": "inf"}):
+            response = self._post(price_data=price_data, **body)
+            self.assertEqual(response.status_code, 400, price_data)
+            self.assertIn("notice_base_amount", response.json()["error"])
+
+    def test_invalid_requests(self):
+        cases = [
+            {"teams": []},
+            {"teams": "A"},
+            {"teams": self.teams * 11},
+            {"teams": [{"companies": [{"data": {"시평": "1"}}]}]},
+            {"teams": [{"companies": [{"biz_no": "000-00-00000", "share": 1}]}]},
+            {"teams": [dict(self.teams[0], bid_rate="x")]},
+            {"price_data": {}},
+            {"price_data": ["estimation_price"]},
+            {"sipyung": "비율제"},
+            {"draws": 0},
+            {"draws": simulation.DEFAULT_DRAWS * 1000},
+            {"draws": "many"},
+            {"seed": "x"},
+            {"rule": ["행안부", "없는규칙"]},
+            {"announcement_date": "2024/06/01"},
+            {"price_model": {"min_score": 80, "max_score": 70}},
+            {"price_model": {"max_score": "abc"}},
+        ]
+        for body in cases:
+            response = self._post(**body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.json())
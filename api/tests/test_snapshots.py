@@ -0,0 +1,223 @@
+# test_snapshots.py
+"""데이터셋 과거 버전 보관과 시점 조회 (snapshots.py, as_of 파라미터, /api/snapshots/)"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from .. import dataset_cache, ranking, search_logic, snapshots
+from ..uploads import compute_fingerprint
+from .base import MediaFixtureMixin, record_tuples
+
+OLD_UPLOAD = datetime(2024, 1, 10, 9, 0).timestamp()
+NEW_UPLOAD = datetime(2024, 3, 1, 9, 0).timestamp()
+
+
+class SnapshotTestMixin(MediaFixtureMixin):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.install_fixture('eung')
+        os.utime(self.path, (OLD_UPLOAD, OLD_UPLOAD))
+        self.changed_source = self.generate('changed.xlsx', company_count=40, seed=5)
+
+    def replace_file(self):
+        """파일을 바꾸고 새 버전을 적재합니다. (업로드 API 를 거치지 않은 교체)"""
+        self.install_fixture('eung', source=self.changed_source)
+        os.utime(self.path, (NEW_UPLOAD, NEW_UPLOAD))
+        return self.fixture_dataset()
+
+
+class ArchiveTests(SnapshotTestMixin, TestCase):
+
+    def test_loading_archives_current_version(self):
+        dataset = self.fixture_dataset()
+        [meta] = snapshots.list_versions('eung')
+        self.assertEqual(dataset.version, meta["version"])
+        self.assertTrue(meta["version"].startswith("20240110T090000-"))
+        self.assertEqual(meta["sha256"], compute_fingerprint(self.path))
+        self.assertEqual(meta["companies"], len(dataset))
+        self.assertEqual(meta["uploaded_at"], "2024-01-10T09:00:00")
+
+        snapshot = snapshots.load_snapshot('eung', meta["version"])
+        self.assertEqual(record_tuples(snapshot.companies), record_tuples(dataset.companies))
+        self.assertEqual(snapshot.sheet_names, dataset.sheet_names)
+
+        # 같은 파일을 다시 적재해도 한 번만 보관합니다.
+        self.reset_caches()
+        self.fixture_dataset()
+        self.assertEqual(len(snapshots.list_versions('eung')), 1)
+
+    def test_region_dataset_is_not_archived(self):
+        dataset_cache.get_dataset(self.path, '서울')
+        self.assertEqual(snapshots.list_versions('eung'), [])
+
+    @override_settings(SNAPSHOT_ARCHIVE=False)
+    def test_archive_can_be_turned_off(self):
+        self.assertIsNone(self.fixture_dataset().version)
+        self.assertEqual(snapshots.list_versions('eung'), [])
+
+    def test_archive_current_only_archives_cached_dataset(self):
+        with override_settings(SNAPSHOT_ARCHIVE=False):
+            dataset = self.fixture_dataset()
+        # 적재되어 있지만 보관되지 않은 버전은 교체 직전에 보관합니다.
+        dataset_cache.archive_current(self.path)
+        self.assertIsNotNone(dataset.version)
+        self.assertEqual([meta["version"] for meta in snapshots.list_versions('eung')], [dataset.version])
+
+        # 적재되지 않은 파일은 파싱하지 않고 넘어갑니다.
+        self.reset_caches()
+        self.install_fixture('eung', source=self.changed_source)
+        with mock.patch.object(search_logic, 'parse_workbook') as parse:
+            dataset_cache.archive_current(self.path)
+        parse.assert_not_called()
+        self.assertEqual(len(snapshots.list_versions('eung')), 1)
+
+    def _upload(self):
+        with open(self.changed_source, 'rb') as f:
+            upload = SimpleUploadedFile('eung.xlsx', f.read())
+        response = self.client.post('/api/upload/', {'file': upload, 'type': 'eung'})
+        self.assertEqual(response.status_code, 201)
+
+    def test_upload_keeps_outgoing_version(self):
+        with override_settings(SNAPSHOT_ARCHIVE=False):
+            old = self.fixture_dataset()
+        self._upload()
+        [meta] = snapshots.list_versions('eung')
+        self.assertEqual(meta["companies"], len(old))
+        self.assertTrue(meta["version"].startswith("20240110T090000-"))
+
+    def test_upload_does_not_parse_unloaded_file(self):
+        with mock.patch.object(search_logic, 'parse_workbook', wraps=search_logic.parse_workbook) as parse:
+            self._upload()
+        # 업로드 검증(validate_workbook)은 파싱하지 않으므로 적재되지 않은 옛 파일은 읽지 않습니다.
+        parse.assert_not_called()
+        self.assertEqual(snapshots.list_versions('eung'), [])
+
+
+class AsOfTests(SnapshotTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.old = self.fixture_dataset()
+        self.new = self.replace_file()
+
+    def test_resolve(self):
+        old_version, new_version = [meta["version"] for meta in snapshots.list_versions('eung')]
+        self.assertEqual(self.old.version, old_version)
+        self.assertEqual(self.new.version, new_version)
+        self.assertEqual(snapshots.resolve('eung', '2024-01-10')["version"], old_version)
+        self.assertEqual(snapshots.resolve('eung', ' 2024-02-29 ')["version"], old_version)
+        self.assertEqual(snapshots.resolve('eung', '2024-03-01')["version"], new_version)
+        self.assertEqual(snapshots.resolve('eung', old_version)["version"], old_version)
+        with self.assertRaisesMessage(LookupError, "2024-01-09 이전에 보관된 자료가 없습니다."):
+            snapshots.resolve('eung', '2024-01-09')
+        with self.assertRaises(LookupError):
+            snapshots.resolve('eung', '20240110T090000-000000000000')
+        with self.assertRaises(ValueError):
+            snapshots.resolve('eung', '2024/01/10')
+        with self.assertRaises(ValueError):
+            snapshots.get_dataset('unknown', '2024-01-10')
+
+    def test_get_dataset(self):
+        # 지금 파일과 같은 버전이면 현재 데이터셋을 그대로 씁니다.
+        self.assertIs(snapshots.get_dataset('eung', '2024-03-05'), self.new)
+
+        past = snapshots.get_dataset('eung', '2024-02-01')
+        self.assertEqual(past.version, self.old.version)
+        self.assertEqual(record_tuples(past.companies), record_tuples(self.old.companies))
+        self.assertIs(snapshots.get_dataset('eung', self.old.version), past)
+        stats = snapshots.get_cache().stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["resident"], [f"eung/{self.old.version}"])
+
+    def test_search_as_of(self):
+        def names(params):
+            response = self.client.get('/api/search/', {'file_type': 'eung', **params})
+            self.assertEqual(response.status_code, 200)
+            return [row['검색된 회사'] for row in response.json()]
+
+        self.assertEqual(names({'as_of': '2024-02-01'}), [comp.name for comp in self.old.companies])
+        self.assertEqual(names({'as_of': self.new.version}), [comp.name for comp in self.new.companies])
+        self.assertEqual(names({}), [comp.name for comp in self.new.companies])
+
+        cases = [({'as_of': '2024/02/01'}, 400), ({'as_of': '2023-12-31'}, 404)]
+        for params, status_code in cases:
+            response = self.client.get('/api/search/', {'file_type': 'eung', **params})
+            self.assertEqual(response.status_code, status_code, params)
+            self.assertIn("error", response.json())
+
+    def test_snapshot_list_endpoint(self):
+        snapshots.get_dataset('eung', '2024-02-01')
+        response = self.client.get('/api/snapshots/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["current_version"], self.new.version)
+        # 최근 버전부터 보여줍니다.
+        self.assertEqual([meta["version"] for meta in data["versions"]], [self.new.version, self.old.version])
+        self.assertEqual(data["versions"][1]["companies"], len(self.old))
+        self.assertEqual(data["cache"]["resident"], [f"eung/{self.old.version}"])
+
+        self.assertEqual(self.client.get('/api/snapshots/', {'file_type': 'sobang'}).json()["versions"], [])
+        response = self.client.get('/api/snapshots/', {'file_type': 'unknown'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("알 수 없는 파일 타입입니다", response.json()["error"])
+
+
+class SnapshotCacheTests(SnapshotTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.old_version = self.fixture_dataset().version
+        self.new_version = self.replace_file().version
+        self.sizes = {version: snapshots.estimate_bytes(snapshots.load_snapshot('eung', version))
+                      for version in (self.old_version, self.new_version)}
+
+    def test_estimate_includes_derived_values(self):
+        dataset = snapshots.load_snapshot('eung', self.old_version)
+        before = snapshots.estimate_bytes(dataset)
+        self.assertEqual(snapshots.derived_bytes(dataset), 0)
+        ranking.get_sort_column(dataset, '시평')
+        self.assertGreater(snapshots.derived_bytes(dataset), 0)
+        self.assertEqual(snapshots.estimate_bytes(dataset), before + snapshots.derived_bytes(dataset))
+
+    def test_least_recently_used_is_evicted(self):
+        # 둘 중 하나만 들어가는 예산
+        cache = snapshots.SnapshotCache(sum(self.sizes.values()) - 1)
+        cache.get('eung', self.old_version)
+        cache.get('eung', self.new_version)
+        stats = cache.stats()
+        self.assertEqual(stats["resident"], [f"eung/{self.new_version}"])
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["resident_bytes"], stats["budget_bytes"])
+
+    def test_snapshot_larger_than_budget_is_not_kept(self):
+        cache = snapshots.SnapshotCache(min(self.sizes.values()) // 2)
+        dataset = cache.get('eung', self.old_version)
+        self.assertEqual(dataset.version, self.old_version)
+        self.assertEqual((cache.stats()["resident"], cache.total_bytes), ([], 0))
+
+    def test_concurrent_requests_load_once(self):
+        cache = snapshots.SnapshotCache(snapshots.DEFAULT_CACHE_BYTES)
+        load = snapshots.load_snapshot
+
+        def slow_load(*args):
+            time.sleep(0.05)
+            return load(*args)
+
+        results = []
+        with mock.patch.object(snapshots, 'load_snapshot', side_effect=slow_load) as patched:
+            threads = [threading.Thread(target=lambda: results.append(cache.get('eung', self.old_version)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(patched.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(dataset is results[0] for dataset in results))
@@ -0,0 +1,89 @@
+# test_stats.py
+"""비트맵 인덱스, 요약상태 집계 (/api/stats/) 와 요약상태 검색 필터"""
+
+import random
+from collections import Counter
+
+from django.test import SimpleTestCase, TestCase
+
+from ..indexes import BitmapIndex, bitmap_from_positions, bitmap_positions
+from ..records import SUMMARY_LABELS
+from .base import MediaFixtureMixin
+
+
+class BitmapIndexTests(SimpleTestCase):
+
+    def test_bitmap_round_trip(self):
+        rng = random.Random(1)
+        for size in (0, 1, 7, 8, 9, 300):
+            positions = sorted(rng.sample(range(size), size // 3)) if size else []
+            mask = bitmap_from_positions(positions, size)
+            self.assertEqual(bitmap_positions(mask), positions)
+            self.assertEqual(mask.bit_count(), len(positions))
+
+    def test_bitmap_index_matches_brute_force(self):
+        rng = random.Random(2)
+        values = [rng.choice('abcde') for _ in range(500)]
+        index = BitmapIndex(values)
+        within = bitmap_from_positions(range(0, 500, 3), 500)
+        for value in 'abcdef':
+            expected = [pos for pos, item in enumerate(values) if item == value]
+            self.assertEqual(bitmap_positions(index.get(value)), expected)
+            self.assertEqual(index.count(value, within), sum(1 for pos in expected if pos % 3 == 0))
+        self.assertEqual(bitmap_positions(index.any_of(['a', 'c'])),
+                         [pos for pos, item in enumerate(values) if item in ('a', 'c')])
+
+
+class DatasetStatsTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.companies = self.fixture_dataset().companies
+
+    def test_stats_match_brute_force_counts(self):
+        response = self.client.get('/api/stats/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["file_type"], 'eung')
+        self.assertEqual(data["total"], len(self.companies))
+
+        overall = Counter(comp.summary_status for comp in self.companies)
+        self.assertEqual(data["statuses"], {label: overall[label] for label in SUMMARY_LABELS})
+        for region, counts in data["regions"].items():
+            in_region = [comp for comp in self.companies if comp.region == region]
+            by_status = Counter(comp.summary_status for comp in in_region)
+            self.assertEqual(counts, {"total": len(in_region), **{label: by_status[label] for label in SUMMARY_LABELS}})
+        self.assertEqual(sum(counts["total"] for counts in data["regions"].values()), len(self.companies))
+
+    def test_stats_without_file(self):
+        response = self.client.get('/api/stats/', {'file_type': 'sobang'})
+        self.assertEqual(response.json(), {"file_type": 'sobang', "total": 0, "statuses": {}, "regions": {}})
+
+    def _search_names(self, query):
+        response = self.client.get('/api/search/?file_type=eung&' + query)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['검색된 회사'] for row in response.json())
+
+    def _expected_names(self, labels, region=None):
+        return sorted(comp.name for comp in self.companies
+                      if comp.summary_status in labels and (region is None or comp.region == region))
+
+    def test_status_filter_matches_brute_force(self):
+        for label in SUMMARY_LABELS:
+            self.assertEqual(self._search_names(f'status={label}'), self._expected_names({label}), label)
+
+    def test_status_filter_accepts_comma_and_repeated_params(self):
+        expected = self._expected_names({'최신', '1년 경과'})
+        self.assertTrue(expected)
+        self.assertEqual(self._search_names('status=최신,1년 경과'), expected)
+        self.assertEqual(self._search_names('status=최신&status=1년 경과'), expected)
+
+    def test_status_filter_combines_with_region(self):
+        region = self.companies[0].region
+        self.assertEqual(self._search_names(f'status=최신&region={region}'), self._expected_names({'최신'}, region))
+
+    def test_unknown_status_labels_are_ignored(self):
+        everyone = sorted(comp.name for comp in self.companies)
+        self.assertEqual(self._search_names('status=없는상태'), everyone)
+        self.assertEqual(self._search_names('status=최신,없는상태'), self._expected_names({'최신'}))
@@ -0,0 +1,66 @@
+# test_streaming.py
+"""큰 워크북용 스트리밍(read_only) 파싱"""
+
+import os
+from unittest import mock
+
+import openpyxl
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import search_logic
+from ..config import RELATIVE_OFFSETS
+from .base import FIXTURE_COMPANIES, MediaFixtureMixin, WorkbookFixtureMixin, record_tuples
+
+
+class StreamingParseTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_streaming_matches_normal_mode(self):
+        normal, normal_sheets = search_logic.parse_workbook(self.workbook_path, streaming=False)
+        streamed, streamed_sheets = search_logic.parse_workbook(self.workbook_path, streaming=True)
+        self.assertEqual(len(normal), FIXTURE_COMPANIES)
+        self.assertEqual(normal_sheets, streamed_sheets)
+        self.assertEqual(record_tuples(normal), record_tuples(streamed))
+
+    def test_overlapping_and_truncated_blocks(self):
+        # 블록이 BLOCK_HEIGHT 보다 촘촘히 붙어 있거나 시트 끝에서 잘려도 두 모드가 같아야 합니다.
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = '서울'
+        items = list(RELATIVE_OFFSETS)
+        sheet.append(["회사명", "가나전기", "다라전기"])
+        for item in items[:4]:
+            sheet.append([item, f"가나-{item}", f"다라-{item}"])
+        sheet.append(["회사명", "마바전기"])
+        for item in items[:2]:
+            sheet.append([item, f"마바-{item}"])
+        path = os.path.join(self.tmp_dir, 'truncated.xlsx')
+        workbook.save(path)
+
+        normal, _ = search_logic.parse_workbook(path, streaming=False)
+        streamed, _ = search_logic.parse_workbook(path, streaming=True)
+        self.assertEqual([comp.name for comp in normal], ["가나전기", "다라전기", "마바전기"])
+        self.assertEqual(record_tuples(normal), record_tuples(streamed))
+
+    def test_mode_follows_size_threshold(self):
+        size = os.path.getsize(self.workbook_path)
+        for threshold, read_only in ((size, True), (size + 1, False)):
+            with mock.patch('openpyxl.load_workbook', wraps=openpyxl.load_workbook) as load:
+                search_logic.parse_workbook(self.workbook_path, streaming_threshold=threshold)
+            self.assertEqual(load.call_args.kwargs['read_only'], read_only, threshold)
+
+        # 일부 시트만 읽을 때는 크기와 관계없이 스트리밍합니다.
+        with mock.patch('openpyxl.load_workbook', wraps=openpyxl.load_workbook) as load:
+            search_logic.parse_workbook(self.workbook_path, sheet_names=['서울'], streaming_threshold=size + 1)
+        self.assertTrue(load.call_args.kwargs['read_only'])
+
+
+class StreamingSettingTests(MediaFixtureMixin, TestCase):
+
+    @override_settings(STREAMING_PARSE_THRESHOLD_BYTES=1)
+    def test_dataset_cache_uses_threshold_setting(self):
+        self.install_fixture('eung')
+        with mock.patch.object(search_logic, 'parse_workbook', wraps=search_logic.parse_workbook) as parse:
+            response = self.client.get('/api/search/', {'file_type': 'eung'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), FIXTURE_COMPANIES)
+        self.assertEqual(parse.call_args.kwargs['streaming_threshold'], 1)
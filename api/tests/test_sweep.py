@@ -0,0 +1,115 @@
+# test_sweep.py
+"""기준금액 x 공고일 점수 표 (scenario.py, /api/consortium/sweep/)"""
+
+from datetime import date, timedelta
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from .. import calculation_logic, scenario, search_logic
+from ..config import CONSORTIUM_RULES
+from .base import MediaFixtureMixin, WorkbookFixtureMixin
+
+
+class GridTests(SimpleTestCase):
+
+    def test_price_grid(self):
+        self.assertEqual(scenario.price_grid([3, 1.5]).tolist(), [3.0, 1.5])
+        self.assertEqual(scenario.price_grid({'start': 0, 'stop': 10, 'count': 3}).tolist(), [0.0, 5.0, 10.0])
+        self.assertEqual(scenario.price_grid({'start': 0, 'stop': 10, 'step': 5}).tolist(), [0.0, 5.0, 10.0])
+        self.assertEqual(len(scenario.price_grid({'start': 0, 'stop': 1})), scenario.DEFAULT_PRICE_COUNT)
+        for spec in ([], [-1], ['abc'], [float('nan')], 'abc', None, {'start': 0, 'stop': 1, 'step': -1},
+                     {'start': 0, 'stop': 1, 'step': 0}, {'start': 0, 'stop': 1, 'count': 0}, {'start': 0}):
+            with self.assertRaises((ValueError, KeyError), msg=spec):
+                scenario.price_grid(spec)
+
+    def test_date_grid(self):
+        self.assertEqual(scenario.date_grid(None, default=date(2024, 1, 1)), [date(2024, 1, 1)])
+        self.assertEqual(scenario.date_grid('2024-01-02'), [date(2024, 1, 2)])
+        self.assertEqual(scenario.date_grid({'start': '2024-01-01', 'end': '2024-01-10', 'step_days': 4}),
+                         [date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 9)])
+        for spec in (['2024/01/01'], {'start': '2024-01-10', 'end': '2024-01-01'},
+                     {'start': '2024-01-01', 'end': '2024-01-10', 'step_days': 0}, 3):
+            with self.assertRaises(ValueError, msg=spec):
+                scenario.date_grid(spec)
+
+
+class SweepTests(WorkbookFixtureMixin, SimpleTestCase):
+
+    def test_matches_calculate_consortium(self):
+        companies, _ = search_logic.parse_workbook(self.workbook_path)
+        picked = [comp for comp in companies if comp.value('신용평가')][:3]
+        members = [{"data": comp.to_dict(), "share": share, "name": comp.name, "source_type": "전기"}
+                   for comp, share in zip(picked, (0.5, 0.3, 0.2))]
+        prices = [100000000 + k * 2500000000 for k in range(20)]
+        dates = [date(2023, 1, 1) + timedelta(days=45 * k) for k in range(30)]
+
+        for rule_group, rules in CONSORTIUM_RULES.items():
+            for rule_name, ruleset in rules.items():
+                result = scenario.sweep(members, (rule_group, rule_name), prices, dates)
+                price_key = ruleset.get("performance_base_key", "estimation_price")
+                for i in range(0, len(dates), 7):
+                    for j in range(0, len(prices), 6):
+                        expected = calculation_logic.calculate_consortium(
+                            members, {price_key: prices[j]}, dates[i], (rule_group, rule_name), {}, "전체")
+                        self.assertAlmostEqual(result["expected_score"][i][j], expected["expected_score"], places=3,
+                                               msg=(rule_group, rule_name, dates[i], prices[j]))
+
+    def test_share_is_required(self):
+        rule_group, rules = next(iter(CONSORTIUM_RULES.items()))
+        with self.assertRaises(ValueError):
+            scenario.sweep([{"data": {}, "share": None, "name": "a"}], (rule_group, next(iter(rules))),
+                           [100000000], [date(2024, 1, 1)])
+
+
+class SweepViewTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.picked = [comp for comp in self.fixture_dataset().companies if comp.value('신용평가')][:2]
+
+    def _post(self, body):
+        return self.client.post('/api/consortium/sweep/', body, content_type='application/json')
+
+    def test_sweep_by_biz_no(self):
+        body = {
+            'companies': [{'biz_no': self.picked[0].value('사업자번호'), 'share': 0.6},
+                          {'biz_no': self.picked[1].value('사업자번호'), 'share': 0.4}],
+            'rule': ['행안부', '30억미만'],
+            'prices': {'start': 1000000000, 'stop': 3000000000, 'count': 5},
+            'dates': {'start': '2024-01-01', 'end': '2024-03-01', 'step_days': 30},
+        }
+        response = self._post(body)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["prices"]), 5)
+        self.assertEqual(data["dates"], ['2024-01-01', '2024-01-31', '2024-03-01'])
+        self.assertEqual(np.array(data["expected_score"]).shape, (3, 5))
+
+        members = [{"data": comp.to_dict(), "share": share, "name": comp.name, "source_type": "전기"}
+                   for comp, share in zip(self.picked, (0.6, 0.4))]
+        expected = scenario.sweep(members, ('행안부', '30억미만'), scenario.price_grid(body['prices']),
+                                  scenario.date_grid(body['dates']))
+        self.assertEqual(data["expected_score"], expected["expected_score"])
+
+    def test_invalid_requests(self):
+        member = {'data': self.picked[0].to_dict(), 'share': 1}
+        cases = [
+            {},
+            {'companies': [member], 'rule': ['행안부', '없는규칙']},
+            {'companies': [member], 'prices': 'abc'},
+            {'companies': [member], 'prices': {'start': 0, 'stop': 1, 'step': 0}},
+            {'companies': [member], 'prices': [-1]},
+            {'companies': [member], 'prices': {'start': 0}},
+            {'companies': [member], 'dates': ['2024/01/01']},
+            {'companies': [member], 'dates': {'start': '2024-02-01', 'end': '2024-01-01'}},
+            {'companies': [member], 'prices': {'start': 0, 'stop': 1, 'count': 1000},
+             'dates': {'start': '2020-01-01', 'end': '2021-01-01'}},
+            {'companies': [{'data': member['data']}]},
+            {'companies': [{'biz_no': '000-00-00000', 'share': 1}]},
+        ]
+        for body in cases:
+            response = self._post(body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.json())
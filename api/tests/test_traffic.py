@@ -0,0 +1,204 @@
+# test_traffic.py
+"""요청 기록(TrafficCaptureMiddleware)과 재생 (traffic.py, manage.py replay_traffic)"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import traffic
+from .base import MediaFixtureMixin
+
+
+class CaptureTests(MediaFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.install_fixture('eung')
+        self.capture_path = os.path.join(self.media_root, 'traffic.jsonl')
+        settings_override = override_settings(TRAFFIC_CAPTURE_FILE=self.capture_path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(self._close_capture_logger)
+
+    def _close_capture_logger(self):
+        capture = logging.getLogger('api.traffic.capture')
+        for handler in capture.handlers:
+            handler.close()
+        capture.handlers.clear()
+
+    def _captured(self):
+        # 백그라운드 스레드가 큐에 남은 줄을 모두 쓰도록 핸들러를 닫고 읽습니다.
+        self._close_capture_logger()
+        if not os.path.exists(self.capture_path):
+            return []
+        with open(self.capture_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_disabled_without_capture_file(self):
+        with override_settings(TRAFFIC_CAPTURE_FILE=None):
+            with self.assertRaises(MiddlewareNotUsed):
+                traffic.TrafficCaptureMiddleware(lambda request: None)
+
+    def test_records_api_requests(self):
+        self.client.get('/api/search/', {'file_type': 'eung', 'name': '가상', 'profile': '1'})
+        biz_no = self.fixture_dataset().companies[0].value('사업자번호')
+        self.client.get(f'/api/companies/{biz_no}/')
+        self.client.post('/api/companies/lookup/', {'file_type': 'eung', 'biz_nos': [biz_no]}, content_type='application/json')
+        self.client.get('/swagger.json')
+
+        search, detail, lookup = self._captured()
+        self.assertEqual((search["method"], search["endpoint"], search["path"]), ("GET", "/api/search/", "/api/search/"))
+        self.assertEqual(search["query"], [["file_type", "eung"], ["name", "가상"]])
+        self.assertEqual((search["file_type"], search["status"], search["replayable"]), ("eung", 200, True))
+        self.assertGreater(search["response_bytes"], 0)
+        self.assertGreaterEqual(search["duration_ms"], 0)
+
+        self.assertEqual(detail["endpoint"], "/api/companies/<str:biz_no>/")
+        self.assertEqual(detail["path"], f"/api/companies/{biz_no}/")
+
+        self.assertEqual(lookup["body"], {'file_type': 'eung', 'biz_nos': [biz_no]})
+        self.assertEqual((lookup["file_type"], lookup["status"], lookup["replayable"]), ("eung", 200, True))
+
+    def test_upload_is_recorded_but_not_replayable(self):
+        upload = SimpleUploadedFile('eung.xlsx', self.fixture_bytes())
+        response = self.client.post('/api/upload/', {'type': 'eung', 'file': upload})
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        [entry] = self._captured()
+        self.assertFalse(entry["replayable"])
+        self.assertNotIn("body", entry)
+        self.assertTrue(entry["content_type"].startswith("multipart/form-data"))
+
+    def test_streaming_response(self):
+        self.client.get('/api/export/search/', {'file_type': 'eung'})
+        [entry] = self._captured()
+        self.assertTrue(entry["streaming"])
+        self.assertNotIn("response_bytes", entry)
+
+    async def test_async_requests(self):
+        response = await self.async_client.get('/api/async/search/', {'file_type': 'eung', 'region': '서울'})
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        [entry] = self._captured()
+        self.assertEqual((entry["endpoint"], entry["status"]), ("/api/async/search/", 200))
+
+    @override_settings(TRAFFIC_CAPTURE_SAMPLE_RATE=0)
+    def test_sample_rate_zero_records_nothing(self):
+        self.client.get('/api/search/', {'file_type': 'eung'})
+        self.assertEqual(self._captured(), [])
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.server.received.append((self.command, self.path, self.rfile.read(length) if length else b''))
+        self.send_response(500 if self.path.startswith('/fail') else 200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class ReplayTests(SimpleTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.received = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.capture_path = os.path.join(self._tmp_dir(), 'traffic.jsonl')
+        self.entries = [
+            {"method": "GET", "endpoint": "/api/search/", "path": "/api/search/", "query": [["name", "가상"]],
+             "replayable": True, "ts": 2.0, "duration_ms": 5.0},
+            {"method": "POST", "endpoint": "/api/companies/lookup/", "path": "/api/companies/lookup/", "query": [],
+             "body": {"biz_nos": ["1"]}, "replayable": True, "ts": 1.0, "duration_ms": 7.0},
+            {"method": "POST", "endpoint": "/api/upload/", "path": "/api/upload/", "query": [],
+             "content_type": "multipart/form-data", "replayable": False, "ts": 1.5},
+            {"method": "GET", "endpoint": "/fail/", "path": "/fail/", "query": [], "replayable": True, "ts": 3.0},
+        ]
+        with open(self.capture_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.write("잘린 줄 {\n\n")
+
+    def _tmp_dir(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        return tmp_dir
+
+    def test_load_capture(self):
+        entries = traffic.load_capture(self.capture_path)
+        self.assertEqual([entry["endpoint"] for entry in entries], ["/api/companies/lookup/", "/api/search/", "/fail/"])
+        self.assertEqual(len(traffic.load_capture(self.capture_path, endpoints=["/api/search/"])), 1)
+        self.assertEqual(len(traffic.load_capture(self.capture_path, limit=2)), 2)
+
+    def test_replay_sends_requests(self):
+        entries = traffic.load_capture(self.capture_path)
+        results, wall_seconds = traffic.replay(entries, self.base_url, concurrency=2)
+        self.assertGreater(wall_seconds, 0)
+        self.assertEqual(sorted((entry["endpoint"], status, error) for entry, status, _, error in results), [
+            ("/api/companies/lookup/", 200, None), ("/api/search/", 200, None), ("/fail/", 500, None),
+        ])
+        self.assertEqual(sorted(self.server.received), [
+            ("GET", "/api/search/?name=%EA%B0%80%EC%83%81", b''),
+            ("GET", "/fail/", b''),
+            ("POST", "/api/companies/lookup/", b'{"biz_nos": ["1"]}'),
+        ])
+
+    def test_unreachable_server_is_an_error(self):
+        self.server.shutdown()
+        self.server.server_close()
+        results, _ = traffic.replay(traffic.load_capture(self.capture_path)[:1], self.base_url, timeout=2)
+        [(_, status, _, error)] = results
+        self.assertIsNone(status)
+        self.assertIsNotNone(error)
+
+    def test_summarize(self):
+        entry = {"method": "GET", "endpoint": "/api/search/", "duration_ms": 1.0}
+        results = [(entry, 200, ms / 1000, None) for ms in range(1, 100)] + [(entry, None, 0.1, "refused")]
+        report = traffic.summarize(results, 2.0)
+        search = report["endpoints"]["GET /api/search/"]
+        self.assertEqual((search["requests"], search["errors"], search["throughput_rps"]), (100, 1, 50.0))
+        self.assertEqual(search["latency_ms"], {"p50": 50.0, "p95": 95.0, "p99": 99.0})
+        self.assertEqual(search["captured_latency_ms"]["p50"], 1.0)
+        self.assertEqual(search["statuses"], {"200": 99, "error": 1})
+        self.assertEqual(report["total"]["requests"], 100)
+
+    def test_replay_command(self):
+        output = os.path.join(self._tmp_dir(), 'report.json')
+        call_command('replay_traffic', self.capture_path, base_url=self.base_url, repeat=2, speed=1000,
+                     output=output, stderr=StringIO())
+        with open(output, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report["total"]["requests"], 6)
+        self.assertEqual(report["total"]["errors"], 2)
+        self.assertEqual(report["options"]["repeat"], 2)
+
+    def test_replay_command_errors(self):
+        empty = os.path.join(self._tmp_dir(), 'empty.jsonl')
+        open(empty, 'w').close()
+        cases = [
+            ((self.capture_path,), {"rate": 10, "speed": 2}),
+            ((empty,), {}),
+            ((empty + '.missing',), {}),
+            ((self.capture_path,), {"endpoint": ["/api/없음/"]}),
+        ]
+        for args, options in cases:
+            with self.assertRaises(CommandError, msg=(args, options)):
+                call_command('replay_traffic', *args, base_url=self.base_url, stderr=StringIO(), **options)
@@ -0,0 +1,116 @@
+# test_uploads.py
+"""업로드 구조 검증과 SHA-256 지문으로 같은 파일 건너뛰기 (/api/upload/)"""
+
+import os
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from openpyxl import Workbook
+
+from .. import benchmark, dataset_cache, search_logic, uploads
+from ..config import RELATIVE_OFFSETS
+from .base import MediaFixtureMixin
+
+
+def _save_workbook(path, labels, sheets=('서울',)):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name in sheets:
+        sheet = workbook.create_sheet(sheet_name)
+        for label in labels:
+            sheet.append([label, "값"])
+    workbook.save(path)
+    return path
+
+
+class ValidateWorkbookTests(MediaFixtureMixin, TestCase):
+
+    def test_fixture_is_valid(self):
+        info = search_logic.validate_workbook(self.workbook_path)
+        self.assertEqual(info["sheets"], len(benchmark.REGIONS))
+        self.assertGreater(info["blocks"], 0)
+
+    def test_layout_errors(self):
+        labels = ["회사명", *RELATIVE_OFFSETS]
+        swapped = ["회사명", "사업자번호", "대표자", *list(RELATIVE_OFFSETS)[2:]]
+        cases = [
+            (labels[1:], "'회사명' 행을 찾을 수 없습니다"),
+            (swapped, "1행 아래는 '대표자' 항목이어야 하지만 '사업자번호'"),
+            (labels[:5], "5행 아래는 '3년 실적' 항목이어야 하지만 ''"),
+        ]
+        for rows, message in cases:
+            path = _save_workbook(os.path.join(self.media_root, 'layout.xlsx'), rows)
+            with self.assertRaisesMessage(ValueError, message):
+                search_logic.validate_workbook(path)
+
+        not_excel = os.path.join(self.media_root, 'not-excel.xlsx')
+        with open(not_excel, 'wb') as f:
+            f.write(b'not an excel file')
+        with self.assertRaisesMessage(ValueError, "엑셀 파일을 열 수 없습니다"):
+            search_logic.validate_workbook(not_excel)
+
+
+class UploadTests(MediaFixtureMixin, TestCase):
+
+    def _upload(self, file_type, content, name='upload.xlsx'):
+        return self.client.post('/api/upload/', {'file': SimpleUploadedFile(name, content), 'type': file_type})
+
+    def test_upload_and_same_content_is_unchanged(self):
+        response = self._upload('eung', self.fixture_bytes())
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.json()["changed"])
+        dest_path = dataset_cache.get_excel_path('eung')
+        with open(dest_path + uploads.FINGERPRINT_SUFFIX) as f:
+            self.assertEqual(f.read(), uploads.compute_fingerprint(dest_path))
+
+        dataset = self.fixture_dataset('eung')
+        mtime = os.stat(dest_path).st_mtime_ns
+        response = self._upload('eung', self.fixture_bytes())
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["changed"])
+        # 파일을 교체하지 않으므로 적재된 데이터셋이 그대로 쓰입니다.
+        self.assertEqual(os.stat(dest_path).st_mtime_ns, mtime)
+        self.assertIs(self.fixture_dataset('eung'), dataset)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_changed_content_replaces_file(self):
+        self.assertEqual(self._upload('eung', self.fixture_bytes()).status_code, 201)
+        other = self.generate('other.xlsx', company_count=30, seed=11)
+        response = self._upload('eung', self.fixture_bytes(other))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.fixture_dataset('eung')), 30)
+        self.assertEqual(uploads.file_fingerprint(dataset_cache.get_excel_path('eung')),
+                         uploads.compute_fingerprint(other))
+
+    def test_fingerprint_is_computed_for_older_files(self):
+        # 지문 파일이 없는(이 기능 이전에 올라온) 파일도 같은 내용이면 건너뜁니다.
+        dest_path = self.install_fixture('eung')
+        self.assertFalse(os.path.exists(dest_path + uploads.FINGERPRINT_SUFFIX))
+        response = self._upload('eung', self.fixture_bytes())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(os.path.exists(dest_path + uploads.FINGERPRINT_SUFFIX))
+        self.assertIsNone(uploads.file_fingerprint(dataset_cache.get_excel_path('sobang')))
+
+    def test_invalid_workbook_keeps_existing_file(self):
+        self.assertEqual(self._upload('tongsin', self.fixture_bytes()).status_code, 201)
+        dest_path = dataset_cache.get_excel_path('tongsin')
+        before = uploads.compute_fingerprint(dest_path)
+
+        response = self._upload('tongsin', b'not an excel file')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("올바른 업체 엑셀 파일이 아닙니다", response.json()["error"])
+        self.assertEqual(uploads.compute_fingerprint(dest_path), before)
+        self.assertEqual(self.leftover_staged_files(), [])
+
+    def test_wrong_layout_is_rejected(self):
+        path = _save_workbook(os.path.join(self.media_root, 'layout.xlsx'), ["회사명", "사업자번호"])
+        response = self._upload('eung', self.fixture_bytes(path))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("배치가 다릅니다", response.json()["error"])
+        self.assertFalse(os.path.exists(dataset_cache.get_excel_path('eung')))
+
+    def test_file_and_type_are_required(self):
+        self.assertEqual(self.client.post('/api/upload/', {'type': 'eung'}).status_code, 400)
+        response = self.client.post('/api/upload/', {'file': SimpleUploadedFile('a.xlsx', self.fixture_bytes())})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.leftover_staged_files(), [])
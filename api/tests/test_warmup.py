@@ -0,0 +1,59 @@
+# test_warmup.py
+"""서버 시작 시 데이터셋 미리 적재 (warm_up / warm_up_on_startup / manage.py warmup)"""
+
+import logging
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import dataset_cache
+from .base import MediaFixtureMixin
+
+
+class WarmUpTests(MediaFixtureMixin, TestCase):
+
+    def test_warm_up_loads_existing_files(self):
+        path = self.install_fixture('eung')
+        report = {item["file_type"]: item for item in dataset_cache.warm_up()}
+        self.assertEqual(report["eung"]["status"], "완료")
+        self.assertEqual(report["eung"]["companies"], len(self.fixture_dataset()))
+        self.assertEqual(report["tongsin"]["status"], "파일 없음")
+        self.assertEqual(report["sobang"]["status"], "파일 없음")
+        self.assertIsNotNone(dataset_cache.get_cached_dataset(path))
+
+    def test_broken_file_is_reported_not_raised(self):
+        path = self.install_fixture('sobang')
+        with open(path, 'wb') as f:
+            f.write(b'not a workbook')
+        report = dataset_cache.warm_up(['sobang'])
+        self.assertEqual(report[0]["status"], "오류")
+        self.assertTrue(report[0]["error"])
+
+    @override_settings(DATASET_WARMUP_ON_STARTUP=False)
+    def test_startup_warm_up_is_off_by_default(self):
+        self.install_fixture('eung')
+        self.assertIsNone(dataset_cache.warm_up_on_startup())
+        self.assertIsNone(dataset_cache.get_cached_dataset(dataset_cache.get_excel_path('eung')))
+
+    @override_settings(DATASET_WARMUP_ON_STARTUP=True)
+    def test_startup_summary_is_logged_at_info(self):
+        self.install_fixture('eung')
+        # api 로거가 WARNING 이어도 warm-up 요약(INFO)은 남아야 합니다.
+        self.assertTrue(logging.getLogger('api.warmup').isEnabledFor(logging.INFO))
+        with self.assertLogs('api.warmup', logging.INFO) as logs:
+            report = dataset_cache.warm_up_on_startup()
+        self.assertEqual(len(report), len(dataset_cache.FILE_TYPES))
+        output = "\n".join(logs.output)
+        self.assertIn("INFO:api.warmup:[warm-up] eung: 업체 120개", output)
+        self.assertIn("WARNING:api.warmup:[warm-up] tongsin: 파일 없음", output)
+        self.assertIn("URL/뷰 모듈 로딩", output)
+
+    def test_management_command(self):
+        self.install_fixture('eung')
+        out = StringIO()
+        call_command('warmup', 'eung', 'sobang', stdout=out)
+        output = out.getvalue()
+        self.assertIn("eung: 업체 120개", output)
+        self.assertIn("sobang: 파일 없음", output)
+        self.assertIn("URL/뷰 모듈 로딩", output)
@@ -0,0 +1,272 @@
+# traffic.py
+"""
+실제 API 요청 패턴을 기록하고(capture) 다시 재생(replay)하는 부하 테스트 도구.
+
+- TrafficCaptureMiddleware: settings.TRAFFIC_CAPTURE_FILE 이 있을 때만 켜집니다. /api/ 요청마다
+  엔드포인트(URL 패턴), 경로, 쿼리 파라미터, file_type, JSON 본문, 상태 코드, 처리 시간을 JSONL 한 줄로 남깁니다.
+  파일 쓰기는 logging_utils.QueueListenerHandler 의 백그라운드 스레드가 합니다.
+- replay: 기록된 요청을 로컬 서버(gunicorn, runserver 등)에 동시에 보내고, 엔드포인트별 처리량과
+  p50/p95/p99 지연 시간을 계산합니다. (manage.py replay_traffic)
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .logging_utils import QueueListenerHandler
+
+# 기록하지 않는 쿼리 파라미터 (요청 결과와 무관한 것)
+IGNORED_PARAMS = frozenset({'profile'})
+DEFAULT_MAX_BODY_BYTES = 64 * 1024
+PERCENTILES = (50, 95, 99)
+
+
+def _capture_logger(path):
+    """TRAFFIC_CAPTURE_FILE 에 한 줄씩 쓰는 전용 로거 (api 로거 설정과 섞이지 않음)"""
+    capture = logging.getLogger('api.traffic.capture')
+    capture.propagate = False
+    capture.setLevel(logging.INFO)
+    if not capture.handlers:
+        file_handler = logging.FileHandler(path, encoding='utf-8', delay=True)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        capture.addHandler(QueueListenerHandler([file_handler]))
+    return capture
+
+
+def normalize_request(request):
+    """요청을 재생 가능한 형태의 dict 로 만듭니다."""
+    match = getattr(request, 'resolver_match', None)
+    query = [[key, value] for key, values in request.GET.lists() if key not in IGNORED_PARAMS for value in values]
+    entry = {
+        "method": request.method,
+        "endpoint": f"/{match.route}" if match is not None and match.route else request.path,
+        "path": request.path,
+        "query": query,
+        "file_type": request.GET.get('file_type'),
+        "replayable": request.method in ('GET', 'HEAD'),
+    }
+
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        content_type = request.content_type or ''
+        # 업로드(multipart)는 본문을 읽으면 스트리밍 업로드가 깨지므로 기록하지 않습니다.
+        if content_type == 'application/json' and request.__dict__.get('_body') is not None:
+            try:
+                body = json.loads(request.body or b'null')
+            except ValueError:
+                body = None
+            entry["body"] = body
+            entry["replayable"] = body is not None
+            if isinstance(body, dict) and entry["file_type"] is None:
+                entry["file_type"] = body.get('file_type')
+        else:
+            entry["content_type"] = content_type
+    return entry
+
+
+class TrafficCaptureMiddleware:
+    """settings.TRAFFIC_CAPTURE_FILE 로 켜는 요청 기록 미들웨어 (동기/비동기 모두 지원)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        path = getattr(settings, 'TRAFFIC_CAPTURE_FILE', None)
+        if not path:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = getattr(settings, 'TRAFFIC_CAPTURE_PREFIX', '/api/')
+        self.sample_rate = float(getattr(settings, 'TRAFFIC_CAPTURE_SAMPLE_RATE', 1.0))
+        self.max_body = getattr(settings, 'TRAFFIC_CAPTURE_MAX_BODY_BYTES', DEFAULT_MAX_BODY_BYTES)
+        self.logger = _capture_logger(path)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _wanted(self, request):
+        return request.path.startswith(self.prefix) and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+
+    def _cache_body(self, request):
+        # 뷰(DRF)가 스트림을 읽기 전에 JSON 본문을 읽어 request.body 에 캐시해 둡니다.
+        if request.content_type == 'application/json' and int(request.META.get('CONTENT_LENGTH') or 0) <= self.max_body:
+            request.body
+
+    def _record(self, request, response, started, elapsed):
+        try:
+            entry = normalize_request(request)
+        except Exception:
+            return
+        entry.update({
+            "ts": round(started, 6),
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 3),
+        })
+        if getattr(response, 'streaming', False):
+            # 스트리밍 응답은 본문을 보내기 전까지의 시간만 잽니다.
+            entry["streaming"] = True
+        else:
+            entry["response_bytes"] = len(response.content)
+        self.logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._wanted(request):
+            return self.get_response(request)
+        self._cache_body(request)
+        started, clock = time.time(), time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, started, time.perf_counter() - clock)
+        return response
+
+    async def __acall__(self, request):
+        if not self._wanted(request):
+            return await self.get_response(request)
+        self._cache_body(request)
+        started, clock = time.time(), time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, started, time.perf_counter() - clock)
+        return response
+
+
+# --- 재생 ---
+
+def load_capture(path, endpoints=None, limit=None):
+    """기록 파일에서 재생할 수 있는 요청만 시간 순으로 읽습니다. endpoints 를 주면 그 엔드포인트만."""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not entry.get('replayable') or (endpoints and entry.get('endpoint') not in endpoints):
+                continue
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry.get('ts', 0))
+    return entries[:limit] if limit else entries
+
+
+def _send(base_url, entry, timeout):
+    url = base_url.rstrip('/') + entry['path']
+    if entry.get('query'):
+        url += '?' + urllib.parse.urlencode([tuple(pair) for pair in entry['query']])
+    data, headers = None, {}
+    if 'body' in entry:
+        data = json.dumps(entry['body']).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+    request = urllib.request.Request(url, data=data, headers=headers, method=entry['method'])
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            # 스트리밍 응답도 끝까지 받아야 실제 처리 시간이 됩니다.
+            while response.read(64 * 1024):
+                pass
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError) as e:
+        return entry, None, time.perf_counter() - started, str(e)
+    return entry, status, time.perf_counter() - started, None
+
+
+def _schedule(entries, rate, speed):
+    """요청마다 시작 시각(재생 시작 기준 초)을 정합니다. 둘 다 없으면 None (동시 처리 수만큼 최대한 빨리)."""
+    if speed:
+        first = entries[0].get('ts', 0)
+        return [(entry.get('ts', first) - first) / speed for entry in entries]
+    if rate:
+        return [idx / rate for idx in range(len(entries))]
+    return None
+
+
+def replay(entries, base_url, concurrency=8, rate=None, speed=None, timeout=30.0, on_progress=None):
+    """
+    entries 를 base_url 서버에 보내고 결과 목록 [(entry, status, 초, 오류)] 와 전체 걸린 시간을 반환합니다.
+    - rate: 초당 요청 수를 고정해 보냅니다. (서버가 느려져도 동시 요청이 concurrency 개를 넘기 전까지는 속도 유지)
+    - speed: 기록된 요청 간격을 speed 배 빠르게 재현합니다.
+    - 둘 다 없으면 concurrency 개 스레드가 쉬지 않고 보냅니다.
+    """
+    offsets = _schedule(entries, rate, speed)
+    results = []
+    lock = threading.Lock()
+
+    def run(idx, entry):
+        if offsets is not None:
+            delay = offsets[idx] - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        try:
+            result = _send(base_url, entry, timeout)
+        except Exception as e:  # 잘못된 기록 한 줄 때문에 결과가 빠지지 않도록 오류로 셉니다.
+            result = (entry, None, 0.0, str(e))
+        with lock:
+            results.append(result)
+            if on_progress:
+                on_progress(len(results), len(entries))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for idx, entry in enumerate(entries):
+            pool.submit(run, idx, entry)
+    return results, time.perf_counter() - start
+
+
+def _percentiles(values):
+    if not values:
+        return {f"p{q}": None for q in PERCENTILES}
+    ordered = sorted(values)
+    # nearest-rank 방식
+    return {f"p{q}": round(ordered[min(len(ordered) - 1, max(0, -(-q * len(ordered) // 100) - 1))], 3)
+            for q in PERCENTILES}
+
+
+def summarize(results, wall_seconds):
+    """엔드포인트별 요청 수, 오류 수, 처리량(초당 요청), 지연 시간 백분위(ms)와 기록 당시 백분위를 계산합니다."""
+    groups = {}
+    for entry, status, seconds, error in results:
+        key = f"{entry['method']} {entry['endpoint']}"
+        group = groups.setdefault(key, {"latencies": [], "captured": [], "errors": 0, "statuses": {}})
+        group["latencies"].append(seconds * 1000)
+        if entry.get('duration_ms') is not None:
+            group["captured"].append(entry['duration_ms'])
+        label = str(status) if status is not None else "error"
+        group["statuses"][label] = group["statuses"].get(label, 0) + 1
+        if error is not None or status >= 400:
+            group["errors"] += 1
+
+    def row(count, errors, latencies, captured=None, statuses=None):
+        summary = {
+            "requests": count,
+            "errors": errors,
+            "throughput_rps": round(count / wall_seconds, 2) if wall_seconds > 0 else None,
+            "latency_ms": _percentiles(latencies),
+        }
+        if captured is not None:
+            summary["captured_latency_ms"] = _percentiles(captured)
+        if statuses is not None:
+            summary["statuses"] = statuses
+        return summary
+
+    endpoints = {
+        key: row(len(group["latencies"]), group["errors"], group["latencies"], group["captured"], group["statuses"])
+        for key, group in sorted(groups.items())
+    }
+    all_latencies = [latency for group in groups.values() for latency in group["latencies"]]
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "total": row(len(results), sum(group["errors"] for group in groups.values()), all_latencies),
+        "endpoints": endpoints,
+    }
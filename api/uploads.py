@@ -0,0 +1,177 @@
+# uploads.py
+"""
+엑셀 업로드를 디스크로 바로 흘려보내는(streaming) 업로드 핸들러.
+
+Django 기본 핸들러는 작은 파일을 메모리에 통째로 올리고, 큰 파일은 시스템 임시 폴더에 쓴 뒤
+다시 media/excel/ 로 복사합니다. 여기서는 각 파트를 받는 즉시 media/excel/ 안의 임시 파일(.part)에
+청크 단위로 기록하고, 업로드가 끝나면 os.replace 로 한 번에 교체합니다.
+
+받는 동안 SHA-256 지문도 함께 계산합니다. 기존 파일과 지문이 같으면 파일을 교체하지 않으므로
+(수정시각이 바뀌지 않아) 캐시된 데이터셋과 인덱스가 그대로 유지됩니다.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+from . import dataset_cache, search_logic
+
+STAGING_PREFIX = '.upload-'
+STAGING_SUFFIX = '.part'
+FINGERPRINT_SUFFIX = '.sha256'
+
+
+class StagedUploadedFile(UploadedFile):
+    """업로드 폴더 안의 임시 파일에 저장된 업로드 파일"""
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra=None):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.staged_path = file.name
+        self.sha256 = None
+
+    def temporary_file_path(self):
+        return self.staged_path
+
+    def close(self):
+        # 임시 파일은 install_staged_file 로 옮기거나 discard_staged_file 로 지웁니다.
+        if not self.file.closed:
+            self.file.close()
+
+
+class StagingUploadHandler(FileUploadHandler):
+    """각 파일 파트를 upload_dir 안의 임시 파일에 청크 단위로 기록합니다."""
+
+    def __init__(self, upload_dir, request=None):
+        super().__init__(request)
+        self.upload_dir = upload_dir
+        self.file = None
+        self.hasher = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.file = tempfile.NamedTemporaryFile(
+            dir=self.upload_dir, prefix=STAGING_PREFIX, suffix=STAGING_SUFFIX, delete=False,
+        )
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.file.write(raw_data)
+        self.hasher.update(raw_data)
+        # 다음 핸들러(메모리/임시파일)로 데이터를 넘기지 않습니다.
+        return None
+
+    def file_complete(self, file_size):
+        self.file.flush()
+        self.file.close()
+        staged = StagedUploadedFile(
+            self.file, self.file_name, self.content_type, file_size, self.charset, self.content_type_extra,
+        )
+        staged.sha256 = self.hasher.hexdigest()
+        self.file = None
+        return staged
+
+    def upload_interrupted(self):
+        if self.file is not None:
+            self.file.close()
+            discard_staged_file(self.file.name)
+            self.file = None
+
+
+class StagedUploadMixin:
+    """
+    APIView 에 섞어 쓰는 믹스인. DRF 가 request.data 를 읽기 전에 업로드 핸들러를 교체합니다.
+    (upload_handlers 는 본문을 읽기 전에만 바꿀 수 있으므로 initialize_request 에서 설정합니다.)
+    """
+
+    def get_upload_dir(self):
+        # 임시 파일을 최종 경로와 같은 폴더에 두어야 os.replace 가 한 번에(원자적으로) 교체합니다.
+        return dataset_cache.get_excel_dir()
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [StagingUploadHandler(self.get_upload_dir(), request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+
+def _fingerprint_path(file_path):
+    return file_path + FINGERPRINT_SUFFIX
+
+
+def compute_fingerprint(file_path, chunk_size=1024 * 1024):
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def file_fingerprint(file_path):
+    """
+    저장된 파일의 SHA-256 지문. 옆에 저장해 둔 지문 파일(.sha256)을 쓰고,
+    없으면(이 기능 이전에 올라온 파일) 한 번 계산해 저장합니다. 파일이 없으면 None.
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open(_fingerprint_path(file_path), 'r', encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        digest = compute_fingerprint(file_path)
+        _write_fingerprint(file_path, digest)
+        return digest
+
+
+def _write_fingerprint(file_path, digest):
+    tmp_path = _fingerprint_path(file_path) + '.tmp'
+    with open(tmp_path, 'w', encoding='ascii') as f:
+        f.write(digest)
+    os.replace(tmp_path, _fingerprint_path(file_path))
+
+
+def install_staged_file(uploaded_file, dest_path):
+    """임시 파일을 최종 경로로 원자적으로 교체합니다. 교체하는 순간까지 기존 파일은 그대로 읽힙니다."""
+    uploaded_file.close()
+    # 교체 도중 실패해도 이전 지문이 새 파일의 지문으로 오인되지 않도록 먼저 지웁니다.
+    discard_staged_file(_fingerprint_path(dest_path))
+    os.replace(uploaded_file.staged_path, dest_path)
+    if uploaded_file.sha256:
+        _write_fingerprint(dest_path, uploaded_file.sha256)
+
+
+def install_uploads(uploads):
+    """
+    {file_type: StagedUploadedFile} 를 검증한 뒤 기존 파일과 교체합니다.
+    반환값은 (교체한 {file_type: 경로}, 기존 파일과 내용이 같아 건너뛴 file_type 목록) 입니다.
+    하나라도 구조가 잘못되었으면 ValueError 를 올리고, 어떤 파일도 교체하지 않습니다.
+    """
+    changed, unchanged = {}, []
+    for file_type in uploads:
+        # file_type 이 그대로 저장 경로가 되므로, 정해진 타입 밖의 값(예: '../x')은 받지 않습니다.
+        if file_type not in dataset_cache.FILE_TYPES:
+            raise ValueError(f"알 수 없는 파일 타입입니다: {file_type}")
+    for file_type, uploaded in uploads.items():
+        dest_path = dataset_cache.get_excel_path(file_type)
+        if uploaded.sha256 == file_fingerprint(dest_path):
+            unchanged.append(file_type)
+            continue
+        try:
+            search_logic.validate_workbook(uploaded.staged_path)
+        except ValueError as e:
+            raise ValueError(f"[{file_type}] {e}") from e
+        changed[file_type] = dest_path
+
+    for file_type, dest_path in changed.items():
+        # 덮어쓰기 전에 적재되어 있던 나가는 버전을 보관합니다. (적재되지 않은 파일은 여기서 파싱하지 않습니다)
+        dataset_cache.archive_current(dest_path)
+        install_staged_file(uploads[file_type], dest_path)
+    return changed, unchanged
+
+
+def discard_staged_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
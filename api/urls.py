@@ -3,20 +3,65 @@ from django.urls import path
 
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import CompanySearchView, GetSheetNamesView, ExcelFileUploadView, CheckFileStatusView
+from .views import (
+    CompanySearchView, AutocompleteView, GetSheetNamesView, ExcelFileUploadView, BulkExcelUploadView, CheckFileStatusView,
+    DatasetStatsView, DatasetDiffView, CompanyDetailView, CompanyLookupView, CreditExpiringView,
+    RecommendPartnerView, ShareRangeView, ConsortiumSweepView, ConsortiumSimulateView,
+    SearchExportView, ConsortiumExportView, SnapshotListView, ProfileListView, ProfileDetailView,
+)
+from . import async_views
 
 urlpatterns = [
     # --- 이 부분을 수정해주세요 ---
     # path('search/', SearchView.as_view(), name='company-search'),  <- 이 줄 대신
     path('search/', CompanySearchView.as_view(), name='company-search'), # <- 이렇게 원래의 View를 연결
+    path('autocomplete/', AutocompleteView.as_view(), name='company-autocomplete'),
 
     # --- 2. 새로운 API를 위한 URL 경로를 추가합니다. ---
     path('get_regions/', GetSheetNamesView.as_view(), name='get-sheet-names'),
 
     path('upload/', ExcelFileUploadView.as_view(), name='excel-upload'),
+    path('upload/bulk/', BulkExcelUploadView.as_view(), name='excel-bulk-upload'),
 
     path('check_files/', CheckFileStatusView.as_view(), name='check-files'),
 
+    # 지역별 요약상태 통계
+    path('stats/', DatasetStatsView.as_view(), name='dataset-stats'),
+
+    # 직전 버전 대비 변경된 업체
+    path('diff/', DatasetDiffView.as_view(), name='dataset-diff'),
+
+    # 보관된 과거 버전 목록 (검색/점수 API 의 as_of 로 조회)
+    path('snapshots/', SnapshotListView.as_view(), name='snapshot-list'),
+
+    # 사업자번호/업체명으로 바로 조회 (lookup/ 이 <biz_no>/ 보다 먼저 와야 합니다)
+    path('companies/lookup/', CompanyLookupView.as_view(), name='company-lookup'),
+    path('companies/<str:biz_no>/', CompanyDetailView.as_view(), name='company-detail'),
+
+    # 신용평가 유효기간 만료 예정 업체
+    path('credit/expiring/', CreditExpiringView.as_view(), name='credit-expiring'),
+
+    # 컨소시엄 파트너 후보 추천
+    path('recommend/', RecommendPartnerView.as_view(), name='recommend-partner'),
+
+    # 컨소시엄 계산
+    path('consortium/share_range/', ShareRangeView.as_view(), name='consortium-share-range'),
+    path('consortium/sweep/', ConsortiumSweepView.as_view(), name='consortium-sweep'),
+    path('consortium/simulate/', ConsortiumSimulateView.as_view(), name='consortium-simulate'),
+
+    # 검색/컨소시엄 결과 파일 내려받기 (CSV, XLSX)
+    path('export/search/', SearchExportView.as_view(), name='export-search'),
+    path('export/consortium/', ConsortiumExportView.as_view(), name='export-consortium'),
+
+    # ASGI 환경용 비동기 API (파싱은 별도 스레드 풀에서, 동시 요청은 한 번만 파싱)
+    path('async/search/', async_views.company_search, name='async-company-search'),
+    path('async/get_regions/', async_views.sheet_names, name='async-get-sheet-names'),
+    path('async/check_files/', async_views.check_file_status, name='async-check-files'),
+
+    # 요청 프로파일 (staff 전용)
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/<str:name>/', ProfileDetailView.as_view(), name='profile-detail'),
+
     # --------------------------
 ]
 
@@ -1,5 +1,6 @@
 # utils.py
 import re
+from datetime import datetime
 
 def parse_amount(amount_str):
     """'1억 5,000만' 같은 금액 문자열을 숫자로 변환합니다."""
@@ -26,4 +27,38 @@ def parse_amount(amount_str):
         except ValueError:
             pass
             
-    return total if total > 0 else None
\ No newline at end of file
+    return total if total > 0 else None
+
+
+def parse_ratio(value):
+    """'73.71', '73.71%' 같은 비율 값을 float 으로 변환합니다. 숫자가 아니면('계산불능', 빈 값 등) NaN."""
+    try:
+        return float(str(value).replace('%', '').strip())
+    except (ValueError, TypeError):
+        return float('nan')
+
+
+_CREDIT_PERIOD_PATTERN = re.compile(r'\((\d{2,4}[./-]\d{1,2}[./-]\d{1,2})~(\d{2,4}[./-]\d{1,2}[./-]\d{1,2})\)')
+_CREDIT_DATE_FORMATS = ('%Y.%m.%d', '%y.%m.%d', '%Y/%m/%d', '%y/%m/%d', '%Y-%m-%d', '%y-%m-%d')
+
+
+def _parse_credit_date(date_str):
+    # 날짜 구분자(., /, -)에 상관없이 파싱
+    for fmt in _CREDIT_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError("날짜 형식이 올바르지 않습니다.")
+
+
+def parse_credit_period(rating_str):
+    """
+    'A0 (24.06.30~25.06.29)' 같은 신용평가 문자열에서 (시작일, 종료일) date 튜플을 꺼냅니다.
+    기간이 없거나 날짜 형식이 틀리면 ValueError.
+    """
+    match = _CREDIT_PERIOD_PATTERN.search(str(rating_str).replace(" ", ""))
+    if not match:
+        raise ValueError("신용평가 기간을 찾을 수 없습니다.")
+    start_date_str, end_date_str = match.groups()
+    return _parse_credit_date(start_date_str), _parse_credit_date(end_date_str)
@@ -3,13 +3,108 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from django.conf import settings
+import logging
+import math
 import os
-from . import search_logic
+from datetime import date, datetime
+from . import search_logic, dataset_cache
+from .diff import diff_datasets
+from . import recommend, calculation_logic, query_cache, ranking, scenario, simulation, export, snapshots
+from .indexes import PrefixIndex
+from .config import CONSORTIUM_RULES, FILE_TYPE_INDUSTRY
+from .records import STATUS_CODES, SUMMARY_LABELS, normalize_biz_no, normalize_company_name
+from .profiling import profile_view, list_profiles, summarize_profile
+from .uploads import StagedUploadMixin, install_uploads, discard_staged_file
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from openpyxl import load_workbook
-from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+
+def parse_search_filters(query_params):
+    """URL 쿼리 파라미터에서 검색 필터 dict 를 만듭니다. (동기/비동기 검색 뷰 공용)"""
+    def get_int(param_name):
+        val = query_params.get(param_name)
+        try:
+            return int(float(val)) if val else None
+        except (ValueError, TypeError):
+            return None
+
+    def get_date(param_name):
+        val = query_params.get(param_name)
+        try:
+            return datetime.strptime(val.strip(), '%Y-%m-%d').date() if val else None
+        except ValueError:
+            return None
+
+    filters = {
+        'name': query_params.get('name'),
+        'region': query_params.get('region', '전체'),
+        'manager': query_params.get('manager'),
+        'min_sipyung': get_int('min_sipyung'),
+        'max_sipyung': get_int('max_sipyung'),
+        'min_3y': get_int('min_3y'),
+        'max_3y': get_int('max_3y'),
+        'min_5y': get_int('min_5y'),
+        'max_5y': get_int('max_5y'),
+        'status': parse_status_filter(query_params),
+        'credit_valid_on': get_date('credit_valid_on'),
+    }
+    return {k: v for k, v in filters.items() if v is not None and v != '' and v != []}
+
+
+def parse_status_filter(query_params):
+    """status=최신,1년 경과 또는 status=최신&status=1년 경과 형식의 요약상태 필터"""
+    labels = []
+    for raw in query_params.getlist('status'):
+        labels.extend(label.strip() for label in raw.split(',') if label.strip())
+    return [label for label in labels if label in SUMMARY_LABELS]
+
+
+def apply_sort_params(dataset, results, query_params, file_type):
+    """
+    sort / order / top 파라미터로 검색 결과를 정렬하고 상위 top 개만 남깁니다. 파라미터가 없으면 그대로 반환합니다.
+    sort=경영점수(score) 이면 rule(예: 행안부/30억미만)과 announcement_date 기준 점수로 정렬합니다.
+    값이 잘못되었으면 ValueError.
+    """
+    sort = query_params.get('sort')
+    top = query_params.get('top')
+    try:
+        top = int(top) if top else None
+    except ValueError:
+        raise ValueError("top 은 0 이상의 정수여야 합니다.") from None
+    if top is not None and top < 0:
+        raise ValueError("top 은 0 이상의 정수여야 합니다.")
+    if not sort:
+        return results if top is None else results[:top]
+
+    field = ranking.resolve_sort_field(sort)
+    order = query_params.get('order', 'desc')
+    if order not in ('asc', 'desc'):
+        raise ValueError("order 는 asc 또는 desc 입니다.")
+    try:
+        announcement_date = parse_date_param(query_params.get('announcement_date'))
+    except ValueError:
+        raise ValueError("announcement_date 는 YYYY-MM-DD 형식이어야 합니다.") from None
+    column = ranking.get_sort_column(
+        dataset, field,
+        industry=FILE_TYPE_INDUSTRY.get(file_type, '전기'),
+        rule=parse_rule_param(query_params.get('rule')),
+        announcement_date=announcement_date,
+    )
+    return ranking.sort_results(dataset, results, column, descending=order == 'desc', top=top)
+
+
+def build_search_response(results):
+    """검색 결과(CompanyRecord)를 기존 형태의 응답용 dict 목록으로 바꿉니다."""
+    response_rows = []
+    for company in results:
+        row = company.to_dict()
+        row['업체명'] = row['검색된 회사']
+        response_rows.append(row)
+    return response_rows
 
 
 class CompanySearchView(APIView):
@@ -28,8 +123,18 @@ class CompanySearchView(APIView):
             openapi.Parameter('max_3y', openapi.IN_QUERY, description="최대 3년 실적", type=openapi.TYPE_NUMBER),
             openapi.Parameter('min_5y', openapi.IN_QUERY, description="최소 5년 실적", type=openapi.TYPE_NUMBER),
             openapi.Parameter('max_5y', openapi.IN_QUERY, description="최대 5년 실적", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('status', openapi.IN_QUERY, description="요약상태 (최신, 1년 경과, 1년 이상 경과, 미지정 / 쉼표로 여러 개)", type=openapi.TYPE_STRING),
+            openapi.Parameter('credit_valid_on', openapi.IN_QUERY, description="이 날짜(YYYY-MM-DD)에 신용평가가 유효한 업체만", type=openapi.TYPE_STRING),
+            openapi.Parameter('sort', openapi.IN_QUERY, description="정렬 기준 (시평, 3년 실적, 5년 실적, 부채비율, 유동비율, 경영점수)", type=openapi.TYPE_STRING),
+            openapi.Parameter('order', openapi.IN_QUERY, description="정렬 방향 (desc 기본, asc)", type=openapi.TYPE_STRING),
+            openapi.Parameter('top', openapi.IN_QUERY, description="상위 N 개만 반환", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('rule', openapi.IN_QUERY, description="경영점수 정렬 시 규칙 (예: 행안부/30억미만)", type=openapi.TYPE_STRING),
+            openapi.Parameter('announcement_date', openapi.IN_QUERY, description="경영점수 정렬 시 공고일 YYYY-MM-DD (기본: 오늘)", type=openapi.TYPE_STRING),
+            openapi.Parameter('as_of', openapi.IN_QUERY, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전 (그 시점에 올라와 있던 자료로 검색)", type=openapi.TYPE_STRING),
+            openapi.Parameter('profile', openapi.IN_QUERY, description="1이면 이 요청을 프로파일링 (staff 전용)", type=openapi.TYPE_STRING),
         ]
     )
+    @profile_view
     def get(self, request, *args, **kwargs):
         # 1. 프론트에서 보낸 파일 타입을 받습니다. (기본값: 'eung')
         file_type = request.query_params.get('file_type', 'eung')
@@ -41,43 +146,93 @@ class CompanySearchView(APIView):
         # --- ▲▲▲ 여기까지 수정 ---
 
         # 3. URL 쿼리 파라미터에서 모든 필터 값을 가져옵니다.
-        # (이하 필터 로직은 이전과 동일)
-        def get_int(param_name):
-            val = request.query_params.get(param_name)
-            try:
-                return int(float(val)) if val else None
-            except (ValueError, TypeError):
-                return None
-
-        filters = {
-            'name': request.query_params.get('name'),
-            'region': request.query_params.get('region', '전체'),
-            'manager': request.query_params.get('manager'),
-            'min_sipyung': get_int('min_sipyung'),
-            'max_sipyung': get_int('max_sipyung'),
-            'min_3y': get_int('min_3y'),
-            'max_3y': get_int('max_3y'),
-            'min_5y': get_int('min_5y'),
-            'max_5y': get_int('max_5y'),
-        }
-        filters = {k: v for k, v in filters.items() if v is not None and v != ''}
+        filters = parse_search_filters(request.query_params)
+        as_of = request.query_params.get('as_of')
 
-        if not os.path.exists(excel_file_path):
+        if not as_of and not os.path.exists(excel_file_path):
             # 이제 파일이 없으면 검색 결과도 없고, 상태 표시도 '파일 없음'으로 일치하게 됩니다.
             return Response([], status=status.HTTP_200_OK)
 
         try:
-            results = search_logic.find_and_filter_companies(excel_file_path, filters)
+            if as_of:
+                # 과거 시점 검색은 보관된 스냅숏에서 합니다.
+                dataset, error = _load_dataset_or_error(file_type, as_of=as_of)
+                if error:
+                    return error
+            else:
+                # 파싱된 데이터셋은 캐시에서 가져오고(없으면 한 번만 파싱), 필터만 매번 적용합니다.
+                # 지역 검색이면 전체 데이터셋이 없어도 그 지역 시트만 읽어서 답합니다.
+                dataset = dataset_cache.get_dataset(excel_file_path, filters.get('region'))
+            # 같은 사용자가 방금 한 검색을 좁힌 것이면(타이핑 중) 이전 결과 안에서만 거릅니다.
+            results = query_cache.search(query_cache.client_key(request), dataset, filters)
+            try:
+                # 정렬/상위 N 개는 직렬화 전에 처리해, 필요한 행만 응답에 담습니다.
+                results = apply_sort_params(dataset, results, request.query_params, file_type)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(build_search_response(results), status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.exception("필터링 에러 발생: %s", e)
+            return Response({"error": f"검색 중 오류가 발생했습니다: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 
-            for company in results:
-                if '검색된 회사' in company:
-                    company['업체명'] = company['검색된 회사']
+def _name_prefix_index(dataset):
+    return dataset.derived('name_prefix', lambda ds: PrefixIndex(normalize_company_name(comp.name) for comp in ds.companies))
 
-            return Response(results, status=status.HTTP_200_OK)
 
+class AutocompleteView(APIView):
+    """
+    업체명 자동완성 API. 입력한 글자로 시작하는 업체명(법인 표기/공백 무시)을 가나다순으로 최대 limit 개 돌려줍니다.
+    """
+    MAX_LIMIT = 50
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="입력 중인 업체명", type=openapi.TYPE_STRING),
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+            openapi.Parameter('region', openapi.IN_QUERY, description="지역", type=openapi.TYPE_STRING),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="최대 개수 (기본값: 10)", type=openapi.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        prefix = normalize_company_name(request.query_params.get('q'))
+        if not prefix:
+            return Response([], status=status.HTTP_200_OK)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), self.MAX_LIMIT))
+        except (ValueError, TypeError):
+            limit = 10
+
+        excel_file_path = dataset_cache.get_excel_path(request.query_params.get('file_type', 'eung'))
+        if not os.path.exists(excel_file_path):
+            return Response([], status=status.HTTP_200_OK)
+        region = request.query_params.get('region')
+        region = None if not region or region.strip() == '전체' else region.strip()
+        try:
+            dataset = dataset_cache.get_dataset(excel_file_path, region)
         except Exception as e:
-            print(f"!!! 필터링 에러 발생: {e}")
-            return Response({"error": f"검색 중 오류가 발생했습니다: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response({"error": f"데이터를 읽는 중 오류가 발생했습니다: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        companies = dataset.companies
+        seen = set()
+
+        def accept(pos):
+            # 같은 업체가 여러 행에 있으면 한 번만 보여줍니다.
+            comp = companies[pos]
+            if region is not None and comp.region != region:
+                return False
+            key = (comp.name, comp.value('사업자번호'))
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+        positions = _name_prefix_index(dataset).search(prefix, limit, accept)
+        return Response([
+            {"업체명": companies[pos].name, "사업자번호": companies[pos].value('사업자번호'), "지역": companies[pos].region}
+            for pos in positions
+        ], status=status.HTTP_200_OK)
 
 
 class GetSheetNamesView(APIView):
@@ -99,18 +254,13 @@ class GetSheetNamesView(APIView):
             return Response([], status=status.HTTP_200_OK)
 
         try:
-            workbook = load_workbook(filename=excel_file_path, read_only=True, keep_links=False)
-            sheet_names = workbook.sheetnames
+            sheet_names = dataset_cache.get_sheet_names(excel_file_path)
             return Response(sheet_names, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": f"시트 이름을 읽는 중 오류 발생: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        finally:
-            # --- [핵심] 작업이 끝나면 무조건 파일을 닫습니다. ---
-            if workbook:
-                workbook.close()
 
 
-class ExcelFileUploadView(APIView):
+class ExcelFileUploadView(StagedUploadMixin, APIView):
     """
     엑셀 파일을 서버에 업로드하는 API.
     파일 타입(eung, tongsin, sobang)에 따라 정해진 이름으로 저장합니다.
@@ -120,24 +270,96 @@ class ExcelFileUploadView(APIView):
         file_obj = request.data.get('file')
         file_type = request.data.get('type')  # 'eung', 'tongsin', 'sobang'
 
-        if not file_obj or not file_type:
-            return Response({"error": "파일과 타입이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            if not file_obj or not file_type:
+                return Response({"error": "파일과 타입이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+            if file_type not in dataset_cache.FILE_TYPES:
+                return Response({"error": f"알 수 없는 파일 타입입니다. ({', '.join(dataset_cache.FILE_TYPES)} 중 하나)"},
+                                status=status.HTTP_400_BAD_REQUEST)
 
-        # media/excel/ 폴더에 저장하도록 경로 설정
-        upload_dir = os.path.join(settings.MEDIA_ROOT, 'excel')
+            # 파일 타입에 따라 파일명 고정 (예: eung.xlsx)
+            file_name = f"{file_type}.xlsx"
+
+            # 업로드 중에는 임시 파일(.part)에 기록하고, 구조를 검증한 뒤 기존 파일과 한 번에 교체합니다.
+            try:
+                changed, unchanged = install_uploads({file_type: file_obj})
+            except ValueError as e:
+                return Response({"error": f"올바른 업체 엑셀 파일이 아닙니다. {e}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 파일 타입에 따라 파일명 고정 (예: eung.xlsx)
-        file_name = f"{file_type}.xlsx"
+            if unchanged:
+                # 같은 내용이면 파일을 건드리지 않으므로 캐시와 인덱스가 그대로 유지됩니다.
+                return Response({"message": f"'{file_name}' 파일이 기존 파일과 같아 변경하지 않았습니다.", "changed": False},
+                                status=status.HTTP_200_OK)
+            return Response({"message": f"'{file_name}' 파일이 성공적으로 업로드되었습니다.", "changed": True},
+                            status=status.HTTP_201_CREATED)
+        finally:
+            for _, files in request.FILES.lists():   # 같은 필드로 여러 파일이 와도 모두 지웁니다.
+                for uploaded in files:
+                    discard_staged_file(uploaded.staged_path)
 
-        fs = FileSystemStorage(location=upload_dir)
 
-        # 만약 같은 이름의 파일이 이미 있다면 덮어쓰기
-        if fs.exists(file_name):
-            fs.delete(file_name)
+class BulkExcelUploadView(StagedUploadMixin, APIView):
+    """
+    eung/tongsin/sobang 엑셀 파일을 한 번에 업로드하는 API.
+    multipart 필드 이름이 파일 타입입니다. (예: eung=@eung.xlsx, tongsin=@tongsin.xlsx)
+    저장한 파일은 병렬로 파싱해 캐시에 넣고, 모두 검색 가능한 상태가 된 뒤에 응답합니다.
+    기존 파일과 내용이 같은 파일은 교체하지 않고, 구조가 잘못된 파일이 있으면 아무것도 교체하지 않습니다.
+    """
 
-        fs.save(file_name, file_obj)
+    def post(self, request, *args, **kwargs):
+        try:
+            uploads = {
+                file_type: request.FILES[file_type]
+                for file_type in dataset_cache.FILE_TYPES if file_type in request.FILES
+            }
+            if not uploads:
+                return Response(
+                    {"error": f"업로드할 파일이 없습니다. ({', '.join(dataset_cache.FILE_TYPES)} 필드로 보내주세요.)"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        return Response({"message": f"'{file_name}' 파일이 성공적으로 업로드되었습니다."}, status=status.HTTP_201_CREATED)
+            try:
+                paths, unchanged = install_uploads(uploads)
+            except ValueError as e:
+                return Response({"error": f"올바른 업체 엑셀 파일이 아닙니다. {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            # 교체하지 않은 임시 파일(알 수 없는 필드, 동일한 파일, 오류 등)은 지웁니다.
+            for _, files in request.FILES.lists():   # 같은 필드로 여러 파일이 와도 모두 지웁니다.
+                for uploaded in files:
+                    discard_staged_file(uploaded.staged_path)
+
+        results = dataset_cache.ingest(list(paths.values())) if paths else {}
+
+        files = {}
+        failed = False
+        for file_type in unchanged:
+            dataset = dataset_cache.get_cached_dataset(dataset_cache.get_excel_path(file_type))
+            files[file_type] = {"status": "변경 없음"}
+            if dataset is not None:
+                files[file_type]["companies"] = len(dataset)
+        for file_type, file_path in paths.items():
+            result = results[file_path]
+            if isinstance(result, Exception):
+                failed = True
+                files[file_type] = {"status": "오류", "error": str(result)}
+            else:
+                files[file_type] = {
+                    "status": "완료",
+                    "companies": len(result),
+                    "parse_seconds": round(result.parse_seconds, 3),
+                }
+                previous = dataset_cache.get_previous_dataset(file_path)
+                if previous is not None:
+                    files[file_type]["diff"] = diff_datasets(previous, result)["summary"]
+
+        if failed:
+            return Response({"error": "일부 파일을 읽는 중 오류가 발생했습니다.", "files": files},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if not paths:
+            return Response({"message": "모든 파일이 기존 파일과 같아 변경하지 않았습니다.", "files": files},
+                            status=status.HTTP_200_OK)
+        return Response({"message": f"{len(paths)}개 파일이 교체되어 검색 가능한 상태입니다.", "files": files},
+                        status=status.HTTP_201_CREATED)
 
 
 class CheckFileStatusView(APIView):
@@ -148,7 +370,7 @@ class CheckFileStatusView(APIView):
     def get(self, request, *args, **kwargs):
         upload_dir = os.path.join(settings.MEDIA_ROOT, 'excel')
 
-        file_types = ['eung', 'tongsin', 'sobang']
+        file_types = dataset_cache.FILE_TYPES
         # --- 2. 변수 이름을 status에서 file_statuses로 변경하여 충돌을 피합니다. ---
         file_statuses = {}
 
@@ -157,4 +379,700 @@ class CheckFileStatusView(APIView):
             file_statuses[file_type] = os.path.exists(file_path)
 
         # --- 3. 이제 status.HTTP_200_OK가 올바르게 작동합니다. ---
-        return Response(file_statuses, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(file_statuses, status=status.HTTP_200_OK)
+
+
+class DatasetStatsView(APIView):
+    """
+    지역별 요약상태(최신/1년 경과/...) 업체 수를 돌려주는 API. 적재 시점에 미리 계산된 값을 사용합니다.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        file_type = request.query_params.get('file_type', 'eung')
+        excel_file_path = dataset_cache.get_excel_path(file_type)
+        if not os.path.exists(excel_file_path):
+            return Response({"file_type": file_type, "total": 0, "statuses": {}, "regions": {}}, status=status.HTTP_200_OK)
+
+        try:
+            dataset = dataset_cache.get_dataset(excel_file_path)
+            return Response({"file_type": file_type, **dataset.stats}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": f"통계 계산 중 오류가 발생했습니다: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _load_dataset_or_error(file_type, region=None, as_of=None):
+    """
+    (dataset, None) 또는 (None, 오류 Response) 를 반환합니다. region 을 주면 그 지역 데이터셋.
+    as_of(YYYY-MM-DD 또는 버전 이름)를 주면 그 시점에 보관된 과거 버전의 전체 데이터셋.
+    """
+    if as_of:
+        try:
+            return snapshots.get_dataset(file_type, as_of), None
+        except ValueError as e:
+            return None, Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except LookupError as e:
+            return None, Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.exception("스냅숏 읽기 실패: %s %s", file_type, as_of)
+            return None, Response({"error": f"과거 데이터를 읽는 중 오류가 발생했습니다: {str(e)}"},
+                                  status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    excel_file_path = dataset_cache.get_excel_path(file_type)
+    if not os.path.exists(excel_file_path):
+        return None, Response({"error": "파일이 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        return dataset_cache.get_dataset(excel_file_path, region), None
+    except Exception as e:
+        return None, Response({"error": f"데이터를 읽는 중 오류가 발생했습니다: {str(e)}"},
+                              status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CreditExpiringView(APIView):
+    """
+    신용평가 유효기간이 곧 끝나는 업체 목록 API. (예: 다음 주 공고일 전에 만료되는 파트너)
+    종료일이 after(기본: 오늘) 이상 before 미만인 업체를 종료일 순으로 돌려줍니다.
+    적재 시점에 만든 유효기간 인덱스에서 찾으므로 업체마다 신용평가 문자열을 다시 읽지 않습니다.
+    """
+    MAX_LIMIT = 5000
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('before', openapi.IN_QUERY, description="이 날짜(YYYY-MM-DD) 전에 만료 (공고일 등, 필수)", type=openapi.TYPE_STRING),
+            openapi.Parameter('after', openapi.IN_QUERY, description="이 날짜 이후에 만료 (기본: 오늘)", type=openapi.TYPE_STRING),
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+            openapi.Parameter('region', openapi.IN_QUERY, description="지역", type=openapi.TYPE_STRING),
+            openapi.Parameter('status', openapi.IN_QUERY, description="요약상태 (쉼표로 여러 개)", type=openapi.TYPE_STRING),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="최대 개수 (기본값: 500)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('as_of', openapi.IN_QUERY, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        if not params.get('before'):
+            return Response({"error": "before(YYYY-MM-DD)가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            before = parse_date_param(params.get('before'))
+            after = parse_date_param(params.get('after'))
+            limit = max(1, min(int(params.get('limit', 500)), self.MAX_LIMIT))
+        except (ValueError, TypeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        if before <= after:
+            return Response({"error": "before 는 after 보다 뒤의 날짜여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_type = params.get('file_type', 'eung')
+        region = params.get('region')
+        region = None if not region or region.strip() == '전체' else region.strip()
+        dataset, error = _load_dataset_or_error(file_type, region, as_of=params.get('as_of'))
+        if error:
+            return error
+
+        mask = dataset.all_mask
+        if region is not None:
+            mask &= dataset.region_index.get(region)
+        labels = parse_status_filter(params)
+        if labels:
+            mask &= dataset.status_index.any_of(STATUS_CODES[label] for label in labels)
+
+        today = date.today()
+        expiring = [interval for interval in dataset.credit_index.ending_between(after, before) if mask >> interval[0] & 1]
+        results = []
+        for pos, start, end in expiring[:limit]:
+            comp = dataset.companies[pos]
+            results.append({
+                "검색된 회사": comp.name,
+                "대표지역": comp.region,
+                "사업자번호": comp.value('사업자번호'),
+                "신용평가": comp.value('신용평가'),
+                "시작일": start.isoformat(),
+                "종료일": end.isoformat(),
+                "남은 일수": (end - today).days,
+                "요약상태": comp.summary_status,
+            })
+        return Response({
+            "file_type": file_type,
+            "after": after.isoformat(),
+            "before": before.isoformat(),
+            "total": len(expiring),
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+def _pick_by_region(matches, region):
+    """같은 키의 업체가 여러 개면 region 과 같은 지역의 업체를 우선합니다."""
+    if region:
+        for comp in matches:
+            if comp.region == region.strip():
+                return comp
+    return matches[0] if matches else None
+
+
+class CompanyDetailView(APIView):
+    """
+    사업자번호로 업체 한 곳을 바로 조회하는 API (하이픈 유무 무관).
+    같은 사업자번호가 여러 지역 시트에 있으면 region 의 업체를, 없으면 첫 번째 업체를 돌려줍니다.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+            openapi.Parameter('region', openapi.IN_QUERY, description="지역 (같은 사업자번호가 여러 지역에 있을 때)", type=openapi.TYPE_STRING),
+            openapi.Parameter('as_of', openapi.IN_QUERY, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, biz_no, *args, **kwargs):
+        dataset, error = _load_dataset_or_error(request.query_params.get('file_type', 'eung'),
+                                                as_of=request.query_params.get('as_of'))
+        if error:
+            return error
+
+        company = _pick_by_region(dataset.find_by_biz_no(biz_no), request.query_params.get('region'))
+        if company is None:
+            return Response({"error": "해당 사업자번호의 업체가 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(build_search_response([company])[0], status=status.HTTP_200_OK)
+
+
+class CompanyLookupView(APIView):
+    """
+    여러 업체를 한 번에 조회하는 API. 사업자번호 또는 업체명(법인 표기/공백 무시, 정확히 일치)으로 찾습니다.
+    요청 예: {"file_type": "eung", "biz_nos": ["144-86-02239"], "names": ["경우전기"], "region": "서울"}
+    결과는 요청 순서대로 {"key", "by", "company"} 이며, 찾지 못하면 company 가 null 입니다.
+    """
+    MAX_KEYS = 500
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'biz_nos': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="사업자번호 목록"),
+                'names': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="업체명 목록"),
+                'region': openapi.Schema(type=openapi.TYPE_STRING, description="우선할 지역"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+            },
+        )
+    )
+    def post(self, request, *args, **kwargs):
+        biz_nos = request.data.get('biz_nos') or []
+        names = request.data.get('names') or []
+        if not isinstance(biz_nos, list) or not isinstance(names, list):
+            return Response({"error": "biz_nos 와 names 는 목록이어야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if not biz_nos and not names:
+            return Response({"error": "조회할 사업자번호 또는 업체명이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(biz_nos) + len(names) > self.MAX_KEYS:
+            return Response({"error": f"한 번에 최대 {self.MAX_KEYS}개까지 조회할 수 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dataset, error = _load_dataset_or_error(request.data.get('file_type', 'eung'), as_of=request.data.get('as_of'))
+        if error:
+            return error
+
+        region = request.data.get('region')
+        results = []
+        for by, keys, find in (('biz_no', biz_nos, dataset.find_by_biz_no), ('name', names, dataset.find_by_name)):
+            for key in keys:
+                company = _pick_by_region(find(key), region)
+                results.append({
+                    "key": key,
+                    "by": by,
+                    "company": build_search_response([company])[0] if company is not None else None,
+                })
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class DatasetDiffView(APIView):
+    """
+    새 엑셀 파일이 반영되기 직전 버전과 비교해 추가/삭제/변경(시평, 실적, 부채비율, 상태 색상)된 업체를 돌려주는 API.
+    이전 버전은 서버가 파일을 교체하며 메모리에 보관한 것이므로, 서버 재시작 후에는 다음 교체 때부터 볼 수 있습니다.
+    as_of 를 주면 직전 버전 대신 그 시점에 보관된 스냅숏과 비교합니다.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+            openapi.Parameter('as_of', openapi.IN_QUERY, description="비교할 과거 시점 YYYY-MM-DD 또는 스냅숏 버전 (기본: 직전 버전)", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        file_type = request.query_params.get('file_type', 'eung')
+        current, error = _load_dataset_or_error(file_type)
+        if error:
+            return error
+
+        as_of = request.query_params.get('as_of')
+        if as_of:
+            previous, error = _load_dataset_or_error(file_type, as_of=as_of)
+            if error:
+                return error
+        else:
+            previous = dataset_cache.get_previous_dataset(current.file_path)
+            if previous is None:
+                return Response({"error": "비교할 이전 버전이 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        diff = diff_datasets(previous, current)
+        return Response({
+            "file_type": file_type,
+            "previous": {"loaded_at": previous.loaded_at, "companies": len(previous), "version": previous.version},
+            "current": {"loaded_at": current.loaded_at, "companies": len(current), "version": current.version},
+            **diff,
+        }, status=status.HTTP_200_OK)
+
+
+def parse_date_param(value):
+    """'YYYY-MM-DD' 문자열을 date 로 바꿉니다. 값이 없으면 오늘 날짜. 형식이 틀리면 ValueError."""
+    if not value:
+        return date.today()
+    return datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+def parse_rule_param(value):
+    """["행안부", "30억미만"] 형식의 규칙을 검증해 튜플로 반환합니다. 틀리면 ValueError."""
+    if not value:
+        return recommend.DEFAULT_RULE
+    if isinstance(value, str):
+        value = value.split('/')
+    if len(value) != 2 or value[0] not in CONSORTIUM_RULES or value[1] not in CONSORTIUM_RULES[value[0]]:
+        raise ValueError(f"알 수 없는 규칙입니다: {value}")
+    return tuple(value)
+
+
+class RecommendPartnerView(APIView):
+    """
+    대표사와 같은 지역의 파트너 후보를 추천하는 API.
+    시평/실적/재무비율/경영상태 점수로 만든 특성 벡터가 목표(기본: 대표사)와 가까운 순서로 k 개를 돌려줍니다.
+    complement={"시평": 필요금액, "5년 실적": 필요금액} 을 주면 대표사에 부족한 만큼을 채울 업체를 찾습니다.
+    """
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'lead': openapi.Schema(type=openapi.TYPE_STRING, description="대표사 사업자번호"),
+                'lead_name': openapi.Schema(type=openapi.TYPE_STRING, description="대표사 업체명 (사업자번호 대신)"),
+                'region': openapi.Schema(type=openapi.TYPE_STRING, description="후보 지역 (기본: 대표사 지역, '전체'면 제한 없음)"),
+                'k': openapi.Schema(type=openapi.TYPE_INTEGER, description="추천 개수 (기본값: 10, 최대 100)"),
+                'latest_only': openapi.Schema(type=openapi.TYPE_BOOLEAN, description="요약상태 '최신' 업체만 (기본값: true)"),
+                'rule': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="경영점수 규칙 (예: [\"행안부\", \"30억미만\"])"),
+                'announcement_date': openapi.Schema(type=openapi.TYPE_STRING, description="공고일 YYYY-MM-DD (기본: 오늘)"),
+                'targets': openapi.Schema(type=openapi.TYPE_OBJECT, description="특성별 목표값 (예: {\"시평\": 5000000000})"),
+                'complement': openapi.Schema(type=openapi.TYPE_OBJECT, description="필요 금액 (예: {\"시평\": 8000000000})"),
+                'weights': openapi.Schema(type=openapi.TYPE_OBJECT, description="특성별 가중치"),
+                'min_business_score': openapi.Schema(type=openapi.TYPE_NUMBER, description="최소 경영상태 점수"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+            },
+        )
+    )
+    @profile_view
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        file_type = data.get('file_type', 'eung')
+        industry = FILE_TYPE_INDUSTRY.get(file_type)
+        if industry is None:
+            return Response({"error": "알 수 없는 파일 타입입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rule = parse_rule_param(data.get('rule'))
+            announcement_date = parse_date_param(data.get('announcement_date'))
+            k = max(1, min(int(data.get('k', 10)), 100))
+            min_business_score = data.get('min_business_score')
+            min_business_score = float(min_business_score) if min_business_score not in (None, '') else None
+        except (ValueError, TypeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        dataset, error = _load_dataset_or_error(file_type, as_of=data.get('as_of'))
+        if error:
+            return error
+
+        if data.get('lead'):
+            leads = dataset.biz_no_index.get(normalize_biz_no(data['lead']), ())
+        else:
+            leads = dataset.name_index.get(normalize_company_name(data.get('lead_name')), ())
+        if not leads:
+            return Response({"error": "대표사를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        lead_position = leads[0]
+        lead = dataset.companies[lead_position]
+
+        region = data.get('region') or lead.region
+        matrix = recommend.get_feature_matrix(dataset, industry, rule, announcement_date)
+        try:
+            matches = recommend.recommend(
+                dataset, matrix, lead_position, k=k,
+                region=None if region == '전체' else region.strip(),
+                latest_only=data.get('latest_only', True) not in (False, 'false', '0', 0),
+                targets=data.get('targets'), complement=data.get('complement'), weights=data.get('weights'),
+                min_business_score=min_business_score,
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "lead": {**build_search_response([lead])[0], "특성": recommend.feature_values(matrix, lead_position)},
+            "rule": list(rule),
+            "results": [
+                {
+                    "company": build_search_response([dataset.companies[pos]])[0],
+                    "distance": round(distance, 4),
+                    "특성": recommend.feature_values(matrix, pos),
+                }
+                for pos, distance in matches
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+def resolve_consortium_members(members, file_type, as_of=None):
+    """
+    [{"biz_no": ..., "share": ...} 또는 {"data": {업체 dict}, "share": ...}] 를
+    calculate_consortium 이 받는 형식({"data", "share", "role", "name", "source_type"})으로 바꿉니다.
+    biz_no 로 온 업체는 캐시된 데이터셋(as_of 를 주면 그 시점의 스냅숏)에서 찾습니다. 찾지 못하면 ValueError.
+    """
+    if not isinstance(members, list) or not members:
+        raise ValueError("companies 목록이 필요합니다.")
+
+    dataset = None
+    resolved = []
+    for idx, member in enumerate(members):
+        if not isinstance(member, dict):
+            raise ValueError(f"{idx + 1}번째 업체 형식이 올바르지 않습니다.")
+        data = member.get('data')
+        if data is None:
+            if dataset is None:
+                dataset, error = _load_dataset_or_error(member.get('file_type', file_type), as_of=as_of)
+                if error:
+                    raise ValueError(error.data["error"])
+            company = _pick_by_region(dataset.find_by_biz_no(member.get('biz_no')), member.get('region'))
+            if company is None:
+                raise ValueError(f"사업자번호 '{member.get('biz_no')}' 업체를 찾을 수 없습니다.")
+            data = company.to_dict()
+        resolved.append({
+            "data": data,
+            "share": float(member['share']) if member.get('share') not in (None, '') else None,
+            "role": member.get('role'),
+            "name": data.get("검색된 회사", ""),
+            "source_type": member.get('source_type') or FILE_TYPE_INDUSTRY.get(file_type, '전기'),
+        })
+    return resolved
+
+
+class ShareRangeView(APIView):
+    """
+    컨소시엄 구성원별로 가능한 지분율 범위(최소~최대)를 계산하는 API.
+    지분 합계 100%, 업체별 시평/투찰금액 상한, 시평액 비율제/합산제 조건을 모두 만족하는 범위입니다.
+    """
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="biz_no 로 찾을 업체의 과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+                'companies': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                                            description="[{\"biz_no\": 사업자번호, \"share\": 지분율(선택)}] 또는 [{\"data\": 업체 데이터}]"),
+                'tuchal_amount': openapi.Schema(type=openapi.TYPE_NUMBER, description="투찰금액"),
+                'sipyung': openapi.Schema(type=openapi.TYPE_OBJECT, description="{\"is_limited\": bool, \"limit_amount\": 금액, \"method\": \"비율제\"|\"합산제\"}"),
+                'min_share': openapi.Schema(type=openapi.TYPE_NUMBER, description="업체별 최소 지분율 (기본값: 0)"),
+            },
+        )
+    )
+    @profile_view
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        try:
+            members = resolve_consortium_members(data.get('companies'), data.get('file_type', 'eung'), data.get('as_of'))
+            tuchal_amount = float(data.get('tuchal_amount') or 0)
+            min_share = float(data.get('min_share') or 0)
+            sipyung_info = data.get('sipyung') or {}
+            if not isinstance(sipyung_info, dict):
+                raise ValueError("sipyung 형식이 올바르지 않습니다.")
+        except (ValueError, TypeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = calculation_logic.solve_share_ranges(members, tuchal_amount, sipyung_info, min_share)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class ConsortiumSweepView(APIView):
+    """
+    한 컨소시엄 구성을 여러 기준금액과 공고일에 대해 한 번에 평가하는 API.
+    금액별 시공경험 점수, 날짜별 경영상태 점수, 날짜 x 금액 예상 점수와 점수가 바뀌는 경계를 돌려줍니다.
+    """
+    MAX_POINTS = 200000
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="biz_no 로 찾을 업체의 과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+                'companies': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                                            description="[{\"biz_no\": 사업자번호, \"share\": 지분}] 또는 [{\"data\": 업체 데이터, \"share\": 지분}]"),
+                'rule': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="규칙 (예: [\"행안부\", \"30억미만\"])"),
+                'prices': openapi.Schema(type=openapi.TYPE_OBJECT, description="기준금액 {\"start\", \"stop\", \"count\"|\"step\"} 또는 금액 목록 (규칙의 추정가격/기초금액에 적용)"),
+                'dates': openapi.Schema(type=openapi.TYPE_OBJECT, description="공고일 {\"start\", \"end\", \"step_days\"} 또는 YYYY-MM-DD 목록 (기본: 오늘)"),
+            },
+        )
+    )
+    @profile_view
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        try:
+            rule = parse_rule_param(data.get('rule'))
+            prices = scenario.price_grid(data.get('prices'))
+            dates = scenario.date_grid(data.get('dates'))
+            if len(prices) * len(dates) > self.MAX_POINTS:
+                raise ValueError(f"평가 지점은 최대 {self.MAX_POINTS}개입니다. (요청: {len(prices) * len(dates)}개)")
+            members = resolve_consortium_members(data.get('companies'), data.get('file_type', 'eung'), data.get('as_of'))
+            result = scenario.sweep(members, rule, prices, dates)
+        except (ValueError, TypeError, KeyError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+def calculate_consortium_teams(data, max_teams):
+    """
+    요청 본문의 teams([{"name", "companies": [...]}])를 price_data/announcement_date/rule/sipyung/region_limit
+    조건으로 calculate_consortium 에 넣고 [(팀 요청, 구성원, 계산 결과)] 를 반환합니다. 값이 틀리면 ValueError.
+    """
+    file_type = data.get('file_type', 'eung')
+    rule = parse_rule_param(data.get('rule'))
+    announcement_date = parse_date_param(data.get('announcement_date'))
+    price_data = data.get('price_data') or {}
+    sipyung_info = data.get('sipyung') or {}
+    teams = data.get('teams')
+    if not isinstance(teams, list) or not teams:
+        raise ValueError("teams 목록이 필요합니다.")
+    if len(teams) > max_teams:
+        raise ValueError(f"팀은 최대 {max_teams}개까지 가능합니다.")
+    if not isinstance(price_data, dict) or not price_data or not isinstance(sipyung_info, dict):
+        raise ValueError("price_data/sipyung 형식이 올바르지 않습니다.")
+    # 규칙마다 시공경험 점수의 기준금액(추정가격 또는 기초금액)이 다르고, 0 이면 점수 계산에서 0으로 나누게 됩니다.
+    base_key = CONSORTIUM_RULES[rule[0]][rule[1]].get("performance_base_key", "estimation_price")
+    try:
+        base_amount = float(price_data.get(base_key))
+    except (TypeError, ValueError):
+        base_amount = None
+    if base_amount is None or not math.isfinite(base_amount) or base_amount <= 0:
+        raise ValueError(f"price_data.{base_key} 에 0보다 큰 금액이 필요합니다. (규칙: {'/'.join(rule)})")
+    price_data = {**price_data, base_key: base_amount}
+
+    calculated = []
+    for idx, team in enumerate(teams):
+        members = resolve_consortium_members(team.get('companies'), file_type, data.get('as_of'))
+        if any(member['share'] is None for member in members):
+            raise ValueError(f"{idx + 1}번째 팀에 지분율(share)이 없는 업체가 있습니다.")
+        result = calculation_logic.calculate_consortium(
+            members, price_data, announcement_date, rule, sipyung_info, data.get('region_limit') or "전체")
+        if result is None:
+            raise ValueError(f"{idx + 1}번째 팀의 점수를 계산할 수 없습니다.")
+        calculated.append((team, members, result))
+    return calculated
+
+
+def _team_name(team, members):
+    return team.get('name') or " + ".join(member['name'] for member in members)
+
+
+class ConsortiumSimulateView(APIView):
+    """
+    후보 컨소시엄들의 입찰 결과를 몬테카를로로 시뮬레이션하는 API.
+    경영상태/시공경험 점수는 calculate_consortium 과 같고, 입찰가격 점수는 사정률/낙찰하한율 추첨으로 구합니다.
+    팀별 통과 확률(win_probability)과 점수 백분위를 돌려줍니다. 같은 seed 면 같은 결과가 나옵니다.
+    """
+    MAX_TEAMS = 20
+    MAX_DRAWS = 1000000
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="biz_no 로 찾을 업체의 과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+                'teams': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                                        description="[{\"name\": 팀 이름, \"companies\": [{\"biz_no\", \"share\"}], \"bid_rate\": 기초금액 대비 투찰률(%)}]"),
+                'price_data': openapi.Schema(type=openapi.TYPE_OBJECT, description="{\"estimation_price\": 추정가격, \"notice_base_amount\": 기초금액}"),
+                'announcement_date': openapi.Schema(type=openapi.TYPE_STRING, description="공고일 YYYY-MM-DD (기본: 오늘)"),
+                'rule': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="규칙 (예: [\"행안부\", \"30억미만\"])"),
+                'sipyung': openapi.Schema(type=openapi.TYPE_OBJECT, description="시평액 제한 정보"),
+                'region_limit': openapi.Schema(type=openapi.TYPE_STRING, description="지역 제한 (기본: 전체)"),
+                'draws': openapi.Schema(type=openapi.TYPE_INTEGER, description=f"팀별 추첨 횟수 (기본값: {simulation.DEFAULT_DRAWS})"),
+                'seed': openapi.Schema(type=openapi.TYPE_INTEGER, description=f"난수 시드 (기본값: {simulation.DEFAULT_SEED})"),
+                'price_model': openapi.Schema(type=openapi.TYPE_OBJECT, description="입찰가격 점수 설정 덮어쓰기 (config.PRICE_SCORE_SIMULATION 항목)"),
+            },
+        )
+    )
+    @profile_view
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        try:
+            model = simulation.price_model(data.get('price_model'))
+            draws = int(data['draws']) if data.get('draws') not in (None, '') else simulation.DEFAULT_DRAWS
+            seed = int(data.get('seed') if data.get('seed') not in (None, '') else simulation.DEFAULT_SEED)
+            if not 0 < draws <= self.MAX_DRAWS:
+                raise ValueError(f"추첨은 1~{self.MAX_DRAWS}회까지 가능합니다.")
+            prepared = []
+            for team, members, result in calculate_consortium_teams(data, self.MAX_TEAMS):
+                bid_rate = float(team['bid_rate']) if team.get('bid_rate') not in (None, '') else simulation.default_bid_rate(model)
+                prepared.append((team, members, result, bid_rate))
+        except (ValueError, TypeError, AttributeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        outcomes = simulation.simulate_teams(
+            [(result["final_business_score"] + result["final_performance_score"], bid_rate)
+             for _, _, result, bid_rate in prepared],
+            model, draws=draws, seed=seed,
+        )
+        response = []
+        for (team, members, result, bid_rate), outcome in zip(prepared, outcomes):
+            response.append({
+                "name": _team_name(team, members),
+                "final_business_score": result["final_business_score"],
+                "final_performance_score": result["final_performance_score"],
+                "bid_rate": bid_rate,
+                **outcome,
+            })
+        return Response({"seed": seed, "price_model": model, "teams": response}, status=status.HTTP_200_OK)
+
+
+def _export_format(value):
+    export_format = (value or 'csv').lower()
+    if export_format not in export.EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {value} (가능: {', '.join(export.EXPORT_FORMATS)})")
+    return export_format
+
+
+class SearchExportView(APIView):
+    """
+    검색 결과를 CSV/XLSX 파일로 내려받는 API. 검색 API 와 같은 필터/정렬 파라미터를 받습니다.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('export_format', openapi.IN_QUERY, description="파일 형식 (csv 기본, xlsx)", type=openapi.TYPE_STRING),
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+            openapi.Parameter('region', openapi.IN_QUERY, description="지역 (그 밖의 필터/정렬은 검색 API 와 같음)", type=openapi.TYPE_STRING),
+            openapi.Parameter('as_of', openapi.IN_QUERY, description="과거 시점 YYYY-MM-DD 또는 스냅숏 버전", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        file_type = request.query_params.get('file_type', 'eung')
+        filters = parse_search_filters(request.query_params)
+        try:
+            export_format = _export_format(request.query_params.get('export_format'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        as_of = request.query_params.get('as_of')
+        dataset, error = _load_dataset_or_error(file_type, filters.get('region'), as_of=as_of)
+        if error:
+            return error
+        results = search_logic.search_dataset(dataset, filters)
+        try:
+            results = apply_sort_params(dataset, results, request.query_params, file_type)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f"search_{file_type}_{dataset.version}" if as_of and dataset.version else f"search_{file_type}_{date.today():%Y%m%d}"
+        return export.export_response(export_format, export.COMPANY_COLUMNS, export.company_rows(results),
+                                      filename, sheet_title="검색 결과")
+
+
+class ConsortiumExportView(APIView):
+    """
+    여러 컨소시엄의 계산 결과(구성원별 경영점수, 팀 점수, 시평액 검증)를 CSV/XLSX 파일로 내려받는 API.
+    """
+    MAX_TEAMS = 200
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'export_format': openapi.Schema(type=openapi.TYPE_STRING, description="파일 형식 (csv 기본, xlsx)"),
+                'file_type': openapi.Schema(type=openapi.TYPE_STRING, description="파일 타입 (eung, tongsin, sobang)"),
+                'as_of': openapi.Schema(type=openapi.TYPE_STRING, description="biz_no 로 찾을 업체의 과거 시점 YYYY-MM-DD 또는 스냅숏 버전"),
+                'teams': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                                        description="[{\"name\": 팀 이름, \"companies\": [{\"biz_no\", \"share\"}]}]"),
+                'price_data': openapi.Schema(type=openapi.TYPE_OBJECT, description="{\"estimation_price\": 추정가격, \"notice_base_amount\": 기초금액}"),
+                'announcement_date': openapi.Schema(type=openapi.TYPE_STRING, description="공고일 YYYY-MM-DD (기본: 오늘)"),
+                'rule': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING), description="규칙 (예: [\"행안부\", \"30억미만\"])"),
+                'sipyung': openapi.Schema(type=openapi.TYPE_OBJECT, description="시평액 제한 정보"),
+                'region_limit': openapi.Schema(type=openapi.TYPE_STRING, description="지역 제한 (기본: 전체)"),
+            },
+        )
+    )
+    def post(self, request, *args, **kwargs):
+        data = request.data
+        try:
+            export_format = _export_format(data.get('export_format'))
+            calculated = calculate_consortium_teams(data, self.MAX_TEAMS)
+        except (ValueError, TypeError, AttributeError) as e:
+            return Response({"error": f"요청 값이 올바르지 않습니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        teams = [(_team_name(team, members), result) for team, members, result in calculated]
+        filename = f"consortium_{date.today():%Y%m%d}"
+        return export.export_response(export_format, export.CONSORTIUM_COLUMNS, export.consortium_rows(teams),
+                                      filename, sheet_title="컨소시엄")
+
+
+class SnapshotListView(APIView):
+    """
+    보관된 데이터셋 과거 버전(스냅숏) 목록 API. 검색/점수 API 의 as_of 에 날짜나 여기의 version 을 넣어 씁니다.
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('file_type', openapi.IN_QUERY, description="파일 타입 (eung, tongsin, sobang)", type=openapi.TYPE_STRING),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        file_type = request.query_params.get('file_type', 'eung')
+        try:
+            versions = snapshots.list_versions(file_type)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        current = dataset_cache.get_cached_dataset(dataset_cache.get_excel_path(file_type))
+        return Response({
+            "file_type": file_type,
+            "current_version": current.version if current is not None else None,
+            "versions": [
+                {key: meta.get(key) for key in ("version", "uploaded_at", "archived_at", "sha256", "companies", "bytes")}
+                for meta in reversed(versions)
+            ],
+            "cache": snapshots.get_cache().stats(),
+        }, status=status.HTTP_200_OK)
+
+
+class ProfileListView(APIView):
+    """
+    최근에 저장된 요청 프로파일 목록을 보여주는 API (staff 전용)
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, description="최대 개수 (기본값: 20)", type=openapi.TYPE_INTEGER),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except (ValueError, TypeError):
+            limit = 20
+        return Response(list_profiles(limit), status=status.HTTP_200_OK)
+
+
+class ProfileDetailView(APIView):
+    """
+    저장된 프로파일의 상위 함수 통계를 텍스트로 보여주는 API (staff 전용)
+    """
+    permission_classes = [IsAdminUser]
+    SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls')
+
+    def get(self, request, name, *args, **kwargs):
+        sort_by = request.query_params.get('sort', 'cumulative')
+        if sort_by not in self.SORT_KEYS:
+            sort_by = 'cumulative'
+        summary = summarize_profile(name, sort_by=sort_by)
+        if summary is None:
+            return Response({"error": "프로파일을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"name": name, "sort": sort_by, "stats": summary}, status=status.HTTP_200_OK)
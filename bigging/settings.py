@@ -57,6 +57,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # TRAFFIC_CAPTURE_FILE 이 설정된 경우에만 동작합니다. (그 밖에는 시작할 때 목록에서 빠집니다)
+    'api.traffic.TrafficCaptureMiddleware',
 ]
 
 ROOT_URLCONF = 'bigging.urls'
@@ -150,3 +152,85 @@ if not os.path.exists(EXCEL_DATA_DIR):
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# 요청 단위 프로파일(cProfile) 저장 위치와 보관 개수
+PROFILE_DIR = os.path.join(BASE_DIR, 'logs', 'profiles')
+PROFILE_MAX_FILES = 50
+
+# 워크북 파싱 전용 스레드 수 (동시에 파싱할 수 있는 파일 수)
+DATASET_PARSE_WORKERS = 2
+
+# 데이터셋마다 보관하는 공고일/규칙별 파생 값(추천 특성 행렬, 경영점수 정렬 순서)의 최대 개수
+DATASET_DERIVED_CACHE_SIZE = 16
+
+# 일괄 업로드 후 파일들을 동시에 파싱할 프로세스 수
+DATASET_INGEST_PROCESSES = 3
+
+# 입찰 시뮬레이션에서 후보 컨소시엄들을 동시에 계산할 프로세스 수와,
+# 프로세스 풀을 쓰기 시작하는 전체 추첨 수 (팀 수 x 추첨 횟수)
+SIMULATION_PROCESSES = 4
+SIMULATION_PARALLEL_MIN_DRAWS = 400000
+
+# 데이터셋 과거 버전(스냅숏) 보관 위치와, 읽어 들인 과거 버전을 메모리에 보관할 예산(바이트).
+# 예산을 넘으면 가장 오래 쓰지 않은 버전부터 내려놓고 필요할 때 디스크에서 다시 읽습니다.
+SNAPSHOT_DIR = os.path.join(MEDIA_ROOT, 'snapshots')
+SNAPSHOT_CACHE_BYTES = 256 * 1024 * 1024
+
+# 서버 워커 시작 시(bigging/wsgi.py, asgi.py) 엑셀 데이터셋을 미리 적재할지 여부. (예: BIGGING_WARMUP=1 gunicorn ...)
+# manage.py 명령에서는 실행되지 않습니다. 결과는 api 로거의 INFO 로그로 남습니다. (BIGGING_LOG_LEVEL=INFO)
+DATASET_WARMUP_ON_STARTUP = os.environ.get('BIGGING_WARMUP') == '1'
+
+# 이 크기(바이트) 이상의 엑셀 파일은 스트리밍(read_only) 모드로 파싱해 메모리 사용량을 일정하게 유지합니다.
+STREAMING_PARSE_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+# 타이핑 중 검색 결과 재사용: 사용자별 최근 검색 결과 보관 시간(초)과 개수
+SEARCH_REFINE_TTL = 60
+SEARCH_REFINE_PER_CLIENT = 8
+SEARCH_REFINE_MAX_CLIENTS = 1000
+
+# 로그 파일은 실행 위치(작업 디렉터리)와 관계없이 프로젝트의 logs/ 아래에 씁니다.
+# 파일 쓰기는 QueueListenerHandler 의 백그라운드 스레드가 하므로 요청 처리 시간에 포함되지 않습니다.
+# api 로거 레벨은 BIGGING_LOG_LEVEL 로 바꿀 수 있습니다. (예: DEBUG 로 두면 점수 계산 디버그 로그가 남습니다)
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+os.makedirs(LOG_DIR, exist_ok=True)
+
+# API 요청 기록 (부하 재현용, manage.py replay_traffic 으로 재생). 기본은 꺼짐.
+# 예: BIGGING_TRAFFIC_CAPTURE=logs/traffic.jsonl gunicorn ...  (상대 경로는 프로젝트 폴더 기준)
+TRAFFIC_CAPTURE_FILE = (os.path.join(BASE_DIR, os.environ['BIGGING_TRAFFIC_CAPTURE'])
+                        if os.environ.get('BIGGING_TRAFFIC_CAPTURE') else None)
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.environ.get('BIGGING_TRAFFIC_SAMPLE_RATE', '1.0'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'api.logging_utils.JsonFormatter'},
+    },
+    'handlers': {
+        # 'file' 은 'queue' 가 참조하므로 이름 순서상 앞에 와야 합니다.
+        'file': {
+            'class': 'logging.FileHandler',
+            'filename': os.path.join(LOG_DIR, 'search_errors.log'),
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'json',
+        },
+        'queue': {
+            '()': 'api.logging_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.file'],
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['queue'],
+            'level': os.environ.get('BIGGING_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+        # 시작할 때의 warm-up 결과 요약은 api 로거 수준(기본 WARNING)과 관계없이 남깁니다.
+        'api.warmup': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bigging.settings')
 
 application = get_wsgi_application()
+
+# BIGGING_WARMUP=1 이면 요청을 받기 전에 엑셀 데이터셋을 미리 적재합니다. (서버 프로세스에서만 실행)
+from api.dataset_cache import warm_up_on_startup  # noqa: E402
+
+warm_up_on_startup()